@@ -1,14 +1,37 @@
+import logging
 import os
 from dotenv import load_dotenv
 from discord.ext import commands
 from discord import Intents
 
+from services.flush import FlushCoordinator
+
 
 load_dotenv()
 TOKEN = os.getenv("DISCORD_TOKEN")
 STUDY_CHANNEL_ID = 1236433017250250806
 GENERAL_CHANNEL_ID = 1236433017250250805
 MINIMUM_MINUTES = 25
+LLM_PROVIDERS = os.getenv("LLM_PROVIDERS", "openAI,octoAI").split(",")
+CONVERSATION_TOKEN_BUDGET = int(os.getenv("CONVERSATION_TOKEN_BUDGET", 1500))
+CONVERSATION_MAX_TURNS = int(os.getenv("CONVERSATION_MAX_TURNS", 20))
+CONVERSATION_SUMMARIZE = os.getenv("CONVERSATION_SUMMARIZE", "true").lower() == "true"
+STREAK_SNAPSHOT = os.getenv("STREAK_SNAPSHOT", "false").lower() == "true"
+LEETCODE_STREAKS = os.getenv("LEETCODE_STREAKS", "false").lower() == "true"
+QUOTA_USER_REQUESTS_PER_MINUTE = float(os.getenv("QUOTA_USER_REQUESTS_PER_MINUTE", 4))
+QUOTA_USER_TOKENS_PER_MINUTE = float(os.getenv("QUOTA_USER_TOKENS_PER_MINUTE", 6000))
+QUOTA_CHANNEL_REQUESTS_PER_MINUTE = float(os.getenv("QUOTA_CHANNEL_REQUESTS_PER_MINUTE", 12))
+QUOTA_CHANNEL_TOKENS_PER_MINUTE = float(os.getenv("QUOTA_CHANNEL_TOKENS_PER_MINUTE", 18000))
+QUOTA_GLOBAL_REQUESTS_PER_MINUTE = float(os.getenv("QUOTA_GLOBAL_REQUESTS_PER_MINUTE", 60))
+QUOTA_GLOBAL_TOKENS_PER_MINUTE = float(os.getenv("QUOTA_GLOBAL_TOKENS_PER_MINUTE", 90000))
+QUOTA_BURST = float(os.getenv("QUOTA_BURST", 1.5))
+WORKER_PROCESSES = int(os.getenv("WORKER_PROCESSES", 0))
+WORKER_MAX_PENDING = int(os.getenv("WORKER_MAX_PENDING", 64))
+WATCHDOG_INTERVAL = float(os.getenv("WATCHDOG_INTERVAL", 0.25))
+WATCHDOG_THRESHOLD = float(os.getenv("WATCHDOG_THRESHOLD", 0.5))
+# Cloud Run allows 10 seconds between SIGTERM and SIGKILL
+SHUTDOWN_DEADLINE = float(os.getenv("SHUTDOWN_DEADLINE", 8))
+SYNC_COMMANDS = os.getenv("SYNC_COMMANDS", "true").lower() == "true"
 
 intents = Intents.default()
 intents.members = True
@@ -16,9 +39,35 @@ intents.message_content = True
 
 
 class HooterBot(commands.Bot):
+  """
+  The bot, with a place for cogs to leave state for their next instance.
+
+  Attributes:
+    handover (dict): Cog name -> state stashed by an unloading cog, claimed
+      by the instance that replaces it when its extension is reloaded.
+    flusher (FlushCoordinator): The stores to write on disconnect and shutdown.
+  """
+  def __init__(self, *args, **kwargs):
+    super().__init__(*args, **kwargs)
+    self.handover = {}
+    self.flusher = FlushCoordinator()
+
+  def stash_state(self, name: str, state: dict) -> None:
+    """Keep a cog's state for the instance that replaces it."""
+    self.handover[name] = state
+
+  def claim_state(self, name: str):
+    """Take the state a previous instance of a cog stashed, if any."""
+    return self.handover.pop(name, None)
+
   async def setup_hook(self):
     from bot.setup import setup_bot
     await setup_bot()
+    # Publishing slash commands is rate limited, so deployments can opt out
+    if SYNC_COMMANDS:
+      synced = await self.tree.sync()
+      logging.info(f"Synced {len(synced)} slash commands.")
 
 
-bot = HooterBot(command_prefix='!', intents=intents)
+# Members come from MemberCache instead of a gateway download of every guild before READY
+bot = HooterBot(command_prefix='!', intents=intents, chunk_guilds_at_startup=False)
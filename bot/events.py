@@ -1,17 +1,40 @@
+import asyncio
 import logging
+import time
 
 from discord import Message
 
+from bot import core
 from bot.core import bot
-from choose_model import choose_model
+from choose_model import choose_router
 from responses import get_hooter_explanation
+from services import prompts
+from services.conversation import ConversationMemory, compact_summary, estimate_tokens
+from services.rate_limit import Quota, QuotaLimiter, slow_down_message
+from services.workers import WorkerPool
+from utils.watchdog import LoopWatchdog
 
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-client = "openAI"
-model = choose_model(client)
+clients = core.LLM_PROVIDERS
+router = choose_router(clients)
+workers = WorkerPool(core.WORKER_PROCESSES, core.WORKER_MAX_PENDING,
+                     initializer=prompts.warm_up)
+if not workers.enabled:
+  prompts.warm_up()
+quotas = QuotaLimiter(
+  user=Quota(core.QUOTA_USER_REQUESTS_PER_MINUTE, core.QUOTA_USER_TOKENS_PER_MINUTE, core.QUOTA_BURST),
+  channel=Quota(core.QUOTA_CHANNEL_REQUESTS_PER_MINUTE, core.QUOTA_CHANNEL_TOKENS_PER_MINUTE, core.QUOTA_BURST),
+  global_=Quota(core.QUOTA_GLOBAL_REQUESTS_PER_MINUTE, core.QUOTA_GLOBAL_TOKENS_PER_MINUTE, core.QUOTA_BURST))
+# Expected reply length, counted against the token buckets up front
+REPLY_TOKEN_ESTIMATE = 300
+watchdog = LoopWatchdog(core.WATCHDOG_INTERVAL, core.WATCHDOG_THRESHOLD)
+memory = ConversationMemory(
+  token_budget=core.CONVERSATION_TOKEN_BUDGET,
+  max_turns=core.CONVERSATION_MAX_TURNS,
+  summarizer=compact_summary if core.CONVERSATION_SUMMARIZE else None)
 
 
 @bot.event
@@ -36,9 +59,29 @@ async def on_ready() -> None:
 
 @bot.event
 async def on_disconnect() -> None:
-  streaks_cog = bot.get_cog('StreaksCog')
-  streaks_cog.save_streaks(streaks_cog.load_streaks())
-  logging.info("Bot disconnected. Streaks data saved.")
+  # Disconnects are routine and the gateway resumes, so only unsaved changes are written
+  await bot.flusher.flush("disconnect")
+
+
+async def shutdown(reason: str, deadline: float = core.SHUTDOWN_DEADLINE) -> None:
+  """
+  Flush unsaved state, close the bot within a deadline and stop the
+  worker processes.
+
+  Args:
+    reason (str): What triggered the shutdown, for the logs.
+    deadline (float): Seconds allowed for flushing and closing together.
+  """
+  started = time.monotonic()
+  await bot.flusher.flush(reason, deadline)
+  remaining = deadline - (time.monotonic() - started)
+  try:
+    await asyncio.wait_for(bot.close(), max(remaining, 0.1))
+  except asyncio.TimeoutError:
+    logger.warning(f"Bot did not close within the {deadline}s shutdown deadline.")
+  # Queued work is cancelled; running workers exit when their current task ends
+  workers.shutdown(wait=False)
+  logger.info(f"Shutdown on {reason} finished in {time.monotonic() - started:.2f}s.")
 
 
 @bot.event
@@ -61,14 +104,42 @@ async def on_message(message: Message) -> None:
   await bot.process_commands(message)
 
 
+def conversation_key(message: Message, is_private: bool) -> str:
+  # Private questions are answered by DM, so they share the author's DM history
+  if is_private:
+    return f"dm:{message.author.id}"
+  return f"channel:{message.channel.id}"
+
+
+async def generate_reply(user_message: str, key: str, user_id=None, channel_id=None) -> str:
+  # Canned intents and confident FAQ matches are answered without an LLM call
+  response, context = await workers.run(prompts.prepare_reply, user_message)
+  if response is None:
+    history = memory.history(key)
+    tokens = estimate_tokens(user_message) + memory.token_count(key) + REPLY_TOKEN_ESTIMATE
+    if context:
+      history = [context, *history]
+      tokens += estimate_tokens(context["content"])
+    limited = quotas.acquire(user_id, channel_id if channel_id is not None else key, tokens)
+    if limited:
+      logger.info(f"Quota limited {key} ({limited[0]}) for {limited[1]:.0f}s")
+      return slow_down_message(*limited)
+    response = await router.generate_response(user_message, history)
+  memory.add(key, "user", user_message)
+  memory.add(key, "assistant", response)
+  return response
+
+
 async def send_message(message: Message, user_message: str) -> None:
   if not user_message:
     logger.debug("Message was empty because intents were not enabled properly")
+    return
   if is_private := user_message[0] == '?':
     user_message = user_message[1:]
 
   try:
-    response: str = model.generate_response(user_message)
+    response: str = await generate_reply(user_message, conversation_key(message, is_private),
+                                         message.author.id, message.channel.id)
     await message.author.send(
       response) if is_private else await message.channel.send(response)
   except Exception as e:
@@ -1,18 +1,21 @@
 import logging
 
+from bot import core
 from bot.core import bot
-from bot.events import on_member_join, on_ready, on_disconnect, on_message
-from cogs.leetcode import LeetCodeCog
-from cogs.streaks import StreaksCog
+from bot.events import on_member_join, on_ready, on_disconnect, on_message, watchdog
 
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 
+# Each cog is an extension so it can be reloaded without restarting the bot
+EXTENSIONS = ("cogs.leetcode", "cogs.streaks", "cogs.admin", "cogs.tutor", "cogs.owner")
+
+
 async def setup_commands(bot):
-  await bot.add_cog(LeetCodeCog(bot))
-  await bot.add_cog(StreaksCog(bot))
+  for extension in EXTENSIONS:
+    await bot.load_extension(extension)
   logging.info("Commands have been set up")
 
 
@@ -27,4 +30,6 @@ def setup_events(bot):
 async def setup_bot():
   await setup_commands(bot)
   setup_events(bot)
+  if core.WATCHDOG_THRESHOLD > 0:
+    watchdog.start()
   logging.info("Bot setup completed.")
@@ -1,5 +1,9 @@
+from typing import List
+
 from models.openAI import OpenAIChatGPTModel
 from models.octoAI import OctoAI
+from services.resilience import ResilientModel
+from services.router import Provider, ProviderRouter
 
 def choose_model(client: str):
     models = {
@@ -11,4 +15,8 @@ def choose_model(client: str):
     if model_class:
         return model_class()
     else:
-        raise ValueError(f"Model for client '{client}' is not defined.")
\ No newline at end of file
+        raise ValueError(f"Model for client '{client}' is not defined.")
+
+def choose_router(clients: List[str]) -> ProviderRouter:
+    providers = [Provider(client, ResilientModel(choose_model(client), client)) for client in clients]
+    return ProviderRouter(providers)
@@ -0,0 +1,77 @@
+"""
+This module implements a Discord bot cog with commands for server admins.
+
+The AdminCog class exposes the bot's runtime state (tutor quotas and model
+provider health) to members who can manage the server, so problems can be
+diagnosed without access to the host.
+"""
+
+import logging
+
+from discord.ext import commands
+
+
+logger = logging.getLogger(__name__)
+
+
+def format_seconds(value) -> str:
+  """Format a latency that may be missing."""
+  return "n/a" if value is None else f"{value:.2f}s"
+
+
+class AdminCog(commands.Cog):
+  """
+  Commands for inspecting the bot's runtime state.
+
+  Attributes:
+    bot: The Discord bot instance.
+  """
+  def __init__(self, bot):
+    self.bot = bot
+
+  async def cog_check(self, ctx) -> bool:
+    """Only members who can manage the server may use these commands."""
+    permissions = getattr(ctx.author, "guild_permissions", None)
+    return bool(permissions and permissions.manage_guild)
+
+  @commands.command(name="quotas")
+  async def quotas(self, ctx) -> None:
+    """
+    Show tutor quota usage: global levels and the most limited users and channels.
+
+    Args:
+      ctx (commands.Context): The command context.
+    """
+    from bot.events import quotas
+
+    snapshot = quotas.snapshot()
+    lines = ["**Tutor quotas** (requests / tokens left)",
+             f"Global: {snapshot['global']['requests']} / {snapshot['global']['tokens']}",
+             "Limited so far: " + ", ".join(f"{scope} {count}" for scope, count in snapshot["limited"].items()),
+             f"Tracking {snapshot['tracked']['users']} users and {snapshot['tracked']['channels']} channels."]
+    for label, scope in (("Lowest users", "users"), ("Lowest channels", "channels")):
+      if snapshot[scope]:
+        lines.append(f"{label}: " + ", ".join(
+          f"{entry['id']} ({entry['requests']} / {entry['tokens']})" for entry in snapshot[scope]))
+    await ctx.send("\n".join(lines))
+
+  @commands.command(name="providers")
+  async def providers(self, ctx) -> None:
+    """
+    Show each model provider's latency, error rate and circuit breaker state.
+
+    Args:
+      ctx (commands.Context): The command context.
+    """
+    from bot.events import router
+
+    lines = ["**Model providers**"]
+    for name, stats in router.snapshot().items():
+      breaker = stats.get("breaker", {}).get("state", "n/a")
+      lines.append(f"{name}: {stats['calls']} calls, p50 {format_seconds(stats['p50'])}, "
+                   f"p95 {format_seconds(stats['p95'])}, errors {stats['error_rate']:.0%}, breaker {breaker}")
+    await ctx.send("\n".join(lines))
+
+
+async def setup(bot):
+  await bot.add_cog(AdminCog(bot))
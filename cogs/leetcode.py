@@ -1,37 +1,259 @@
+import asyncio
+import logging
+import os
+import time
+
+from datetime import datetime, timedelta
+from typing import Optional
+
 import discord
+import pytz
 import requests
-from discord.ext import commands
+from discord import Interaction, app_commands
+from discord.ext import commands, tasks
+
+from bot import core
+from services.leetcode_cache import LeetCodeCache, daily_solves
+from utils.rollover import get_timezone, local_date
+
+
+logger = logging.getLogger(__name__)
+
+API_URL = os.getenv("LEETCODE_API_URL", "https://leetcode-stats-api.herokuapp.com")
+FETCH_TIMEOUT = 30
+# Solve counts a profile needs; the API answers an unknown handle with a 200 and status "error"
+PROFILE_FIELDS = ("easySolved", "totalEasy", "mediumSolved", "totalMedium", "hardSolved", "totalHard")
 
 
 class LeetCodeCog(commands.Cog):
+  """
+  LeetCode profile lookups.
+
+  Members can register their handle once; registered profiles are kept in a
+  disk cache that a background task refreshes on an adaptive schedule, so
+  !leetcode usually answers without calling the API. With
+  core.LEETCODE_STREAKS enabled, a day with new solves also counts toward
+  the member's study streak.
+
+  Attributes:
+    bot: The Discord bot instance.
+    cache (LeetCodeCache): Registered handles and cached profiles.
+  """
   def __init__(self, bot):
     self.bot = bot
+    self.cache = LeetCodeCache()
+
+  async def cog_load(self):
+    """Load the profile cache, or take over the previous instance's, and start the prefetcher."""
+    cache = self.bot.claim_state(self.qualified_name)
+    if cache:
+      self.cache = cache
+    else:
+      self.cache.load()
+    self.bot.flusher.register("leetcode", lambda: self.cache.dirty, self.cache.save)
+    self.prefetch_profiles.start()
 
-  @commands.command(name='leetcode')
-  async def leetcode(self, ctx, username: str):
-    data = self.fetch_leetcode_profile(username)
-    if data:
-      embed = discord.Embed(title=f"LeetCode Profile: {username}",
-                            color=discord.Color.blue())
-      embed.add_field(name="Username", value=username, inline=False)
-      embed.add_field(name="Easy Solved",
-                      value=f"{data['easySolved']} / {data['totalEasy']}",
-                      inline=True)
-      embed.add_field(name="Medium Solved",
-                      value=f"{data['mediumSolved']} / {data['totalMedium']}",
-                      inline=True)
-      embed.add_field(name="Hard Solved",
-                      value=f"{data['hardSolved']} / {data['totalHard']}",
-                      inline=True)
+  def cog_unload(self):
+    """Stop the prefetcher, save the profile cache and hand it to the next instance."""
+    self.prefetch_profiles.cancel()
+    self.cache.save()
+    self.bot.flusher.unregister("leetcode")
+    self.bot.stash_state(self.qualified_name, self.cache)
+
+  @commands.group(name='leetcode', invoke_without_command=True)
+  async def leetcode(self, ctx, username: str = None):
+    if username is None:
+      username = self.cache.handle_for(str(ctx.author.id))
+      if username is None:
+        await ctx.send("Tell me a LeetCode username, or register yours with `!leetcode register <username>`.")
+        return
+
+    embed = await self.profile_embed(username)
+    if embed:
       await ctx.send(embed=embed)
     else:
       await ctx.send(f"Could not fetch data for {username}.")
 
+  @app_commands.command(name='leetcode', description="Show a LeetCode profile.")
+  @app_commands.describe(username="The LeetCode username (defaults to your registered one).",
+                         private="Only show the reply to you.")
+  async def leetcode_slash(self, interaction: Interaction, username: str = None,
+                           private: bool = False) -> None:
+    """
+    Slash command version of !leetcode.
+
+    The interaction is deferred first, since an uncached profile can take
+    far longer than Discord's three second acknowledgement window.
+
+    Args:
+      interaction (discord.Interaction): The slash command interaction.
+      username (str, optional): The LeetCode handle to show.
+      private (bool): Reply ephemerally instead of in the channel.
+    """
+    await interaction.response.defer(ephemeral=private, thinking=True)
+    if username is None:
+      username = self.cache.handle_for(str(interaction.user.id))
+      if username is None:
+        await interaction.followup.send(
+          "Tell me a LeetCode username, or register yours with `!leetcode register <username>`.",
+          ephemeral=True)
+        return
+
+    embed = await self.profile_embed(username)
+    if embed:
+      await interaction.followup.send(embed=embed, ephemeral=private)
+    else:
+      await interaction.followup.send(f"Could not fetch data for {username}.", ephemeral=True)
+
+  async def profile_embed(self, username: str):
+    """
+    Build the profile embed for a handle, from the cache when possible.
+
+    Args:
+      username (str): The LeetCode handle.
+
+    Returns:
+      discord.Embed: The profile embed, or None if it couldn't be fetched.
+    """
+    entry = self.cache.get(username)
+    if entry:
+      data = entry["data"]
+    else:
+      data = await self.fetch_profile(username)
+      if data and username in self.cache.profiles:
+        self.cache.store(username, data)
+    if not data:
+      return None
+
+    embed = discord.Embed(title=f"LeetCode Profile: {username}",
+                          color=discord.Color.blue())
+    embed.add_field(name="Username", value=username, inline=False)
+    embed.add_field(name="Easy Solved",
+                    value=f"{data['easySolved']} / {data['totalEasy']}",
+                    inline=True)
+    embed.add_field(name="Medium Solved",
+                    value=f"{data['mediumSolved']} / {data['totalMedium']}",
+                    inline=True)
+    embed.add_field(name="Hard Solved",
+                    value=f"{data['hardSolved']} / {data['totalHard']}",
+                    inline=True)
+    if entry:
+      week = self.solved_this_week(entry)
+      if week:
+        embed.add_field(name="Solved This Week", value=str(week), inline=False)
+      minutes = int((time.time() - entry["fetched_at"]) // 60)
+      embed.set_footer(text=f"Updated {minutes} minutes ago")
+    return embed
+
+  @leetcode.command(name='register')
+  async def register(self, ctx, username: str):
+    """Link the author's Discord account to a LeetCode username."""
+    data = await self.fetch_profile(username)
+    if not data:
+      await ctx.send(f"Could not find a LeetCode profile for {username}.")
+      return
+    self.cache.register(str(ctx.author.id), username)
+    self.cache.store(username, data)
+    self.cache.save()
+    await ctx.send(f"Registered {username}! `!leetcode` will now show your profile.")
+
+  @leetcode.command(name='forget')
+  async def forget(self, ctx):
+    """Unlink the author's LeetCode username."""
+    username = self.cache.unregister(str(ctx.author.id))
+    self.cache.save()
+    if username:
+      await ctx.send(f"Forgot your LeetCode username {username}.")
+    else:
+      await ctx.send("You haven't registered a LeetCode username.")
+
+  @tasks.loop(minutes=1)
+  async def prefetch_profiles(self):
+    """Refresh the registered profiles whose refresh time has come."""
+    for username in self.cache.due():
+      # Read before store(), which updates the entry in place
+      previous = self.cache.get(username)
+      since = previous["fetched_at"] if previous else None
+      solved = self.cache.store(username, await self.fetch_profile(username))
+      if solved > 0:
+        self.credit_solves(username, solved, since)
+    self.cache.save()
+
+  @prefetch_profiles.before_loop
+  async def before_prefetch_profiles(self):
+    """Ensure the bot is ready before prefetching profiles."""
+    await self.bot.wait_until_ready()
+
+  def credit_solves(self, username: str, solved: int, since: Optional[float] = None) -> None:
+    """
+    Count new solves toward the streaks of the members using a handle.
+
+    Refreshes can be hours apart, so when one crosses a member's local
+    midnight the solves are credited to the day of the previous fetch: a
+    late-evening solve then keeps the streak it was meant to keep.
+
+    Args:
+      username (str): The LeetCode handle with new solves.
+      solved (int): How many problems were solved since the last fetch.
+      since (float, optional): When the previous fetch happened, as POSIX seconds.
+    """
+    logger.info(f"{username} solved {solved} new LeetCode problems.")
+    streaks_cog = self.bot.get_cog('StreaksCog')
+    if not core.LEETCODE_STREAKS or streaks_cog is None:
+      return
+    now = datetime.now(pytz.utc)
+    for user_id in self.cache.users_for(username):
+      record = streaks_cog.state().get(user_id)
+      name = record.username if record else self.member_name(user_id)
+      if name is None:
+        logger.info(f"Not crediting {username}'s solves: member {user_id} isn't in any guild.")
+        continue
+      tz = get_timezone(record.timezone if record else None)
+      moment = now
+      if since is not None:
+        previous = datetime.fromtimestamp(since, pytz.utc)
+        if local_date(previous, tz) != local_date(now, tz):
+          moment = previous
+      streaks_cog.credit_activity(user_id, name, moment)
+
+  def member_name(self, user_id: str) -> Optional[str]:
+    """Return a member's Discord name from any guild the bot is in, or None."""
+    for guild in self.bot.guilds:
+      member = guild.get_member(int(user_id))
+      if member is not None:
+        return member.name
+    return None
+
+  @staticmethod
+  def solved_this_week(entry, tz=None) -> int:
+    """Return the problems solved over the last seven local days."""
+    tz = tz or get_timezone(None)
+    since = local_date(datetime.now(pytz.utc), tz) - timedelta(days=6)
+    return sum(count for day, count in daily_solves(entry.get("history", []), tz).items()
+               if day >= since)
+
+  async def fetch_profile(self, username):
+    """Fetch a profile off the event loop, returning None on any failure."""
+    try:
+      return await asyncio.wait_for(
+        asyncio.to_thread(self.fetch_leetcode_profile, username), FETCH_TIMEOUT)
+    except (asyncio.TimeoutError, requests.RequestException, ValueError) as e:
+      logger.warning(f"Failed to fetch LeetCode profile for {username}: {e}")
+      return None
+
   @staticmethod
   def fetch_leetcode_profile(username):
-    url = f"https://leetcode-stats-api.herokuapp.com/{username}"
-    response = requests.get(url)
-    if response.status_code == 200:
-      return response.json()
-    else:
+    url = f"{API_URL}/{username}"
+    # The request's own timeout, so a hung API doesn't hold the worker thread after wait_for gives up
+    response = requests.get(url, timeout=FETCH_TIMEOUT)
+    if response.status_code != 200:
+      return None
+    data = response.json()
+    if not all(field in data for field in PROFILE_FIELDS):
+      logger.warning(f"LeetCode API returned no profile for {username}: {data.get('message', data)}")
       return None
+    return data
+
+
+async def setup(bot):
+  await bot.add_cog(LeetCodeCog(bot))
@@ -0,0 +1,121 @@
+"""
+This module implements a Discord bot cog with commands for the bot owner.
+
+The OwnerCog class reloads the bot's extensions in place, so a change to a
+cog can be deployed without restarting the process, reconnecting to the
+gateway or re-reading every member's streak, and exports streak and session
+data as file attachments.
+"""
+
+import asyncio
+import logging
+import os
+import tempfile
+import time
+
+import discord
+from discord.ext import commands
+
+from services import export as data_export
+
+
+logger = logging.getLogger(__name__)
+
+
+def extension_name(name: str) -> str:
+  """Turn "streaks", "StreaksCog" or "cogs.streaks" into "cogs.streaks"."""
+  name = name.lower()
+  if name.endswith("cog"):
+    name = name[:-3]
+  return name if name.startswith("cogs.") else f"cogs.{name}"
+
+
+class OwnerCog(commands.Cog):
+  """
+  Commands for managing the running bot.
+
+  Attributes:
+    bot: The Discord bot instance.
+  """
+  def __init__(self, bot):
+    self.bot = bot
+
+  async def cog_check(self, ctx) -> bool:
+    """Only the bot's owner may use these commands."""
+    return await self.bot.is_owner(ctx.author)
+
+  @commands.command(name="reload")
+  async def reload(self, ctx, cog: str) -> None:
+    """
+    Reload one of the bot's extensions, keeping its state.
+
+    Reloaded cogs pick up changes to their own module. Slash command
+    changes still need the command tree synced on the next start.
+
+    Args:
+      ctx (commands.Context): The command context.
+      cog (str): The cog to reload, e.g. "streaks".
+    """
+    name = extension_name(cog)
+    if name not in self.bot.extensions:
+      loaded = ", ".join(sorted(extension.split(".")[-1] for extension in self.bot.extensions))
+      await ctx.send(f"There's no loaded cog called {cog}. Loaded cogs: {loaded}.")
+      return
+
+    started = time.perf_counter()
+    try:
+      await self.bot.reload_extension(name)
+    except commands.ExtensionError as e:
+      logger.error(f"Failed to reload {name}: {e}")
+      await ctx.send(f"Reloading {name} failed, so the previous version is still running: {e}")
+      return
+    elapsed = (time.perf_counter() - started) * 1000
+    logger.info(f"Reloaded {name} in {elapsed:.0f} ms.")
+    await ctx.send(f"Reloaded {name} in {elapsed:.0f} ms.")
+
+  @commands.command(name="export")
+  async def export(self, ctx, kind: str = "streaks", fmt: str = "csv") -> None:
+    """
+    Export streak records or session history as an attachment.
+
+    The file is written in chunks on a worker thread, so a large export
+    doesn't block the event loop.
+
+    Args:
+      ctx (commands.Context): The command context.
+      kind (str): "streaks" or "sessions".
+      fmt (str): "csv" or "parquet".
+    """
+    kind, fmt = kind.lower(), fmt.lower()
+    if kind not in data_export.KINDS or fmt not in data_export.FORMATS:
+      await ctx.send(f"Usage: `!export [{'|'.join(data_export.KINDS)}] [{'|'.join(data_export.FORMATS)}]`")
+      return
+    records = None
+    if kind == "streaks":
+      streaks_cog = self.bot.get_cog('StreaksCog')
+      if streaks_cog is None:
+        await ctx.send("Streaks aren't loaded right now.")
+        return
+      # A shallow copy of the pairs, so the thread doesn't iterate a dict the loop changes
+      records = list(streaks_cog.state().items())
+
+    filename = f"{kind}.{fmt}"
+    handle, path = tempfile.mkstemp(suffix=f".{fmt}")
+    os.close(handle)
+    try:
+      rows = await asyncio.to_thread(data_export.export, kind, fmt, path, records)
+      limit = ctx.guild.filesize_limit if ctx.guild else 10 * 1024 * 1024
+      size = os.path.getsize(path)
+      if size > limit:
+        await ctx.send(f"The {filename} export is {size / 1024 / 1024:.1f} MB, over the upload limit. "
+                       "Run `python -m services.export` on the host instead.")
+        return
+      await ctx.send(f"Exported {rows} {kind} rows.", file=discord.File(path, filename=filename))
+    except data_export.ExportError as e:
+      await ctx.send(str(e))
+    finally:
+      os.unlink(path)
+
+
+async def setup(bot):
+  await bot.add_cog(OwnerCog(bot))
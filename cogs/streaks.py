@@ -3,12 +3,26 @@ This module implements a Discord bot cog for managing user study streaks.
 
 The StreaksCog class provides functionality to track, update, and display
 user streaks based on their activity in a designated study voice channel.
-It includes commands for users to check their streaks and for daily updates
-of all users' streaks.
-
-The module uses a JSON file to persist streak data across bot restarts.
+It includes commands for users to check their streaks, a nightly digest of
+the streaks that changed that day, and an on-demand board of every streak.
+
+Streak records are loaded once and kept in memory; every change is applied
+to that state and written through to the file. Voice events are processed
+under a per-user lock, so one user's events apply strictly in order while
+different users' events interleave freely.
+
+Day boundaries are decided in each user's own timezone, and broken streaks
+are expired in bulk as each user's local rollover deadline passes. Current
+streaks are also kept in an in-memory leaderboard for the !rank command.
+
+Each user's streak is a slotted UserStreak record (see domain.streak_data).
+The module uses a compact JSON file to persist streak data across bot restarts,
+optionally mirrored to a binary snapshot (see domain.streak_snapshot) so
+single-user reads don't parse the whole file, and appends every completed session to a history file so streaks can be
+recomputed in bulk (see services.streak_backfill).
 """
 
+import asyncio
 import json
 import logging
 import os
@@ -17,23 +31,43 @@ import shutil
 import pytz
 import tempfile
 
-from datetime import datetime, timedelta, time, date
+from datetime import datetime, timedelta, time
+from typing import Dict, Optional, Set
 from discord.ext import commands, tasks
-from discord import Member
+from discord import Interaction, Member, app_commands
 from discord.types.voice import VoiceState
 
 from bot import core
+from domain.presence import PresenceIndex, format_occupants
+from domain.streak_changes import StreakChangeSet, format_digest
+from domain.streak_data import UserStreak, decode_streaks, encode_streaks, epoch_day
+from domain.streak_snapshot import StreakSnapshot, write_snapshot
+from domain.study_time import day_start, seconds_to_threshold, split_by_day
 from responses import get_hooter_explanation
-from typing import Dict
+from services import session_log
+from services.member_cache import MemberCache
+from services.study_ledger import StudyLedger
+from utils.keyed_locks import KeyedLocks
+from utils.messages import split_message
+from utils.order_stats import StreakRanking
+from utils.rollover import (RolloverScheduler, get_timezone, is_valid_timezone,
+                            local_date, streak_expiry)
 
 
 logger = logging.getLogger(__name__)
 
 STREAKS_FILE = "streaks.json"
+STREAKS_SNAPSHOT_FILE = "streaks.bin"
 
 PST = pytz.timezone('US/Pacific')
 
 
+# Attributes carried over to a reloaded StreaksCog. Their classes live outside
+# this module, so they stay compatible when only the extension is reloaded.
+HANDOVER = ("_streaks", "dirty", "rollover", "ranking", "ranking_loaded", "usernames", "changes",
+            "member_cache", "user_locks", "presence", "ledger")
+
+
 class StreaksCog(commands.Cog):
   """
   A Discord bot cog for managing user study streaks.
@@ -43,6 +77,14 @@ class StreaksCog(commands.Cog):
 
   Attributes:
     bot: The Discord bot instance.
+    rollover: Pending streak expiry deadlines keyed by user ID.
+    snapshot: Single-record reader for the binary snapshot, used when
+      core.STREAK_SNAPSHOT is enabled.
+    ranking: Leaderboard of current streaks, loaded on first use.
+    changes: Streak changes since the last daily digest.
+    member_cache: Snapshot of known guild members, used to avoid
+      re-fetching every member on startup.
+    user_locks: Per-user locks serializing each user's voice events.
   """
   def __init__(self, bot):
     """
@@ -52,21 +94,92 @@ class StreaksCog(commands.Cog):
       bot: The Discord bot instance.
     """
     self.bot = bot
+    self.rollover = RolloverScheduler()
+    self.snapshot = StreakSnapshot(STREAKS_SNAPSHOT_FILE)
+    self.ranking = StreakRanking()
+    self.ranking_loaded = False
+    self.usernames: Dict[str, str] = {}
+    self.changes = StreakChangeSet()
+    self.member_cache = MemberCache()
+    self.user_locks = KeyedLocks()
+    self._streaks: Optional[Dict[str, UserStreak]] = None
+    self.dirty = False
+    self.presence = PresenceIndex()
+    self.ledger = StudyLedger()
+    self.credit_timers: Dict[str, asyncio.TimerHandle] = {}
+    self.credit_tasks: Set[asyncio.Task] = set()
+
+  async def cog_load(self):
+    """
+    Start the daily digest and streak rollover tasks when the cog is loaded.
+
+    After a reload, the previous instance's in-memory state is taken over,
+    so open sessions, pending digest changes and the leaderboard survive
+    without re-reading every member.
+    """
+    state = self.bot.claim_state(self.qualified_name)
+    if state:
+      for attr in HANDOVER:
+        setattr(self, attr, state[attr])
+      logger.info("Took over streak state from the previous StreaksCog.")
+      for guild in self.bot.guilds:
+        self.arm_credit_timers(guild)
+    else:
+      self.ledger.load()
+      self.changes.load()
+    self.bot.flusher.register("streaks", lambda: self.dirty, self.flush)
+    self.bot.flusher.register("member_cache", lambda: self.member_cache.dirty, self.member_cache.save)
+    self.bot.flusher.register("study_time", lambda: self.ledger.dirty, self.ledger.save)
+    self.bot.flusher.register("digest", lambda: self.changes.dirty, self.changes.save)
+    self.daily_streak_update.start()
+    self.rollover_streaks.start()
 
   def cog_unload(self):
-    """Cancel the daily streak update task when the cog is unloaded."""
+    """Cancel the background streak tasks and hand state to the next instance."""
     self.daily_streak_update.cancel()
+    self.rollover_streaks.cancel()
+    self.snapshot.close()
+    self.bot.flusher.unregister("streaks")
+    self.bot.flusher.unregister("member_cache")
+    self.bot.flusher.unregister("study_time")
+    self.bot.flusher.unregister("digest")
+    for user_id in list(self.credit_timers):
+      self.cancel_credit(user_id)
+    for task in list(self.credit_tasks):
+      task.cancel()
+    self.bot.stash_state(self.qualified_name, {attr: getattr(self, attr) for attr in HANDOVER})
 
   @tasks.loop(time=time(hour=21, minute=0, tzinfo=PST))
   async def daily_streak_update(self):
     """
-    Perform a daily update of all user streaks.
+    Post the daily digest of streak changes.
 
-    This task runs daily at 9:00 PM Pacific Time, posting an update of all
-    user streaks in the general channel.
+    This task runs daily at 9:00 PM Pacific Time, posting the streaks that
+    changed since the last digest in the general channel.
     """
     channel = self.bot.get_channel(core.GENERAL_CHANNEL_ID)
-    await self.list_all_streaks(channel)
+    await self.post_digest(channel)
+
+  async def post_digest(self, channel) -> None:
+    """
+    Post the streaks that changed since the last digest and start a new one.
+
+    Nothing is posted if no streak changed. The changes are only dropped
+    once the digest has been sent, so a failed send keeps them for the
+    next digest.
+
+    Args:
+      channel (discord.TextChannel): The channel to post the digest in.
+    """
+    posted = self.changes.pending()
+    changes = self.changes.changes()
+    if changes:
+      for message in split_message(format_digest(changes)):
+        await channel.send(message)
+    else:
+      logger.info("No streak changes since the last digest.")
+    self.changes.settle(posted)
+    self.changes.save()
 
   @daily_streak_update.before_loop
   async def before_daily_streak_update(self):
@@ -74,6 +187,95 @@ class StreaksCog(commands.Cog):
     await self.bot.wait_until_ready()
     logger.info("Daily streak update task is ready!")
 
+  @tasks.loop(minutes=1)
+  async def rollover_streaks(self):
+    """Expire the streaks whose local rollover deadline has passed."""
+    self.expire_streaks(datetime.now(pytz.utc))
+
+  @rollover_streaks.before_loop
+  async def before_rollover_streaks(self):
+    """Ensure the bot is ready before starting the rollover task."""
+    await self.bot.wait_until_ready()
+
+  def expire_streaks(self, now: datetime) -> int:
+    """
+    Reset the current streak of every user whose streak has broken.
+
+    Only users whose rollover deadline has passed are examined, and all of
+    them are expired with a single load and save.
+
+    Args:
+      now (datetime): An aware datetime for the current moment.
+
+    Returns:
+      int: The number of streaks that were expired.
+    """
+    due = self.rollover.pop_due(now)
+    if not due:
+      return 0
+
+    streaks_data = self.state()
+    expired = 0
+    for user_id in due:
+      user_data = streaks_data.get(user_id)
+      if not user_data or not user_data.last_join_date:
+        continue
+      tz = get_timezone(user_data.timezone)
+      if (local_date(now, tz) - user_data.last_join_date).days > 1 and user_data.current_streak > 0:
+        self.changes.before(user_id, user_data)
+        user_data.current_streak = 0
+        self.changes.after(user_id, user_data)
+        self.update_ranking(user_id, user_data)
+        expired += 1
+
+    if expired:
+      self.commit(streaks_data)
+    logger.info(f"Rollover expired {expired} of {len(due)} due streaks.")
+    return expired
+
+  def schedule_rollover(self, user_id: str, user_data: UserStreak) -> None:
+    """
+    Schedule the moment a user's streak breaks if they don't study again.
+
+    Args:
+      user_id (str): The user's ID.
+      user_data (UserStreak): The user's streak record.
+    """
+    if user_data.last_join_date and user_data.current_streak > 0:
+      tz = get_timezone(user_data.timezone)
+      self.rollover.schedule(user_id, streak_expiry(user_data.last_join_date, tz))
+    else:
+      self.rollover.cancel(user_id)
+
+  def load_ranking(self, streaks_data: Optional[Dict[str, UserStreak]] = None) -> None:
+    """
+    Build the leaderboard from streak data.
+
+    Args:
+      streaks_data (dict, optional): User ID -> UserStreak; read from the
+        streaks file if not given.
+    """
+    if streaks_data is None:
+      streaks_data = self.state()
+    self.ranking.rebuild((user_id, data.current_streak) for user_id, data in streaks_data.items())
+    self.usernames = {user_id: data.username for user_id, data in streaks_data.items()}
+    self.ranking_loaded = True
+
+  def update_ranking(self, user_id: str, user_data: UserStreak) -> None:
+    """
+    Move a user to their current streak on the leaderboard.
+
+    Changes before the leaderboard is first loaded are skipped, as loading
+    reads them from the streaks file.
+
+    Args:
+      user_id (str): The user's ID.
+      user_data (UserStreak): The user's streak record.
+    """
+    if self.ranking_loaded:
+      self.ranking.set(user_id, user_data.current_streak)
+      self.usernames[user_id] = user_data.username
+
   @commands.Cog.listener()
   async def on_voice_state_update(self, member, before, after):
     """
@@ -86,8 +288,22 @@ class StreaksCog(commands.Cog):
     """
     if member.bot:
       return
+    self.presence.update(str(member.id), member.display_name, getattr(before.channel, "id", None),
+                         getattr(after.channel, "id", None), datetime.now(pytz.utc))
     await self.handle_study_channel_activity(member, before, after)
 
+  @commands.Cog.listener()
+  async def on_member_join(self, member):
+    """Add a new member to the member cache."""
+    self.member_cache.add(member.guild, member)
+    self.member_cache.save()
+
+  @commands.Cog.listener()
+  async def on_member_remove(self, member):
+    """Drop a departed member from the member cache."""
+    self.member_cache.remove(member.guild, member)
+    self.member_cache.save()
+
   async def handle_study_channel_activity(self, member, before, after):
     """
     Process study channel activity for streak updates.
@@ -135,8 +351,111 @@ class StreaksCog(commands.Cog):
     # check if member is valid
     # else not valid, handle error, "HOOOO is that?"
 
-    streaks_data = self.load_streaks()
-    await self.display_streak(ctx, member, streaks_data)
+    user_id = str(member.id)
+    user_data = self.load_user_streak(user_id)
+    await self.display_streak(ctx, member, {user_id: user_data} if user_data else {})
+
+  @app_commands.command(name="streak", description="Show current and longest study streaks.")
+  @app_commands.describe(member="Whose streak to show (defaults to you).",
+                         private="Only show the reply to you.")
+  async def streak_slash(self, interaction: Interaction, member: Optional[Member] = None,
+                         private: bool = False) -> None:
+    """
+    Slash command version of !streak, acknowledged before the lookup.
+
+    Args:
+      interaction (discord.Interaction): The slash command interaction.
+      member (discord.Member, optional): The member to check the streak for.
+      private (bool): Reply ephemerally instead of in the channel.
+    """
+    await interaction.response.defer(ephemeral=private, thinking=True)
+    member = member or interaction.user
+    user_id = str(member.id)
+    user_data = self.load_user_streak(user_id)
+    await interaction.followup.send(
+      self.streak_message(member, {user_id: user_data} if user_data else {}), ephemeral=private)
+
+  @commands.command(name="studying")
+  async def studying(self, ctx) -> None:
+    """
+    List who is in the study room, for how long, and who is close to the
+    daily minimum. Served from the presence index, without reading streaks.
+
+    Args:
+      ctx (commands.Context): The command context.
+    """
+    await ctx.send(format_occupants(self.presence.occupants(core.STUDY_CHANNEL_ID),
+                                    datetime.now(pytz.utc), core.MINIMUM_MINUTES))
+
+  @commands.command(name="rank")
+  async def rank(self, ctx, member: Member = None) -> None:
+    """
+    Show where a user's current streak ranks among all members.
+
+    Args:
+      ctx (commands.Context): The command context.
+      member (discord.Member, optional): The member to rank. If not provided,
+                                         ranks the command author.
+    """
+    if member is None:
+      member = ctx.author
+    if not self.ranking_loaded:
+      self.load_ranking()
+
+    user_id = str(member.id)
+    rank = self.ranking.rank(user_id)
+    if rank is None:
+      await ctx.send(f"{member.mention} hasn't started a streak yet.")
+      return
+
+    streak = self.ranking.values[user_id]
+    message = f"{member.display_name} is ranked #{rank} of {len(self.ranking)} " \
+              f"with a {streak} day streak, ahead of {self.ranking.percentile(user_id):.0f}% of members."
+    above, below = self.ranking.neighbors(user_id)
+    if above:
+      message += f"\nNext up: {self.usernames.get(above[0], 'someone')} with {above[1]} days."
+    if below:
+      message += f"\nRight behind: {self.usernames.get(below[0], 'someone')} with {below[1]} days."
+    await ctx.send(message)
+
+  @commands.command(name="board")
+  async def board(self, ctx) -> None:
+    """
+    Show every member's current streak.
+
+    Args:
+      ctx (commands.Context): The command context.
+    """
+    await self.list_all_streaks(ctx)
+
+  @commands.command(name="timezone")
+  async def timezone(self, ctx, timezone_name: str = None) -> None:
+    """
+    Show or set the timezone used to decide a user's streak days.
+
+    Args:
+      ctx (commands.Context): The command context.
+      timezone_name (str, optional): An IANA timezone name, e.g. "Europe/Berlin".
+    """
+    user_id = str(ctx.author.id)
+    streaks_data = self.state()
+    if user_id not in streaks_data:
+      streaks_data[user_id] = self.new_user_data(ctx.author.name)
+    user_data = streaks_data[user_id]
+
+    if timezone_name is None:
+      current = get_timezone(user_data.timezone).zone
+      await ctx.send(f"Your streak days follow the {current} timezone.")
+      return
+
+    if not is_valid_timezone(timezone_name):
+      await ctx.send(f"HOOOO knows that timezone? '{timezone_name}' isn't one I recognize. Try something like 'America/New_York'.")
+      return
+
+    user_data.timezone = timezone_name
+    self.commit(streaks_data)
+    self.schedule_rollover(user_id, user_data)
+    await ctx.send(f"Got it! Your streak days now follow the {timezone_name} timezone.")
 
   async def process_streak(self, member: Member,
                            before: VoiceState,
@@ -151,22 +470,42 @@ class StreaksCog(commands.Cog):
       before (discord.VoiceState): The previous voice state.
       after (discord.VoiceState): The new voice state.
       study_channel_id (int): The ID of the study channel.
-      minimum_minutes (int): The minimum minutes required for a valid study session.
+      minimum_minutes (int): The daily study minutes needed to count the day.
     """
     logger.info("### Begin processing streak ###")
-    current_time = datetime.now(PST)
     user_id = str(member.id)
-    streaks_data = self.load_streaks()
+    async with self.user_locks.hold(user_id):
+      await self.apply_voice_event(member, before, after, study_channel_id, minimum_minutes)
+
+  async def apply_voice_event(self, member: Member,
+                              before: VoiceState,
+                              after: VoiceState,
+                              study_channel_id: int,
+                              minimum_minutes: int) -> None:
+    """
+    Apply one voice event to a user's streak; callers hold the user's lock.
 
+    Args:
+      member (discord.Member): The member whose voice state changed.
+      before (discord.VoiceState): The previous voice state.
+      after (discord.VoiceState): The new voice state.
+      study_channel_id (int): The ID of the study channel.
+      minimum_minutes (int): The daily study minutes needed to count the day.
+    """
+    if before.channel == after.channel:
+      # Muting, deafening or streaming in place; the open session carries on
+      return
+    current_time = datetime.now(PST)
+    user_id = str(member.id)
 
-    if user_id not in streaks_data:
+    if user_id not in self.state():
       self.initialize_user_data(user_id, member.name)
-      self.save_streaks(streaks_data)
 
     if self.is_joining_study_channel(after, study_channel_id):
       logger.info(f"Is joining study channel; user_id: {user_id}, member.name: {member.name}, current_time: {current_time}")
       logger.info("## Handling Join ##")
       self.handle_join(user_id, member.name, current_time)
+      self.schedule_credit(member, after.channel, current_time, minimum_minutes)
     elif self.is_leaving_study_channel(before, study_channel_id):
       logger.info(f"Is leaving study channel; user_id: {user_id}, member.name: {member.name}, current_time: {current_time}")
       channel = before.channel
@@ -176,32 +515,57 @@ class StreaksCog(commands.Cog):
                               member, channel, current_time)
 
   async def initialize_streaks(self):
-    """Initialize streak data for all guild members."""
+    """
+    Initialize streak data for all guild members.
+
+    Members come from the member cache, which only goes to the REST API for
+    members it hasn't seen (see services.member_cache).
+    """
     logger.info("Initializing streaks data...")
-    streaks_data = self.load_streaks()
+    streaks_data = self.state()
+    self.member_cache.load()
 
     for guild in core.bot.guilds:
       logger.info(f"Processing guild: {guild.name}")
-      async for member in guild.fetch_members(limit=None):
-        if member.bot:
-          continue
-        user_id = str(member.id)
+      self.seed_presence(guild, streaks_data)
+      self.arm_credit_timers(guild)
+      members = await self.member_cache.refresh(guild)
+      for user_id, username in members.items():
         if user_id not in streaks_data:
-          streaks_data[user_id] = {
-            "username": member.name,
-            "current_streak": 0,
-            "longest_streak": 0,
-            "last_join_date": None,
-            "join_time": None
-          }
+          streaks_data[user_id] = self.new_user_data(username)
           logger.info(
-            f"Added {member.name} to streaks data with initial streak of 0.")
-
-    self.save_streaks(streaks_data)
+            f"Added {username} to streaks data with initial streak of 0.")
+
+    self.member_cache.save()
+    self.commit(streaks_data)
+    for user_id, user_data in streaks_data.items():
+      self.schedule_rollover(user_id, user_data)
+    self.load_ranking(streaks_data)
+    self.expire_streaks(datetime.now(pytz.utc))
     logger.info("Streaks data initialization completed.")
     logger.info("### Finishing processing streak ###")
 
 
+  def seed_presence(self, guild, streaks_data) -> None:
+    """
+    Add the members already in a guild's voice channels to the presence index.
+
+    Study room join times come from the streak records; anyone else is
+    counted from now.
+
+    Args:
+      guild (discord.Guild): The guild to scan.
+      streaks_data (dict): The loaded streak data.
+    """
+    now = datetime.now(pytz.utc)
+    for channel in guild.voice_channels:
+      for member in channel.members:
+        if member.bot:
+          continue
+        user_data = streaks_data.get(str(member.id))
+        joined_at = user_data.join_time if user_data and user_data.join_time else now
+        self.presence.join(channel.id, str(member.id), member.display_name, joined_at)
+
   def initialize_user_data(self, user_id: str, username: str) -> None:
     """
     Initialize streak data for a new user.
@@ -210,15 +574,23 @@ class StreaksCog(commands.Cog):
       user_id (str): The user's ID.
       username (str): The user's name.
     """
-    streaks_data = self.load_streaks()
-    streaks_data[user_id] = {
-      "username": username,
-      "current_streak": 0,
-      "longest_streak": 0,
-      "last_join_date": None,
-      "join_time": None
-    }
-    self.save_streaks(streaks_data)
+    streaks_data = self.state()
+    streaks_data[user_id] = self.new_user_data(username)
+    self.commit(streaks_data)
+    self.update_ranking(user_id, streaks_data[user_id])
+
+  @staticmethod
+  def new_user_data(username: str) -> UserStreak:
+    """
+    Build the initial streak record for a user.
+
+    Args:
+      username (str): The user's name.
+
+    Returns:
+      UserStreak: A record with no sessions and the default timezone.
+    """
+    return UserStreak(username)
 
   def handle_join(self, user_id: str, username: str, join_time: datetime) -> None:
     """
@@ -229,17 +601,17 @@ class StreaksCog(commands.Cog):
       username (str): The user's name.
       join_time (datetime): The time at which the user joined the voice channel
     """
-    streaks_data = self.load_streaks()
+    streaks_data = self.state()
     logger.info(f"this is {username}'s streaks_data: {streaks_data[user_id]}")
-    streaks_data[user_id]["join_time"] = join_time
+    streaks_data[user_id].join_time = join_time
     logger.info(f"{username} joined the study channel at {join_time}.")
-    if self.save_streaks(streaks_data):
+    if self.commit(streaks_data):
       logger.info(f"Successfully updated join time for {username} at {join_time}")
-      logger.info(f"this is {username}'s streaks_data that was saved: {self.load_streaks()[user_id]}")
+      logger.info(f"this is {username}'s streaks_data that was saved: {streaks_data[user_id]}")
 
     else:
       logger.error(f"Failed to update join time for {username}")
-      logger.info(f"this is {username}'s streaks_data that was saved: {self.load_streaks()[user_id]}")
+      logger.info(f"this is {username}'s streaks_data that was saved: {streaks_data[user_id]}")
   
   async def handle_leave(self, user_id: str, username: str, minimum_minutes: int, member: Member,
                          channel, current_time: datetime):
@@ -249,49 +621,167 @@ class StreaksCog(commands.Cog):
     Args:
       user_id (str): The user's ID.
       username (str): The user's name.
-      minimum_minutes (int): The minimum minutes required for a valid study session.
+      minimum_minutes (int): The daily study minutes needed to count the day.
       member (discord.Member): The member who left the channel.
       channel (discord.TextChannel): The channel to send notifications to.
       current_time (datetime): The time that the leave event occurs.
     """
-    streaks_data = self.load_streaks()
+    streaks_data = self.state()
     logger.info(f"this is {username}'s session data that was recorded upon leaving the call: {streaks_data[user_id]}")
-    logger.info(f"this is the previous join time for {username}: {streaks_data[user_id]['join_time']}")
+    logger.info(f"this is the previous join time for {username}: {streaks_data[user_id].join_time}")
     logger.info(f'Handling leave for {username} at {current_time}')
-    user_join_time = streaks_data[user_id]["join_time"]
+    user_join_ts = streaks_data[user_id].join_ts
 
-    if user_join_time is None:
+    if user_join_ts is None:
       logger.warning(f"{username} left the study channel but no active join time was recorded.") # could have more detail
     else:
+      user_join_time = streaks_data[user_id].join_time
       logger.info(
         f"{username} joined at {user_join_time} and left at {current_time}.")
-      duration = current_time - user_join_time
+      duration = timedelta(seconds=current_time.timestamp() - user_join_ts)
       logger.info(f"the duration of {username}'s call was: {duration}")
-      if duration >= timedelta(minutes=minimum_minutes):
-        previous_streak = streaks_data[user_id]["current_streak"]
-        is_updated = self.update_streak(user_id, username, current_time)
-
-        if is_updated:
-          await self.send_streak_notification(user_id, member, channel, previous_streak)
-        else:
-          logger.error(f"Failed to update streak for {username}")
-          logger.info(f"{username}'s current streak data: {streaks_data[user_id]}")
-      else:
-        logger.info(f"{username} left the study channel after {duration.total_seconds() / 60:.2f} minutes, before the minimum duration.")
-        await channel.send(
-          f"Hey {member.mention}, you left the study channel before the minimum "
-          f"{minimum_minutes} minutes. Keep at it next time to maintain your streak!")
-
-    streaks_data = self.load_streaks()
-    streaks_data[user_id]["join_time"] = None
-    if self.save_streaks(streaks_data):
+      session_log.append_session(user_id, user_join_time, current_time)
+      await self.record_study_time(user_id, username, member, channel,
+                                   current_time - duration, current_time, minimum_minutes)
+
+    self.cancel_credit(user_id)
+    streaks_data[user_id].join_time = None
+    if self.commit(streaks_data):
       logger.info(f"Successfully reset join time for {username}")
     else:
       logger.error(f"Failed to reset join time for {username}")
 
+  async def record_study_time(self, user_id: str, username: str, member: Member, channel,
+                              start: datetime, end: datetime, minimum_minutes: int) -> None:
+    """
+    Add a finished session to the user's daily study time, crediting any
+    day it takes to the minimum that the credit timer didn't already.
+
+    Args:
+      user_id (str): The user's ID.
+      username (str): The user's name.
+      member (discord.Member): The member who left the channel.
+      channel (discord.TextChannel): The channel to send notifications to.
+      start (datetime): When the session started.
+      end (datetime): When the session ended.
+      minimum_minutes (int): The daily minutes needed to count the day.
+    """
+    tz = get_timezone(self.state()[user_id].timezone)
+    # Earlier days of a session this long were credited by the timer while it was open
+    start = max(start, day_start(end, tz, days=-1))
+    touched = self.ledger.record(user_id, start, end, tz)
+    self.ledger.save()
+
+    for record, piece_end in touched:
+      if record.total() < minimum_minutes * 60 or self.day_credited(user_id, record.day):
+        continue
+      # A day finished before midnight is credited as of its last second
+      moment = end if piece_end == end else piece_end - timedelta(seconds=1)
+      previous_streak = self.state()[user_id].current_streak
+      if self.update_streak(user_id, username, moment):
+        await self.send_streak_notification(user_id, member, channel, previous_streak)
+      else:
+        logger.error(f"Failed to update streak for {username}")
+
+    if touched and not self.day_credited(user_id, touched[-1][0].day):
+      minutes = touched[-1][0].total() // 60
+      logger.info(f"{username} has studied {minutes} of {minimum_minutes} minutes today.")
+      await channel.send(
+        f"Hey {member.mention}, that's {minutes} of your {minimum_minutes} minutes today. "
+        f"Come back for {minimum_minutes - minutes} more to keep your streak going!")
+
+  def day_credited(self, user_id: str, day: int) -> bool:
+    """Return whether a local day (as an epoch day) already counts toward the user's streak."""
+    last_join_date = self.state()[user_id].last_join_date
+    return last_join_date is not None and epoch_day(last_join_date) >= day
+
+  def schedule_credit(self, member: Member, channel, now: datetime,
+                      minimum_minutes: int = core.MINIMUM_MINUTES) -> None:
+    """
+    Arm a timer for the moment a member's ongoing session completes the day.
+
+    Args:
+      member (discord.Member): The member in the study channel.
+      channel: Where to announce the streak update.
+      now (datetime): The current time.
+      minimum_minutes (int): The daily minutes needed to count the day.
+    """
+    user_id = str(member.id)
+    self.cancel_credit(user_id)
+    user_data = self.state().get(user_id)
+    if user_data is None or user_data.join_ts is None:
+      return
+    open_start = now - timedelta(seconds=now.timestamp() - user_data.join_ts)
+    credited_day = epoch_day(user_data.last_join_date) if user_data.last_join_date else None
+    delay = seconds_to_threshold(self.ledger.get(user_id), open_start, now,
+                                 get_timezone(user_data.timezone), minimum_minutes * 60, credited_day)
+    if delay is None:
+      return
+    self.credit_timers[user_id] = asyncio.get_running_loop().call_later(
+      delay, self.start_credit, member, channel, minimum_minutes)
+
+  def start_credit(self, member: Member, channel, minimum_minutes: int) -> None:
+    """Run credit_open_session from a timer, keeping the task until it finishes."""
+    task = asyncio.get_running_loop().create_task(self.credit_open_session(member, channel, minimum_minutes))
+    self.credit_tasks.add(task)
+    task.add_done_callback(self.credit_done)
+
+  def credit_done(self, task: asyncio.Task) -> None:
+    """Forget a finished credit task, logging it if it failed."""
+    self.credit_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+      logger.error(f"Crediting an open session failed: {task.exception()!r}")
+
+  def arm_credit_timers(self, guild) -> None:
+    """Arm credit timers for everyone in a guild's study room, e.g. after a restart or reload."""
+    study_channel = guild.get_channel(core.STUDY_CHANNEL_ID)
+    if study_channel is None:
+      return
+    for presence in self.presence.occupants(core.STUDY_CHANNEL_ID):
+      member = guild.get_member(int(presence.user_id))
+      if member is not None:
+        self.schedule_credit(member, study_channel, datetime.now(pytz.utc))
+
+  def cancel_credit(self, user_id: str) -> None:
+    """Disarm a member's credit timer, if any."""
+    timer = self.credit_timers.pop(user_id, None)
+    if timer is not None:
+      timer.cancel()
+
+  async def credit_open_session(self, member: Member, channel, minimum_minutes: int) -> None:
+    """
+    Credit a member whose ongoing session has just completed the day.
+
+    Args:
+      member (discord.Member): The member in the study channel.
+      channel: Where to announce the streak update.
+      minimum_minutes (int): The daily minutes needed to count the day.
+    """
+    user_id = str(member.id)
+    self.credit_timers.pop(user_id, None)
+    async with self.user_locks.hold(user_id):
+      user_data = self.state().get(user_id)
+      if user_data is None or user_data.join_ts is None:
+        return
+      now = datetime.now(PST)
+      open_start = now - timedelta(seconds=now.timestamp() - user_data.join_ts)
+      pieces = split_by_day(open_start, now, get_timezone(user_data.timezone))
+      if pieces:
+        day, piece_start, piece_end = pieces[-1]
+        seconds = int(piece_end.timestamp()) - int(piece_start.timestamp())
+        record = self.ledger.get(user_id)
+        if record is not None and record.day == epoch_day(day):
+          seconds = record.total_with(int(piece_start.timestamp()), int(piece_end.timestamp()))
+        if seconds >= minimum_minutes * 60 and not self.day_credited(user_id, epoch_day(day)):
+          logger.info(f"{member.name} reached {minimum_minutes} minutes today while still studying.")
+          previous_streak = user_data.current_streak
+          if self.update_streak(user_id, member.name, now):
+            await self.send_streak_notification(user_id, member, channel, previous_streak)
+      # Either tomorrow's mark, or a retry if the timer fired a little early
+      self.schedule_credit(member, channel, now, minimum_minutes)
+
   async def send_streak_notification(self, user_id, member, channel, previous_streak):
-    streaks_data = self.load_streaks()
-    current_streak = streaks_data[user_id]["current_streak"]
+    current_streak = self.load_user_streak(user_id).current_streak
 
     if current_streak > previous_streak:
       await channel.send(
@@ -312,12 +802,13 @@ class StreaksCog(commands.Cog):
     Returns:
       bool: True if the streak was updated or already updated today, False if an error occurred.
     """
-    streaks_data = self.load_streaks()
+    streaks_data = self.state()
     user_data = streaks_data[user_id]
-    today = current_time.date()
-    last_join_date = user_data["last_join_date"]
+    today = local_date(current_time, get_timezone(user_data.timezone))
+    last_join_date = user_data.last_join_date
 
     logger.info(f"Updating streak for {username}. Current date: {today}, Last join date: {last_join_date}")
+    self.changes.before(user_id, user_data)
 
     if last_join_date is None:
       user_data = self.start_new_streak(user_data)
@@ -332,25 +823,112 @@ class StreaksCog(commands.Cog):
       logger.warning(f"Unexpected behavior: {username}'s last join date ({last_join_date}) is not before today ({today}).")
       return False
 
-    user_data["last_join_date"] = today
+    user_data.last_join_date = today
     streaks_data[user_id] = user_data
-    return self.save_streaks(streaks_data)
+    is_saved = self.commit(streaks_data)
+    self.schedule_rollover(user_id, user_data)
+    self.update_ranking(user_id, user_data)
+    self.changes.after(user_id, user_data)
+    return is_saved
+
+  def credit_activity(self, user_id: str, username: str, current_time: datetime) -> bool:
+    """
+    Count a day of study activity other than voice-channel time.
+
+    Args:
+      user_id (str): The user's ID.
+      username (str): The name to use if the user has no record yet.
+      current_time (datetime): When the activity happened.
+
+    Returns:
+      bool: True if the streak was updated.
+    """
+    if user_id not in self.state():
+      self.initialize_user_data(user_id, username)
+    return self.update_streak(user_id, username, current_time)
 
   async def list_all_streaks(self, channel):
     """
     List all user streaks in the given channel.
 
     Args:
-      channel (discord.TextChannel): The channel to send the streak list to.
+      channel (discord.abc.Messageable): Where to send the streak list.
     """
-    streaks_data = self.load_streaks()
-    streaks_message = "**Daily Streak Update:**\n"
+    streaks_data = self.state()
+    lines = ["**Streak Board:**"]
     for user_id, data in streaks_data.items():
-      username = data["username"]
-      current_streak = data["current_streak"]
-      streaks_message += f"{username}: {current_streak} days\n"
+      lines.append(f"{data.username}: {data.current_streak} days")
+
+    for message in split_message("\n".join(lines)):
+      await channel.send(message)
+
+  def state(self) -> Dict[str, UserStreak]:
+    """
+    Return the in-memory streak records, loading them on first use.
+
+    Returns:
+      dict: User ID -> UserStreak, shared by every handler.
+    """
+    if self._streaks is None:
+      self._streaks = self.load_streaks()
+    return self._streaks
 
-    await channel.send(streaks_message)
+  def commit(self, streaks_data) -> bool:
+    """
+    Save streak data, remembering whether unsaved changes remain.
+
+    Args:
+      streaks_data (dict): User ID -> UserStreak.
+
+    Returns:
+      bool: True if the save succeeded.
+    """
+    saved = self.save_streaks(streaks_data)
+    self.dirty = not saved
+    self.changes.save()
+    return saved
+
+  def flush(self) -> None:
+    """Retry saving the in-memory records if the last save failed."""
+    if self.dirty and self._streaks is not None:
+      self.commit(self._streaks)
+
+  def load_user_streak(self, user_id: str) -> Optional[UserStreak]:
+    """
+    Load one user's streak record.
+
+    Records come from the in-memory state once it is loaded. Before that,
+    with core.STREAK_SNAPSHOT enabled the record is read from the binary
+    snapshot (built from the JSON file if it is missing) instead of parsing
+    every user's data.
+
+    Args:
+      user_id (str): The user's ID.
+
+    Returns:
+      UserStreak: The record, or None if the user has none.
+    """
+    if self._streaks is not None or not core.STREAK_SNAPSHOT:
+      return self.state().get(user_id)
+    if not self.snapshot.available:
+      streaks_data = self.load_streaks()
+      StreaksCog.save_snapshot(streaks_data)
+      if not self.snapshot.available:
+        return streaks_data.get(user_id)
+    return self.snapshot.get(user_id)
+
+  @staticmethod
+  def save_snapshot(streaks_data) -> None:
+    """
+    Mirror streak data to the binary snapshot file.
+
+    Args:
+      streaks_data (dict): User ID -> UserStreak.
+    """
+    try:
+      write_snapshot(STREAKS_SNAPSHOT_FILE, streaks_data)
+    except (OSError, ValueError) as e:
+      logger.error(f"Failed to write streak snapshot {STREAKS_SNAPSHOT_FILE}: {e}")
 
   @staticmethod
   def load_streaks():
@@ -358,31 +936,19 @@ class StreaksCog(commands.Cog):
     Load streak data from the JSON file.
 
     Returns:
-      dict: The loaded and deserialized streak data.
+      dict: User ID -> UserStreak.
     """
     if not os.path.exists(STREAKS_FILE):
       logger.info(
         f"Streaks file '{STREAKS_FILE}' does not exist. Creating empty file.")
       with open(STREAKS_FILE, 'w') as file:
-        json.dump({}, file)
+        file.write(encode_streaks({}))
     else:
       logger.info(f"Loading streaks data from file: {STREAKS_FILE}")
 
     try:
       with open(STREAKS_FILE, 'r') as file:
-        loaded_data = json.load(file)
-        deserialized_streaks = {
-          user_id: {
-            "username": data["username"],
-            "current_streak": data["current_streak"],
-            "longest_streak": data["longest_streak"],
-            "last_join_date": datetime.fromisoformat(
-              data["last_join_date"]).date() if data["last_join_date"] else None,
-            "join_time": datetime.fromisoformat(data["join_time"]) if data[
-              "join_time"] else None
-          }
-          for user_id, data in loaded_data.items()
-        }
+        deserialized_streaks = decode_streaks(file.read())
         logger.debug(f"Deserialized streaks: {deserialized_streaks}")
         return deserialized_streaks
     except json.JSONDecodeError:
@@ -398,24 +964,13 @@ class StreaksCog(commands.Cog):
     Save streak data to the JSON file.
 
     Args:
-      streaks_data (dict): The streak data to save.
+      streaks_data (dict): User ID -> UserStreak.
     """
     logger.info(f"Saving streaks data to file: {STREAKS_FILE}")
-    serialized_data = {
-      user_id: {
-        "username": data["username"],
-        "current_streak": data["current_streak"],
-        "longest_streak": data["longest_streak"],
-        "last_join_date": data["last_join_date"].isoformat() if isinstance(
-          data["last_join_date"], date) else None,
-        "join_time": data["join_time"].isoformat() if isinstance(
-          data["join_time"], datetime) else None
-      }
-      for user_id, data in streaks_data.items()
-    }
+    serialized_data = encode_streaks(streaks_data)
     temp_file = tempfile.NamedTemporaryFile(mode='w', delete=False)
     try:
-      json.dump(serialized_data, temp_file, indent=4)
+      temp_file.write(serialized_data)
       temp_file.flush()
       os.fsync(temp_file.fileno())
       temp_file.close()
@@ -430,6 +985,8 @@ class StreaksCog(commands.Cog):
     if loaded_data != streaks_data:
       logger.error("Validation failed: Saved data does not match original data.")
       return False
+    if core.STREAK_SNAPSHOT:
+      StreaksCog.save_snapshot(streaks_data)
     return True
 
   @staticmethod
@@ -461,22 +1018,22 @@ class StreaksCog(commands.Cog):
     return before.channel and before.channel.id == study_channel_id
 
   @staticmethod
-  def increment_streak(user_data: Dict):
+  def increment_streak(user_data: UserStreak):
     """
     Increment a user's streak.
 
     Args:
-      user_data (Dict):
+      user_data (UserStreak): The user's streak record.
 
     Returns:
-      dict: The user's data for streaks.
+      UserStreak: The updated streak record.
     """
-    user_data["current_streak"] += 1
-    user_data["longest_streak"] = max(
-      user_data["longest_streak"],
-      user_data["current_streak"])
+    user_data.current_streak += 1
+    user_data.longest_streak = max(
+      user_data.longest_streak,
+      user_data.current_streak)
     logger.info(
-      f"{user_data['username']}'s streak increased to {user_data['current_streak']} days.")
+      f"{user_data.username}'s streak increased to {user_data.current_streak} days.")
     return user_data
 
   @staticmethod
@@ -485,13 +1042,13 @@ class StreaksCog(commands.Cog):
     Reset a user's streak to 1.
 
     Args:
-      user_data (Dict):
+      user_data (UserStreak): The user's streak record.
 
     Returns:
-      dict: The user's data for streaks.
+      UserStreak: The updated streak record.
     """
-    user_data["current_streak"] = 1
-    logger.info(f"{user_data['username']}'s streak reset to 1 day.")
+    user_data.current_streak = 1
+    logger.info(f"{user_data.username}'s streak reset to 1 day.")
     return user_data
 
   @staticmethod
@@ -500,14 +1057,14 @@ class StreaksCog(commands.Cog):
     Start a new streak for a user.
 
     Args:
-      user_data (Dict):
+      user_data (UserStreak): The user's streak record.
 
     Returns:
-      dict: The user's data for streaks.
+      UserStreak: The updated streak record.
     """
-    user_data["current_streak"] = 1
-    user_data["longest_streak"] = 1
-    logger.info(f"{user_data['username']} started a new streak of 1 day.")
+    user_data.current_streak = 1
+    user_data.longest_streak = 1
+    logger.info(f"{user_data.username} started a new streak of 1 day.")
     return user_data
 
   @staticmethod
@@ -520,15 +1077,31 @@ class StreaksCog(commands.Cog):
       member (discord.Member): The member to display the streak for.
       streaks_data (dict): The loaded streak data.
     """
+    await ctx.send(StreaksCog.streak_message(member, streaks_data))
+
+  @staticmethod
+  def streak_message(member, streaks_data) -> str:
+    """
+    Describe a member's streaks.
+
+    Args:
+      member (discord.Member): The member to describe.
+      streaks_data (dict): The loaded streak data.
+
+    Returns:
+      str: The message text.
+    """
     user_id = str(member.id)
 
     if user_id in streaks_data:
-      current_streak = streaks_data[user_id]["current_streak"]
-      longest_streak = streaks_data[user_id]["longest_streak"]
-      username = streaks_data[user_id]["username"]
-      message = f"{username}'s streaks:\n" \
-                f"Current streak: {current_streak} days\n" \
-                f"Longest streak: {longest_streak} days"
-      await ctx.send(message)
-    else:
-      await ctx.send(f"{member.mention} hasn't started a streak yet.")
+      current_streak = streaks_data[user_id].current_streak
+      longest_streak = streaks_data[user_id].longest_streak
+      username = streaks_data[user_id].username
+      return f"{username}'s streaks:\n" \
+             f"Current streak: {current_streak} days\n" \
+             f"Longest streak: {longest_streak} days"
+    return f"{member.mention} hasn't started a streak yet."
+
+
+async def setup(bot):
+  await bot.add_cog(StreaksCog(bot))
@@ -0,0 +1,65 @@
+"""
+This module implements a Discord bot cog with the tutor's slash command.
+
+Questions asked with /ask go through the same pipeline as messages that
+mention Hooter (canned intents, FAQ matches, quotas and the model router).
+The interaction is acknowledged straight away and answered with a follow-up,
+because a model call routinely takes longer than the three seconds Discord
+allows, and the private option replies ephemerally instead of by DM.
+"""
+
+import logging
+
+from discord import Interaction, app_commands
+from discord.ext import commands
+
+from utils.messages import MESSAGE_LIMIT
+
+
+logger = logging.getLogger(__name__)
+
+
+def truncate(text: str, limit: int = MESSAGE_LIMIT) -> str:
+  """Shorten text to fit in one Discord message."""
+  return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+class TutorCog(commands.Cog):
+  """
+  Slash command access to the tutor.
+
+  Attributes:
+    bot: The Discord bot instance.
+  """
+  def __init__(self, bot):
+    self.bot = bot
+
+  @app_commands.command(name="ask", description="Ask Hooter a question.")
+  @app_commands.describe(question="What you'd like to know.",
+                         private="Only show the answer to you.")
+  async def ask(self, interaction: Interaction, question: str, private: bool = False) -> None:
+    """
+    Answer a question with a deferred, optionally ephemeral reply.
+
+    Args:
+      interaction (discord.Interaction): The slash command interaction.
+      question (str): The question to answer.
+      private (bool): Reply ephemerally instead of in the channel.
+    """
+    from bot.events import generate_reply
+
+    await interaction.response.defer(ephemeral=private, thinking=True)
+    # Private answers share the history of questions asked by DM
+    key = f"dm:{interaction.user.id}" if private else f"channel:{interaction.channel_id}"
+    try:
+      response = await generate_reply(question, key, interaction.user.id, interaction.channel_id)
+    except Exception as e:
+      logger.error(f"Failed to answer /ask from {interaction.user.id}: {e}")
+      await interaction.followup.send("Hoo, something went wrong answering that. Please try again.",
+                                      ephemeral=True)
+      return
+    await interaction.followup.send(truncate(response), ephemeral=private)
+
+
+async def setup(bot):
+  await bot.add_cog(TutorCog(bot))
@@ -0,0 +1,125 @@
+"""
+Live index of who is in which voice channel.
+
+The streaks file only records a join time for members currently in the
+study room, and reading it means parsing every record. PresenceIndex keeps
+each voice channel's occupants in memory, in join order, updated from voice
+state events, so listing a room costs time proportional to its occupants
+and no disk I/O.
+"""
+
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional
+
+
+class Presence(NamedTuple):
+  """One member's stay in a voice channel."""
+  user_id: str
+  name: str
+  joined_at: datetime
+
+
+class PresenceIndex:
+  """
+  Voice channel occupants with their join times.
+
+  Attributes:
+    channels (dict): Channel ID -> {user ID: Presence}, oldest join first.
+  """
+  def __init__(self):
+    self.channels: Dict[int, Dict[str, Presence]] = {}
+    self._where: Dict[str, int] = {}
+
+  def join(self, channel_id: int, user_id: str, name: str, joined_at: datetime) -> None:
+    """
+    Record a member entering a channel, leaving any channel they were in.
+
+    Args:
+      channel_id (int): The voice channel joined.
+      user_id (str): The member's ID.
+      name (str): The member's display name.
+      joined_at (datetime): When they joined.
+    """
+    if self._where.get(user_id) == channel_id:
+      return
+    self.leave(user_id)
+    self.channels.setdefault(channel_id, {})[user_id] = Presence(user_id, name, joined_at)
+    self._where[user_id] = channel_id
+
+  def leave(self, user_id: str) -> Optional[Presence]:
+    """
+    Record a member leaving voice.
+
+    Args:
+      user_id (str): The member's ID.
+
+    Returns:
+      Presence: Their stay, or None if they weren't in a tracked channel.
+    """
+    channel_id = self._where.pop(user_id, None)
+    if channel_id is None:
+      return None
+    occupants = self.channels[channel_id]
+    presence = occupants.pop(user_id)
+    if not occupants:
+      del self.channels[channel_id]
+    return presence
+
+  def update(self, user_id: str, name: str, before_channel: Optional[int],
+             after_channel: Optional[int], now: datetime) -> None:
+    """
+    Apply a voice state change.
+
+    Args:
+      user_id (str): The member's ID.
+      name (str): The member's display name.
+      before_channel (int, optional): The channel they were in.
+      after_channel (int, optional): The channel they are in now.
+      now (datetime): When the change happened.
+    """
+    if before_channel == after_channel:
+      return
+    if after_channel is None:
+      self.leave(user_id)
+    else:
+      self.join(after_channel, user_id, name, now)
+
+  def occupants(self, channel_id: int) -> List[Presence]:
+    """Return a channel's occupants, longest-present first."""
+    return list(self.channels.get(channel_id, {}).values())
+
+  def channel_of(self, user_id: str) -> Optional[int]:
+    return self._where.get(user_id)
+
+  def __len__(self):
+    return len(self._where)
+
+
+def format_occupants(occupants: List[Presence], now: datetime, minimum_minutes: int,
+                     near_minutes: int = 5) -> str:
+  """
+  Describe who is in a room, how long they've been there and who is close
+  to counting the day.
+
+  Args:
+    occupants (list): The room's occupants, longest-present first.
+    now (datetime): The current time.
+    minimum_minutes (int): Minutes needed for the day to count.
+    near_minutes (int): How close to the mark counts as almost there.
+
+  Returns:
+    str: The message text.
+  """
+  if not occupants:
+    return "Nobody is studying right now. Hop in and start a session!"
+  lines = [f"**Studying now ({len(occupants)}):**"]
+  for presence in occupants:
+    minutes = int((now - presence.joined_at).total_seconds() // 60)
+    remaining = minimum_minutes - minutes
+    if remaining <= 0:
+      lines.append(f"{presence.name}: {minutes} min ✅")
+    elif remaining <= near_minutes:
+      lines.append(f"{presence.name}: {minutes} min, almost there ({remaining} to go) ⏳")
+    else:
+      lines.append(f"{presence.name}: {minutes} min ({remaining} to go)")
+  return "\n".join(lines)
@@ -0,0 +1,223 @@
+"""
+Streak changes collected between daily digests.
+
+Rather than reposting every member's streak each night, StreaksCog records
+each streak change as it happens. Repeated changes to one user collapse
+into a single entry holding their streak before the first change and after
+the last, so building the digest costs O(changes) regardless of how many
+members the server has.
+
+The pending changes are saved to their own small file, so a restart
+between digests doesn't drop them.
+"""
+
+import json
+import logging
+import os
+import tempfile
+
+from typing import Dict, List, Optional, Tuple
+
+from domain.streak_data import UserStreak
+
+
+logger = logging.getLogger(__name__)
+
+PENDING_DIGEST_FILE = "pending_digest.json"
+FORMAT_VERSION = 1
+MILESTONES = (7, 14, 30, 50, 100, 200, 365)
+MAX_DIGEST_LINES = 40
+# About three Discord messages; the digest is split to fit when posted
+MAX_DIGEST_CHARS = 6000
+
+
+class StreakChange:
+  """
+  One user's net streak change since the last digest.
+
+  Attributes:
+    username (str): The user's name.
+    current_before (int): The current streak before the first change.
+    longest_before (int): The longest streak before the first change.
+    current_after (int): The current streak after the latest change.
+    longest_after (int): The longest streak after the latest change.
+  """
+  __slots__ = ("username", "current_before", "longest_before", "current_after", "longest_after")
+
+  def __init__(self, username: str, current_before: int, longest_before: int):
+    self.username = username
+    self.current_before = current_before
+    self.longest_before = longest_before
+    self.current_after = current_before
+    self.longest_after = longest_before
+
+  def as_row(self) -> list:
+    return [self.username, self.current_before, self.longest_before, self.current_after, self.longest_after]
+
+  @classmethod
+  def from_row(cls, row: list) -> "StreakChange":
+    username, current_before, longest_before, current_after, longest_after = row
+    change = cls(username, current_before, longest_before)
+    change.current_after = current_after
+    change.longest_after = longest_after
+    return change
+
+  @property
+  def milestone(self):
+    """The highest milestone reached by this change, or None."""
+    reached = [m for m in MILESTONES if self.current_before < m <= self.current_after]
+    return reached[-1] if reached else None
+
+  @property
+  def new_record(self) -> bool:
+    return self.longest_after > self.longest_before and self.longest_before > 0
+
+  @property
+  def increased(self) -> bool:
+    return self.current_after > self.current_before
+
+  @property
+  def reset(self) -> bool:
+    return self.current_after < self.current_before
+
+
+class StreakChangeSet:
+  """
+  Collects streak changes keyed by user ID until the next digest.
+
+  Attributes:
+    path (str): The file pending changes are saved to.
+    dirty (bool): Whether there are changes not yet saved.
+  """
+  def __init__(self, path: Optional[str] = None):
+    self.path = path or PENDING_DIGEST_FILE
+    self.dirty = False
+    self._changes: Dict[str, StreakChange] = {}
+
+  def load(self) -> None:
+    """Read the pending changes, starting empty if the file is missing or unreadable."""
+    try:
+      with open(self.path, 'r') as file:
+        loaded = json.load(file)
+    except FileNotFoundError:
+      return
+    except (OSError, json.JSONDecodeError) as e:
+      logger.error(f"Ignoring unreadable pending digest {self.path}: {e}")
+      return
+    if loaded.get("version") == FORMAT_VERSION:
+      self._changes = {user_id: StreakChange.from_row(row) for user_id, row in loaded["changes"].items()}
+
+  def save(self) -> None:
+    """Write the pending changes atomically if they changed."""
+    if not self.dirty:
+      return
+    directory = os.path.dirname(os.path.abspath(self.path))
+    try:
+      with tempfile.NamedTemporaryFile(mode='w', dir=directory, delete=False) as temp_file:
+        json.dump({"version": FORMAT_VERSION,
+                   "changes": {user_id: change.as_row() for user_id, change in self._changes.items()}},
+                  temp_file, separators=(",", ":"))
+      os.replace(temp_file.name, self.path)
+      self.dirty = False
+    except OSError as e:
+      logger.error(f"Failed to save pending digest {self.path}: {e}")
+
+  def before(self, user_id: str, user_data: UserStreak) -> None:
+    """
+    Note a user's streak before it is changed.
+
+    Only the first call per digest period is kept, so the digest compares
+    against the streak as it was at the last digest.
+    """
+    if user_id not in self._changes:
+      self._changes[user_id] = StreakChange(
+        user_data.username, user_data.current_streak, user_data.longest_streak)
+      self.dirty = True
+
+  def after(self, user_id: str, user_data: UserStreak) -> None:
+    """Record a user's streak after a change."""
+    change = self._changes.get(user_id)
+    if change is not None:
+      change.username = user_data.username
+      change.current_after = user_data.current_streak
+      change.longest_after = user_data.longest_streak
+      self.dirty = True
+
+  def changes(self) -> List[StreakChange]:
+    """Return the changes whose net effect is not zero."""
+    return [change for change in self._changes.values()
+            if change.increased or change.reset or change.new_record]
+
+  def clear(self) -> None:
+    self._changes.clear()
+    self.dirty = True
+
+  def pending(self) -> Dict[str, list]:
+    """Return a copy of every entry, to settle once a digest of them is out."""
+    return {user_id: change.as_row() for user_id, change in self._changes.items()}
+
+  def settle(self, posted: Dict[str, list]) -> None:
+    """
+    Drop the entries a digest reported.
+
+    An entry that changed again while the digest was being sent is kept,
+    now measured from the streak the digest showed.
+
+    Args:
+      posted (dict): The output of pending() taken before posting.
+    """
+    for user_id, row in posted.items():
+      change = self._changes.get(user_id)
+      if change is None:
+        continue
+      if change.as_row() == row:
+        del self._changes[user_id]
+      else:
+        change.current_before, change.longest_before = row[3], row[4]
+      self.dirty = True
+
+  def __len__(self):
+    return len(self.changes())
+
+
+def format_digest(changes: List[StreakChange], max_lines: int = MAX_DIGEST_LINES,
+                  max_chars: int = MAX_DIGEST_CHARS) -> str:
+  """
+  Render streak changes as a compact digest.
+
+  Milestones come first, then new records, increases and resets. The
+  digest can be longer than one Discord message; split it with
+  utils.messages.split_message before sending.
+
+  Args:
+    changes (list): The changes to report.
+    max_lines (int): The most change lines to include.
+    max_chars (int): The most characters of change lines to include.
+
+  Returns:
+    str: The digest text.
+  """
+  ordered: List[Tuple[int, str]] = []
+  for change in changes:
+    if change.milestone:
+      ordered.append((0, f"🎯 {change.username} reached {change.milestone} days!"))
+    elif change.new_record:
+      ordered.append((1, f"🏆 {change.username} set a new record of {change.longest_after} days."))
+    elif change.increased:
+      ordered.append((2, f"🔥 {change.username}: {change.current_before} → {change.current_after} days"))
+    elif change.reset:
+      ordered.append((3, f"💤 {change.username}'s streak of {change.current_before} days was reset."))
+  ordered.sort(key=lambda line: line[0])
+
+  lines = [f"**Daily Streak Update:** {len(ordered)} streaks changed today."]
+  used = 0
+  for _, text in ordered[:max_lines]:
+    used += len(text) + 1
+    if used > max_chars:
+      break
+    lines.append(text)
+  shown = len(lines) - 1
+  if len(ordered) > shown:
+    lines.append(f"...and {len(ordered) - shown} more.")
+  lines.append("Use `!board` to see everyone's streaks.")
+  return "\n".join(lines)
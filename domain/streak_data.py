@@ -0,0 +1,141 @@
+"""
+Streak data models and their on-disk codec.
+
+Each user's streak is a slotted UserStreak record. Dates and times are held
+as epoch integers (days since 1970-01-01 for the last study day, POSIX
+seconds for the join time), which keeps records small and makes encoding a
+matter of copying integers. The streaks file stores each record as a
+compact JSON row instead of a dict of string keys, and files written in the
+older per-field format are still read.
+"""
+
+import json
+
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+import pytz
+
+
+FORMAT_VERSION = 2
+FIELDS = ("username", "current_streak", "longest_streak", "last_join_day", "join_ts", "timezone")
+
+EPOCH = date(1970, 1, 1)
+EPOCH_ORDINAL = EPOCH.toordinal()
+
+
+class UserStreak:
+  """
+  One user's streak record.
+
+  Attributes:
+    username (str): The user's name.
+    current_streak (int): Consecutive study days in the current streak.
+    longest_streak (int): The longest streak the user has had.
+    last_join_day (int, optional): The last local study day, as days since 1970-01-01.
+    join_ts (int, optional): When the user joined the study channel, as POSIX seconds.
+    timezone (str, optional): The user's timezone name; None means the default.
+  """
+  __slots__ = FIELDS
+
+  def __init__(self, username: str, current_streak: int = 0, longest_streak: int = 0,
+               last_join_day: Optional[int] = None, join_ts: Optional[int] = None,
+               timezone: Optional[str] = None):
+    self.username = username
+    self.current_streak = current_streak
+    self.longest_streak = longest_streak
+    self.last_join_day = last_join_day
+    self.join_ts = join_ts
+    self.timezone = timezone
+
+  @property
+  def last_join_date(self) -> Optional[date]:
+    if self.last_join_day is None:
+      return None
+    return date.fromordinal(self.last_join_day + EPOCH_ORDINAL)
+
+  @last_join_date.setter
+  def last_join_date(self, value: Optional[date]) -> None:
+    self.last_join_day = None if value is None else value.toordinal() - EPOCH_ORDINAL
+
+  @property
+  def join_time(self) -> Optional[datetime]:
+    if self.join_ts is None:
+      return None
+    return datetime.fromtimestamp(self.join_ts, pytz.utc)
+
+  @join_time.setter
+  def join_time(self, value: Optional[datetime]) -> None:
+    self.join_ts = None if value is None else int(value.timestamp())
+
+  def as_row(self) -> List:
+    """Return the record as a compact row in FIELDS order."""
+    return [self.username, self.current_streak, self.longest_streak,
+            self.last_join_day, self.join_ts, self.timezone]
+
+  def __eq__(self, other):
+    if not isinstance(other, UserStreak):
+      return NotImplemented
+    return self.as_row() == other.as_row()
+
+  def __repr__(self):
+    return (f"UserStreak(username={self.username!r}, current_streak={self.current_streak}, "
+            f"longest_streak={self.longest_streak}, last_join_date={self.last_join_date}, "
+            f"join_ts={self.join_ts}, timezone={self.timezone!r})")
+
+
+def _from_legacy(data: Dict) -> UserStreak:
+  """Convert a record from the original per-field JSON format."""
+  user = UserStreak(data["username"], data["current_streak"], data["longest_streak"],
+                    timezone=data.get("timezone"))
+  if data.get("last_join_date"):
+    user.last_join_date = datetime.fromisoformat(data["last_join_date"]).date()
+  if data.get("join_time"):
+    user.join_time = datetime.fromisoformat(data["join_time"])
+  return user
+
+
+def decode_streaks(text: str) -> Dict[str, UserStreak]:
+  """
+  Decode the contents of a streaks file.
+
+  Args:
+    text (str): The file contents, in the compact or the legacy format.
+
+  Returns:
+    dict: User ID -> UserStreak.
+
+  Raises:
+    json.JSONDecodeError: If the text is not valid JSON.
+  """
+  loaded = json.loads(text)
+  if loaded.get("version") == FORMAT_VERSION:
+    return {user_id: UserStreak(*row) for user_id, row in loaded["users"].items()}
+  return {user_id: _from_legacy(data) for user_id, data in loaded.items()}
+
+
+def encode_streaks(streaks_data: Dict[str, UserStreak]) -> str:
+  """
+  Encode streak records in the compact format.
+
+  Args:
+    streaks_data (dict): User ID -> UserStreak.
+
+  Returns:
+    str: Compact JSON text.
+  """
+  return json.dumps({
+    "version": FORMAT_VERSION,
+    "fields": FIELDS,
+    "users": {user_id: user.as_row() for user_id, user in streaks_data.items()},
+  }, separators=(",", ":"))
+
+
+def epoch_day(day: date) -> int:
+  """Return a date as days since 1970-01-01."""
+  return day.toordinal() - EPOCH_ORDINAL
+
+
+def from_epoch_day(day: int) -> date:
+  """Return the date for a number of days since 1970-01-01."""
+  return EPOCH + timedelta(days=day)
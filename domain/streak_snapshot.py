@@ -0,0 +1,205 @@
+"""
+Fixed-width binary snapshots of streak data for single-user reads.
+
+The JSON streaks file has to be parsed in full to read one user. A snapshot
+stores the same UserStreak records as fixed-width binary rows, followed by
+an open-addressing hash table from user ID to row number, so a reader that
+maps the file can find and unpack one record without touching the others.
+
+Layout (little-endian):
+  header  magic, version, record count, hash table capacity
+  records count x RECORD
+  table   capacity x SLOT (user ID, row number + 1; 0 marks an empty slot)
+"""
+
+import logging
+import mmap
+import os
+import struct
+import tempfile
+
+from typing import Dict, Iterator, Optional, Tuple
+
+from domain.streak_data import UserStreak
+
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"HOOT"
+VERSION = 1
+USERNAME_BYTES = 64
+TIMEZONE_BYTES = 40
+
+HEADER = struct.Struct("<4sHxxII")
+RECORD = struct.Struct(f"<QiiiBBxxq{USERNAME_BYTES}s{TIMEZONE_BYTES}s")
+SLOT = struct.Struct("<QI4x")
+
+# Presence bits for the nullable fields of a record
+HAS_LAST_JOIN = 1
+HAS_JOIN_TS = 2
+
+HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+MASK_64 = (1 << 64) - 1
+
+
+def _slot_for(user_id: int, capacity: int) -> int:
+  """Return the first hash table slot probed for a user ID."""
+  return ((user_id * HASH_MULTIPLIER) & MASK_64) % capacity
+
+
+def _encode_text(text: Optional[str], size: int) -> bytes:
+  """Encode text as UTF-8, truncated to size bytes on a character boundary."""
+  encoded = (text or "").encode("utf-8")[:size]
+  return encoded.decode("utf-8", "ignore").encode("utf-8")
+
+
+def _pack_record(user_id: int, user: UserStreak) -> bytes:
+  flags = (HAS_LAST_JOIN if user.last_join_day is not None else 0) | \
+          (HAS_JOIN_TS if user.join_ts is not None else 0)
+  return RECORD.pack(user_id, user.current_streak, user.longest_streak,
+                     user.last_join_day or 0, flags, 0, user.join_ts or 0,
+                     _encode_text(user.username, USERNAME_BYTES),
+                     _encode_text(user.timezone, TIMEZONE_BYTES))
+
+
+def _unpack_record(buffer, offset: int) -> UserStreak:
+  (_, current, longest, last_join_day, flags, _, join_ts,
+   username, timezone) = RECORD.unpack_from(buffer, offset)
+  timezone = timezone.rstrip(b"\0").decode("utf-8")
+  return UserStreak(username.rstrip(b"\0").decode("utf-8"), current, longest,
+                    last_join_day if flags & HAS_LAST_JOIN else None,
+                    join_ts if flags & HAS_JOIN_TS else None,
+                    timezone or None)
+
+
+def write_snapshot(path: str, streaks_data: Dict[str, UserStreak]) -> None:
+  """
+  Write a snapshot of the streak records, replacing the file atomically.
+
+  Args:
+    path (str): The snapshot file.
+    streaks_data (dict): User ID -> UserStreak. User IDs must be numeric.
+  """
+  rows = [(int(user_id), user) for user_id, user in streaks_data.items()]
+  capacity = max(8, 2 * len(rows))
+  table = [(0, 0)] * capacity
+  for row, (user_id, _) in enumerate(rows):
+    slot = _slot_for(user_id, capacity)
+    while table[slot][1]:
+      slot = (slot + 1) % capacity
+    table[slot] = (user_id, row + 1)
+
+  directory = os.path.dirname(os.path.abspath(path))
+  with tempfile.NamedTemporaryFile(mode='wb', dir=directory, delete=False) as temp_file:
+    temp_file.write(HEADER.pack(MAGIC, VERSION, len(rows), capacity))
+    temp_file.write(b"".join(_pack_record(user_id, user) for user_id, user in rows))
+    temp_file.write(b"".join(SLOT.pack(user_id, row) for user_id, row in table))
+    temp_file.flush()
+    os.fsync(temp_file.fileno())
+  os.replace(temp_file.name, path)
+
+
+class StreakSnapshot:
+  """
+  Reads single records from a snapshot file through mmap.
+
+  The file is mapped on first use and remapped whenever it is replaced, so
+  opening is constant-time and a lookup costs a stat and a few probes.
+
+  Attributes:
+    path (str): The snapshot file.
+  """
+  def __init__(self, path: str):
+    self.path = path
+    self._map = None
+    self._identity = None
+    self._count = 0
+    self._capacity = 0
+
+  def _refresh(self) -> bool:
+    """Map the current file if it changed; return whether one is mapped."""
+    try:
+      stat = os.stat(self.path)
+    except FileNotFoundError:
+      self.close()
+      return False
+    identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    if identity == self._identity:
+      return self._map is not None
+
+    self.close()
+    self._identity = identity
+    # An empty file cannot be mapped and a truncated one (e.g. a crash
+    # mid-write) has no complete header; both are treated as malformed.
+    try:
+      with open(self.path, 'rb') as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError) as e:
+      logger.error(f"Ignoring unreadable streak snapshot {self.path}: {e}")
+      return False
+    try:
+      magic, version, count, capacity = HEADER.unpack_from(mapped, 0)
+    except struct.error:
+      magic = None
+    if magic != MAGIC or version != VERSION \
+        or len(mapped) != HEADER.size + count * RECORD.size + capacity * SLOT.size:
+      logger.error(f"Ignoring malformed streak snapshot {self.path}.")
+      mapped.close()
+      return False
+    self._map, self._count, self._capacity = mapped, count, capacity
+    return True
+
+  def get(self, user_id: str) -> Optional[UserStreak]:
+    """
+    Read one user's record.
+
+    Args:
+      user_id (str): The user's ID.
+
+    Returns:
+      UserStreak: The record, or None if the user or the snapshot is missing.
+    """
+    if not self._refresh():
+      return None
+    key = int(user_id)
+    table_start = HEADER.size + self._count * RECORD.size
+    slot = _slot_for(key, self._capacity)
+    for _ in range(self._capacity):
+      slot_user, row = SLOT.unpack_from(self._map, table_start + slot * SLOT.size)
+      if row == 0:
+        return None
+      if slot_user == key:
+        return _unpack_record(self._map, HEADER.size + (row - 1) * RECORD.size)
+      slot = (slot + 1) % self._capacity
+    return None
+
+  def items(self) -> Iterator[Tuple[str, UserStreak]]:
+    """
+    Stream every record in row order without loading the file.
+
+    Yields:
+      tuple: (user ID, UserStreak).
+    """
+    if not self._refresh():
+      return
+    mapped, count = self._map, self._count
+    for row in range(count):
+      offset = HEADER.size + row * RECORD.size
+      yield str(RECORD.unpack_from(mapped, offset)[0]), _unpack_record(mapped, offset)
+
+  def __len__(self):
+    return self._count if self._refresh() else 0
+
+  @property
+  def available(self) -> bool:
+    """Whether a valid snapshot file is present."""
+    return self._refresh()
+
+  def close(self) -> None:
+    """Unmap the file."""
+    if self._map is not None:
+      self._map.close()
+    self._map = None
+    self._identity = None
+    self._count = 0
+    self._capacity = 0
@@ -0,0 +1,166 @@
+"""
+Cumulative study time per user and local day.
+
+A day counts toward a streak once the member's distinct time in the study
+room that day reaches the daily minimum, however many sessions it took.
+Sessions are split at local midnight and each day keeps its intervals
+sorted and merged, so overlapping or back-to-back sessions are only counted
+once. The interval list is capped: past MAX_INTERVALS the oldest interval
+is folded into a settled total, which is exact as long as later sessions
+don't reach back before it (they never do, as sessions are recorded when
+they end).
+
+Datetimes follow utils.rollover: aware ones are converted to the user's
+timezone, naive ones are taken to be local time already.
+"""
+
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional, Tuple
+
+from domain.streak_data import epoch_day
+from utils.rollover import local_date, local_midnight
+
+
+MAX_INTERVALS = 8
+SECONDS_PER_DAY = 86400
+
+
+def day_start(moment: datetime, tz, days: int = 0) -> datetime:
+  """Return local midnight at the start of a moment's day (plus days), in the moment's kind."""
+  day = local_date(moment, tz) + timedelta(days=days)
+  if moment.tzinfo is None:
+    return datetime.combine(day, time.min)
+  return local_midnight(day, tz)
+
+
+def next_midnight(moment: datetime, tz) -> datetime:
+  """Return the start of the local day after a moment."""
+  return day_start(moment, tz, days=1)
+
+
+def split_by_day(start: datetime, end: datetime, tz) -> List[Tuple[date, datetime, datetime]]:
+  """
+  Split a span of time at local midnights.
+
+  Args:
+    start (datetime): The start of the span.
+    end (datetime): The end of the span.
+    tz (tzinfo): The user's timezone.
+
+  Returns:
+    list: (local date, start, end) for each day the span touches.
+  """
+  pieces = []
+  while start < end:
+    boundary = min(end, next_midnight(start, tz))
+    pieces.append((local_date(start, tz), start, boundary))
+    start = boundary
+  return pieces
+
+
+class StudyDay:
+  """
+  One user's study intervals on one local day.
+
+  Attributes:
+    day (int): The local date as days since 1970-01-01.
+    settled (int): Seconds folded out of the interval list.
+    intervals (list): Disjoint [start, end] POSIX seconds, in order.
+  """
+  __slots__ = ("day", "settled", "intervals")
+
+  def __init__(self, day: int, settled: int = 0, intervals: Optional[List[List[int]]] = None):
+    self.day = day
+    self.settled = settled
+    self.intervals = intervals if intervals is not None else []
+
+  def add(self, start: int, end: int) -> None:
+    """
+    Add an interval, merging it with any it overlaps or touches.
+
+    Args:
+      start (int): POSIX seconds.
+      end (int): POSIX seconds.
+    """
+    if end <= start:
+      return
+    merged = []
+    for interval in self.intervals:
+      if interval[1] < start or interval[0] > end:
+        merged.append(interval)
+      else:
+        start, end = min(start, interval[0]), max(end, interval[1])
+    merged.append([start, end])
+    merged.sort()
+    while len(merged) > MAX_INTERVALS:
+      oldest_start, oldest_end = merged.pop(0)
+      self.settled += oldest_end - oldest_start
+    self.intervals = merged
+
+  def total(self) -> int:
+    """Return the distinct seconds studied."""
+    return self.settled + sum(end - start for start, end in self.intervals)
+
+  def total_with(self, start: int, end: int) -> int:
+    """Return the distinct seconds studied if an interval were added."""
+    preview = StudyDay(self.day, self.settled, list(self.intervals))
+    preview.add(start, end)
+    return preview.total()
+
+  @property
+  def last_end(self) -> Optional[int]:
+    return self.intervals[-1][1] if self.intervals else None
+
+  def as_row(self) -> List[int]:
+    """Return [day, settled, start, end, ...] with times as offsets from the UTC day start."""
+    base = self.day * SECONDS_PER_DAY
+    return [self.day, self.settled, *(value - base for interval in self.intervals for value in interval)]
+
+  @classmethod
+  def from_row(cls, row: List[int]) -> "StudyDay":
+    day, settled, *offsets = row
+    base = day * SECONDS_PER_DAY
+    return cls(day, settled, [[base + offsets[i], base + offsets[i + 1]] for i in range(0, len(offsets), 2)])
+
+  def __eq__(self, other):
+    return isinstance(other, StudyDay) and self.as_row() == other.as_row()
+
+  def __repr__(self):
+    return f"StudyDay({self.as_row()})"
+
+
+def seconds_to_threshold(record: Optional[StudyDay], open_start: datetime, now: datetime, tz,
+                         threshold: int, credited_day: Optional[int] = None) -> Optional[float]:
+  """
+  Work out when an ongoing session takes a day's study time to the threshold.
+
+  If today can no longer get there before midnight, or is already credited,
+  the answer is for tomorrow, where the session counts from midnight.
+
+  Args:
+    record (StudyDay, optional): The user's latest recorded day.
+    open_start (datetime): When the ongoing session started.
+    now (datetime): The current time.
+    tz (tzinfo): The user's timezone.
+    threshold (int): Seconds needed for a day to count.
+    credited_day (int, optional): The last day already credited.
+
+  Returns:
+    float: Seconds from now until the threshold is crossed, or None if it
+      won't be within the next two days.
+  """
+  moment = now
+  for _ in range(2):
+    day = epoch_day(local_date(moment, tz))
+    midnight = next_midnight(moment, tz)
+    if credited_day is None or day > credited_day:
+      start = max(open_start, day_start(moment, tz)).timestamp()
+      recorded = 0
+      if record is not None and record.day == day:
+        recorded = record.total()
+        start = max(start, record.last_end or start)
+      crossing = max(start + threshold - recorded, now.timestamp())
+      if crossing < midnight.timestamp():
+        return crossing - now.timestamp()
+    moment = midnight
+  return None
@@ -1,9 +1,13 @@
 import asyncio
+import concurrent.futures
 import logging
 import os
+import signal
+import sys
 
+from bot import core
 from bot.core import bot, TOKEN
-from flask import Flask
+from flask import Flask, jsonify
 from threading import Thread
 
 
@@ -16,6 +20,28 @@ app = Flask('')
 def home():
     return "Hooter the Tutor is running!"
 
+@app.route('/status')
+def status():
+    from bot.events import quotas, router, watchdog, workers
+    return jsonify({"providers": router.snapshot(), "workers": workers.snapshot(),
+                    "quotas": quotas.snapshot(), "event_loop": watchdog.snapshot(),
+                    "last_flush": bot.flusher.last})
+
+def handle_sigterm(signum, frame):
+    """Flush unsaved state on the bot's loop before exiting, within the deadline."""
+    from bot.events import shutdown
+
+    logger.info("Received SIGTERM, flushing state before exit.")
+    try:
+        future = asyncio.run_coroutine_threadsafe(shutdown("SIGTERM"), bot.loop)
+        future.result(timeout=core.SHUTDOWN_DEADLINE + 1)
+    except concurrent.futures.TimeoutError:
+        logger.warning("Shutdown flush did not finish before the deadline.")
+    except (AttributeError, RuntimeError):
+        # The bot loop hasn't started or has already stopped
+        logger.info("Bot is not running, nothing to flush.")
+    sys.exit(0)
+
 def keep_alive(port):
     app.run(host='0.0.0.0', port=port)
 
@@ -23,6 +49,7 @@ async def async_main():
     await bot.start(TOKEN)
 
 def main():
+    signal.signal(signal.SIGTERM, handle_sigterm)
     keep_alive_thread = Thread(target=bot.run, args=(TOKEN,))
     keep_alive_thread.start()
     port = int(os.environ.get('PORT', 8080))
@@ -1,22 +1,36 @@
 from dotenv import load_dotenv
 import os
+from typing import Dict, List, Optional
 from langchain_community.llms.octoai_endpoint import OctoAIEndpoint
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from responses import get_hooter_explanation
 
 
 load_dotenv()
 class OctoAI:
-  def generate_response(self, user_message: str) -> str:
-    lowered = user_message.lower()
+  # Relative price per token, used by the provider router to send short questions to the cheapest model
+  relative_cost = 1.5
+  # Retries made by the OctoAI client per request; ResilientModel sets this to 0 so retries are not multiplied
+  max_retries = 2
 
-    if "how does this accountability work again" in lowered or "explain the accountability system" in lowered:
-      return get_hooter_explanation()
-    else:
-      return ask_LLM(lowered)
-    
-def ask_LLM(lowered):
+  def generate_response(self, user_message: str, history: Optional[List[Dict]] = None) -> str:
+    try:
+      return self.complete(user_message, history)
+    except Exception as e:
+      return f"An error occurred: {e}"
+
+  def complete(self, user_message: str, history: Optional[List[Dict]] = None, timeout: Optional[float] = None) -> str:
+    """Ask the LLM directly, raising on any failure or after timeout seconds."""
+    return ask_LLM(user_message.lower(), history, timeout, self.max_retries)
+
+def format_history(history: Optional[List[Dict]]) -> str:
+    # Render earlier turns as plain transcript lines for the prompt template
+    if not history:
+        return ""
+    lines = [f"{turn['role'].capitalize()}: {turn['content']}" for turn in history]
+    return "Conversation so far:\n" + "\n".join(lines) + "\n"
+
+def ask_LLM(lowered, history: Optional[List[Dict]] = None, timeout: Optional[float] = None, max_retries: int = 2):
     # API token
     OCTOAI_API_TOKEN = os.environ.get("OCTOAI_API_TOKEN")
     if not OCTOAI_API_TOKEN:
@@ -28,29 +42,25 @@ def ask_LLM(lowered):
         max_tokens=5000,  
         presence_penalty=0,
         temperature=0.5,
-        top_p=1
+        top_p=1,
+        request_timeout=timeout,
+        max_retries=max_retries
     )
 
     # prompt
     template = """You are a helpful, quirky tutor for helping people learn by doing question-answering tasks. Answer the question concisely and accurately, within 3 sentences. If you don't know the answer, just say that you don't know. If the question is inappropriate or contains profanity, refuse to answer.
+    {history}
     Question: {question} 
     Answer:"""
     
     prompt = ChatPromptTemplate.from_template(template)
 
-    # Create a processing chain
-    try:
-        # Prepare the input for the prompt
-        prompt_input = prompt.format(question=lowered)
-        
-        # Call the LLM with the prepared prompt
-        llm_output = llm.invoke(prompt_input)
-        
-        # Parse the output using StrOutputParser
-        output_parser = StrOutputParser()
-        response = output_parser.parse(llm_output)
-        
-        return response
+    # Prepare the input for the prompt
+    prompt_input = prompt.format(question=lowered, history=format_history(history))
 
-    except Exception as e:
-        return f"An error occurred: {e}"
+    # Call the LLM with the prepared prompt
+    llm_output = llm.invoke(prompt_input)
+
+    # Parse the output using StrOutputParser
+    output_parser = StrOutputParser()
+    return output_parser.parse(llm_output)
@@ -0,0 +1,252 @@
+"""
+Load-test harness for the mention path in bot/events.py.
+
+Pumps synthetic mention messages through on_message (or send_message)
+without a Discord connection and reports throughput, per-message latency
+percentiles and event-loop lag. Pair it with scripts/openai_stub_server.py
+(or --start-stub) so no real completions are paid for.
+
+Usage:
+  python -m scripts.load_test --messages 2000 --concurrency 200 --start-stub
+"""
+
+import argparse
+import asyncio
+import itertools
+import logging
+import os
+import random
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from aiohttp import web
+
+from scripts.openai_stub_server import StubConfig, make_app
+
+
+QUESTIONS = [
+  "How does this accountability work again?",
+  "When is the daily session?",
+  "How do I change my timezone?",
+  "Can you explain how binary search works?",
+  "What's the difference between a process and a thread?",
+  "Give me a study plan for dynamic programming.",
+  "How do I stay focused for a long study session?",
+]
+
+
+def percentile(values: List[float], fraction: float) -> float:
+  """Return a percentile of the values, or 0.0 if there are none."""
+  if not values:
+    return 0.0
+  ordered = sorted(values)
+  return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class FakeUser:
+  """The subset of discord.User used by the mention path."""
+  def __init__(self, user_id: int, name: str, bot: bool = False):
+    self.id = user_id
+    self.name = name
+    self.display_name = name
+    self.bot = bot
+    self.sent = 0
+
+  def __str__(self):
+    return self.name
+
+  def mentioned_in(self, message) -> bool:
+    return f"<@!{self.id}>" in message.content
+
+  async def send(self, content):
+    self.sent += 1
+
+
+class FakeChannel:
+  """The subset of discord.TextChannel used by the mention path."""
+  def __init__(self, channel_id: int):
+    self.id = channel_id
+    self.name = f"load-test-{channel_id}"
+    self.sent = 0
+
+  def __str__(self):
+    return self.name
+
+  async def send(self, content):
+    self.sent += 1
+
+
+class FakeMessage:
+  """The subset of discord.Message used by the mention path."""
+  _ids = itertools.count(1)
+
+  def __init__(self, author: FakeUser, channel: FakeChannel, content: str):
+    self.id = next(self._ids)
+    self.author = author
+    self.channel = channel
+    self.content = content
+    self.mention_everyone = False
+    self.mentions = []
+
+
+class LoopLagMonitor:
+  """Samples how late the event loop wakes up from short sleeps."""
+  def __init__(self, interval: float = 0.01):
+    self.interval = interval
+    self.samples: List[float] = []
+    self._running = False
+
+  async def run(self):
+    self._running = True
+    loop = asyncio.get_running_loop()
+    while self._running:
+      expected = loop.time() + self.interval
+      await asyncio.sleep(self.interval)
+      self.samples.append(max(0.0, loop.time() - expected))
+
+  def stop(self):
+    self._running = False
+
+
+def start_stub_in_thread(config: StubConfig) -> str:
+  """
+  Run the stub server on its own event loop in a daemon thread.
+
+  Returns:
+    str: The stub's API base URL.
+  """
+  ready = threading.Event()
+  address = {}
+
+  def serve():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    runner = web.AppRunner(make_app(config))
+    loop.run_until_complete(runner.setup())
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    loop.run_until_complete(site.start())
+    address["port"] = site._server.sockets[0].getsockname()[1]
+    ready.set()
+    loop.run_forever()
+
+  threading.Thread(target=serve, daemon=True).start()
+  ready.wait()
+  return f"http://127.0.0.1:{address['port']}/v1"
+
+
+async def run(args) -> dict:
+  """Pump the synthetic messages and return the measured results."""
+  os.environ.setdefault("LLM_PROVIDERS", "openAI")
+  if not args.keep_quotas:
+    # The synthetic traffic would otherwise be mostly answered with "slow down"
+    for scope in ("USER", "CHANNEL", "GLOBAL"):
+      os.environ.setdefault(f"QUOTA_{scope}_REQUESTS_PER_MINUTE", "1000000")
+      os.environ.setdefault(f"QUOTA_{scope}_TOKENS_PER_MINUTE", "1000000000")
+  if args.start_stub:
+    os.environ["OPENAI_API_BASE"] = start_stub_in_thread(
+      StubConfig(latency_median=args.latency_median, error_rate=args.error_rate))
+  os.environ.setdefault("OPENAI_API_KEY", "stub")
+
+  import openai
+  from bot import events
+  from bot.core import bot
+
+  if "OPENAI_API_BASE" in os.environ:
+    openai.api_base = os.environ["OPENAI_API_BASE"]
+
+  bot_user = FakeUser(1237247053180960830, "Hooter the Tutor", bot=True)
+  bot._connection.user = bot_user
+
+  async def skip_commands(message):
+    return None
+  bot.process_commands = skip_commands
+
+  loop = asyncio.get_running_loop()
+  loop.set_default_executor(ThreadPoolExecutor(max_workers=args.threads))
+
+  channels = [FakeChannel(channel_id) for channel_id in range(1, args.channels + 1)]
+  authors = [FakeUser(10_000 + user_id, f"student{user_id}") for user_id in range(args.users)]
+  messages = [
+    FakeMessage(random.choice(authors), random.choice(channels),
+                f"<@!{bot_user.id}> {random.choice(QUESTIONS)} (#{index})")
+    for index in range(args.messages)
+  ]
+
+  latencies: List[float] = []
+  semaphore = asyncio.Semaphore(args.concurrency)
+
+  async def handle(message):
+    async with semaphore:
+      started = time.perf_counter()
+      if args.path == "send_message":
+        await events.send_message(message, message.content.replace(f"<@!{bot_user.id}>", "").strip())
+      else:
+        await events.on_message(message)
+      latencies.append(time.perf_counter() - started)
+
+  monitor = LoopLagMonitor()
+  monitor_task = asyncio.create_task(monitor.run())
+  started = time.perf_counter()
+  await asyncio.gather(*(handle(message) for message in messages))
+  elapsed = time.perf_counter() - started
+  monitor.stop()
+  await monitor_task
+
+  replies = sum(channel.sent for channel in channels) + sum(author.sent for author in authors)
+  return {
+    "messages": len(messages),
+    "replies": replies,
+    "elapsed": elapsed,
+    "throughput": len(messages) / elapsed if elapsed else 0.0,
+    "latency": {name: percentile(latencies, fraction)
+                for name, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99), ("max", 1.0))},
+    "loop_lag": {name: percentile(monitor.samples, fraction)
+                 for name, fraction in (("p50", 0.5), ("p99", 0.99), ("max", 1.0))},
+  }
+
+
+def format_report(results: dict) -> str:
+  """Render the results as a short plain-text report."""
+  latency = results["latency"]
+  lag = results["loop_lag"]
+  return "\n".join([
+    f"Messages:     {results['messages']} ({results['replies']} replies) in {results['elapsed']:.2f}s",
+    f"Throughput:   {results['throughput']:.1f} msg/s",
+    f"Latency (s):  p50 {latency['p50']:.3f}  p95 {latency['p95']:.3f}  "
+    f"p99 {latency['p99']:.3f}  max {latency['max']:.3f}",
+    f"Loop lag (s): p50 {lag['p50']:.4f}  p99 {lag['p99']:.4f}  max {lag['max']:.4f}",
+  ])
+
+
+def parse_args(argv=None):
+  parser = argparse.ArgumentParser(description="Load-test the bot's mention path.")
+  parser.add_argument("--messages", type=int, default=1000)
+  parser.add_argument("--concurrency", type=int, default=100)
+  parser.add_argument("--channels", type=int, default=10)
+  parser.add_argument("--users", type=int, default=200)
+  parser.add_argument("--threads", type=int, default=32,
+                      help="Worker threads available for blocking model calls.")
+  parser.add_argument("--path", choices=("on_message", "send_message"), default="on_message")
+  parser.add_argument("--start-stub", action="store_true",
+                      help="Start the OpenAI stub server in-process on a free port.")
+  parser.add_argument("--latency-median", type=float, default=0.3)
+  parser.add_argument("--error-rate", type=float, default=0.0)
+  parser.add_argument("--keep-quotas", action="store_true",
+                      help="Apply the configured tutor quotas instead of lifting them.")
+  parser.add_argument("--log-level", default="WARNING")
+  return parser.parse_args(argv)
+
+
+def main(argv=None):
+  args = parse_args(argv)
+  logging.basicConfig(level=args.log_level,
+                      format='%(asctime)s - %(levelname)s - %(message)s')
+  logging.getLogger().setLevel(args.log_level)
+  print(format_report(asyncio.run(run(args))))
+
+
+if __name__ == '__main__':
+  main()
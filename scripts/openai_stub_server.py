@@ -0,0 +1,179 @@
+"""
+A local stand-in for the OpenAI chat-completions API.
+
+Serves POST /v1/chat/completions in the shape the openai SDK expects, with
+configurable latency, error rates and optional streaming, so the mention
+path can be load-tested without paying for real completions.
+
+Usage:
+  python -m scripts.openai_stub_server --port 8787 --latency-median 0.8 --error-rate 0.02
+
+Point the bot at it with:
+  OPENAI_API_BASE=http://127.0.0.1:8787/v1 OPENAI_API_KEY=stub LLM_PROVIDERS=openAI
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+import uuid
+
+from dataclasses import dataclass
+
+from aiohttp import web
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StubConfig:
+  """
+  Behaviour of the stub server.
+
+  Attributes:
+    latency_median (float): Median response latency in seconds (log-normal).
+    latency_sigma (float): Log-normal shape; 0 gives a fixed latency.
+    error_rate (float): Fraction of requests answered with error_status.
+    error_status (int): The HTTP status of injected errors, e.g. 500 or 429.
+    hang_rate (float): Fraction of requests that never answer before hang_seconds.
+    hang_seconds (float): How long a hanging request waits before answering.
+    reply (str): The completion text returned.
+    stream_chunk_delay (float): Seconds between streamed chunks.
+  """
+  latency_median: float = 0.5
+  latency_sigma: float = 0.4
+  error_rate: float = 0.0
+  error_status: int = 500
+  hang_rate: float = 0.0
+  hang_seconds: float = 60.0
+  reply: str = "Hoo hoo! This is a stub answer from the local test server."
+  stream_chunk_delay: float = 0.01
+
+  def sample_latency(self) -> float:
+    """Draw one response latency in seconds."""
+    if self.latency_sigma <= 0:
+      return self.latency_median
+    return random.lognormvariate(0, self.latency_sigma) * self.latency_median
+
+
+def completion_body(model: str, content: str) -> dict:
+  """Build a non-streaming chat-completion response body."""
+  return {
+    "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+    "object": "chat.completion",
+    "created": int(time.time()),
+    "model": model,
+    "choices": [{
+      "index": 0,
+      "message": {"role": "assistant", "content": content},
+      "finish_reason": "stop",
+    }],
+    "usage": {"prompt_tokens": 0, "completion_tokens": len(content.split()),
+              "total_tokens": len(content.split())},
+  }
+
+
+def chunk_body(completion_id: str, model: str, delta: dict, finish_reason=None) -> dict:
+  """Build one streamed chat-completion chunk."""
+  return {
+    "id": completion_id,
+    "object": "chat.completion.chunk",
+    "created": int(time.time()),
+    "model": model,
+    "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+  }
+
+
+async def chat_completions(request: web.Request) -> web.StreamResponse:
+  """Handle POST /v1/chat/completions."""
+  config: StubConfig = request.app["config"]
+  stats = request.app["stats"]
+  payload = await request.json()
+  model = payload.get("model", "stub-model")
+  stats["requests"] += 1
+
+  roll = random.random()
+  if roll < config.hang_rate:
+    stats["hangs"] += 1
+    await asyncio.sleep(config.hang_seconds)
+  else:
+    await asyncio.sleep(config.sample_latency())
+
+  if random.random() < config.error_rate:
+    stats["errors"] += 1
+    return web.json_response(
+      {"error": {"message": "Injected stub error", "type": "server_error", "code": None}},
+      status=config.error_status)
+
+  if not payload.get("stream"):
+    return web.json_response(completion_body(model, config.reply))
+
+  completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+  response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+  await response.prepare(request)
+  await response.write(
+    f"data: {json.dumps(chunk_body(completion_id, model, {'role': 'assistant'}))}\n\n".encode())
+  for word in config.reply.split(" "):
+    await asyncio.sleep(config.stream_chunk_delay)
+    chunk = chunk_body(completion_id, model, {"content": word + " "})
+    await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+  await response.write(
+    f"data: {json.dumps(chunk_body(completion_id, model, {}, 'stop'))}\n\n".encode())
+  await response.write(b"data: [DONE]\n\n")
+  await response.write_eof()
+  return response
+
+
+async def stats_handler(request: web.Request) -> web.Response:
+  """Handle GET /stats with request and injected-failure counts."""
+  return web.json_response(request.app["stats"])
+
+
+def make_app(config: StubConfig) -> web.Application:
+  """
+  Create the stub application.
+
+  Args:
+    config (StubConfig): The latency and error behaviour to emulate.
+
+  Returns:
+    web.Application: The aiohttp application.
+  """
+  app = web.Application()
+  app["config"] = config
+  app["stats"] = {"requests": 0, "errors": 0, "hangs": 0}
+  app.router.add_post("/v1/chat/completions", chat_completions)
+  app.router.add_post("/chat/completions", chat_completions)
+  app.router.add_get("/stats", stats_handler)
+  return app
+
+
+def parse_args(argv=None):
+  parser = argparse.ArgumentParser(description="Local OpenAI chat-completions stub server.")
+  parser.add_argument("--host", default="127.0.0.1")
+  parser.add_argument("--port", type=int, default=8787)
+  parser.add_argument("--latency-median", type=float, default=StubConfig.latency_median)
+  parser.add_argument("--latency-sigma", type=float, default=StubConfig.latency_sigma)
+  parser.add_argument("--error-rate", type=float, default=StubConfig.error_rate)
+  parser.add_argument("--error-status", type=int, default=StubConfig.error_status)
+  parser.add_argument("--hang-rate", type=float, default=StubConfig.hang_rate)
+  parser.add_argument("--hang-seconds", type=float, default=StubConfig.hang_seconds)
+  return parser.parse_args(argv)
+
+
+def main(argv=None):
+  logging.basicConfig(level=logging.INFO,
+                      format='%(asctime)s - %(levelname)s - %(message)s')
+  args = parse_args(argv)
+  config = StubConfig(latency_median=args.latency_median, latency_sigma=args.latency_sigma,
+                      error_rate=args.error_rate, error_status=args.error_status,
+                      hang_rate=args.hang_rate, hang_seconds=args.hang_seconds)
+  logger.info(f"Starting OpenAI stub on http://{args.host}:{args.port}/v1 with {config}")
+  web.run_app(make_app(config), host=args.host, port=args.port)
+
+
+if __name__ == '__main__':
+  main()
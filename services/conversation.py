@@ -0,0 +1,177 @@
+"""
+Token-budgeted conversation memory for the tutor.
+
+Recent turns are kept per conversation (a guild channel or a DM) in a
+bounded ring buffer. Each turn caches its estimated token count so the
+history can be trimmed to a token budget without re-counting on every
+message. Turns that fall out of the budget can optionally be folded into a
+short running summary instead of being forgotten outright.
+"""
+
+from collections import OrderedDict, deque
+from typing import Callable, Dict, List, Optional
+
+
+def estimate_tokens(text: str) -> int:
+  """
+  Estimate the number of tokens in a piece of text.
+
+  Uses the common heuristic of roughly four characters per token, which is
+  close enough for budgeting without pulling in a tokenizer.
+
+  Args:
+    text (str): The text to measure.
+
+  Returns:
+    int: The estimated token count (at least 1).
+  """
+  return max(1, (len(text) + 3) // 4)
+
+
+def compact_summary(previous: Optional[str], dropped: List[Dict], max_chars: int = 600) -> str:
+  """
+  Fold dropped turns into a short extractive summary.
+
+  Keeps the first sentence of each dropped user question so the model still
+  knows what was discussed earlier, without paying for an extra LLM call.
+
+  Args:
+    previous (str, optional): The existing summary, if any.
+    dropped (list): The turns that no longer fit in the budget.
+    max_chars (int): The maximum length of the summary.
+
+  Returns:
+    str: The updated summary.
+  """
+  topics = [previous] if previous else []
+  for turn in dropped:
+    if turn["role"] == "user":
+      first_sentence = turn["content"].split(". ")[0].strip()
+      topics.append(first_sentence[:160])
+  summary = "; ".join(topic for topic in topics if topic)
+  return summary[-max_chars:]
+
+
+class Turn:
+  """A single message in a conversation with its cached token count."""
+  __slots__ = ("role", "content", "tokens")
+
+  def __init__(self, role: str, content: str):
+    self.role = role
+    self.content = content
+    self.tokens = estimate_tokens(content)
+
+  def as_message(self) -> Dict:
+    return {"role": self.role, "content": self.content}
+
+
+class Conversation:
+  """The bounded turn buffer and running summary for one conversation."""
+  __slots__ = ("turns", "total_tokens", "summary", "summary_tokens")
+
+  def __init__(self, max_turns: int):
+    self.turns = deque(maxlen=max_turns)
+    self.total_tokens = 0
+    self.summary = None
+    self.summary_tokens = 0
+
+
+class ConversationMemory:
+  """
+  Per-conversation ring buffers of recent turns, trimmed to a token budget.
+
+  Attributes:
+    token_budget (int): The maximum estimated tokens of history to return.
+    max_turns (int): The maximum number of turns kept per conversation.
+    max_conversations (int): The number of conversations kept before the
+      least recently used one is forgotten.
+    summarizer (Callable, optional): Folds dropped turns into a summary.
+  """
+  def __init__(self, token_budget: int = 1500, max_turns: int = 20,
+               max_conversations: int = 500,
+               summarizer: Optional[Callable[[Optional[str], List[Dict]], str]] = None):
+    self.token_budget = token_budget
+    self.max_turns = max_turns
+    self.max_conversations = max_conversations
+    self.summarizer = summarizer
+    self._conversations: "OrderedDict[str, Conversation]" = OrderedDict()
+
+  def __len__(self):
+    return len(self._conversations)
+
+  def add(self, key: str, role: str, content: str) -> None:
+    """
+    Record a turn and trim the conversation back under its token budget.
+
+    Args:
+      key (str): The conversation key, e.g. a channel or DM identifier.
+      role (str): "user" or "assistant".
+      content (str): The message text.
+    """
+    conversation = self._get_or_create(key)
+    turns = conversation.turns
+    dropped = []
+    if len(turns) == turns.maxlen:
+      oldest = turns[0]
+      conversation.total_tokens -= oldest.tokens
+      dropped.append(oldest.as_message())
+
+    turn = Turn(role, content)
+    turns.append(turn)
+    conversation.total_tokens += turn.tokens
+
+    while len(turns) > 1 and conversation.total_tokens + conversation.summary_tokens > self.token_budget:
+      oldest = turns.popleft()
+      conversation.total_tokens -= oldest.tokens
+      dropped.append(oldest.as_message())
+
+    if dropped and self.summarizer:
+      conversation.summary = self.summarizer(conversation.summary, dropped)
+      conversation.summary_tokens = estimate_tokens(conversation.summary) if conversation.summary else 0
+      if conversation.total_tokens + conversation.summary_tokens > self.token_budget:
+        conversation.summary = None
+        conversation.summary_tokens = 0
+
+  def history(self, key: str) -> List[Dict]:
+    """
+    Return the recent turns of a conversation as chat messages.
+
+    Args:
+      key (str): The conversation key.
+
+    Returns:
+      list: Chat messages, oldest first, within the token budget.
+    """
+    conversation = self._conversations.get(key)
+    if conversation is None:
+      return []
+    self._conversations.move_to_end(key)
+
+    messages = []
+    if conversation.summary:
+      messages.append({"role": "system",
+                       "content": f"Earlier in this conversation: {conversation.summary}"})
+    messages.extend(turn.as_message() for turn in conversation.turns)
+    return messages
+
+  def token_count(self, key: str) -> int:
+    """Return the cached token count of a conversation's history."""
+    conversation = self._conversations.get(key)
+    if conversation is None:
+      return 0
+    return conversation.total_tokens + conversation.summary_tokens
+
+  def clear(self, key: str) -> None:
+    """Forget a conversation."""
+    self._conversations.pop(key, None)
+
+  def _get_or_create(self, key: str) -> Conversation:
+    conversation = self._conversations.get(key)
+    if conversation is None:
+      conversation = Conversation(self.max_turns)
+      self._conversations[key] = conversation
+      if len(self._conversations) > self.max_conversations:
+        self._conversations.popitem(last=False)
+    else:
+      self._conversations.move_to_end(key)
+    return conversation
@@ -0,0 +1,244 @@
+"""
+Streaming export of streak records and session history.
+
+Rows are produced by generators and written in fixed-size chunks, so an
+export holds at most one chunk of rows in memory whatever the size of the
+server. CSV needs nothing beyond the standard library; Parquet needs the
+optional pyarrow package, and each chunk becomes one row group.
+
+Run as a script to export from the bot's files:
+
+  python -m services.export streaks --format parquet --output streaks.parquet
+  python -m services.export sessions --output sessions.csv
+"""
+
+import argparse
+import csv
+import itertools
+import logging
+import os
+
+from datetime import date, datetime, timezone
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from domain.streak_data import UserStreak
+from services import session_log
+
+
+logger = logging.getLogger(__name__)
+
+KINDS = ("streaks", "sessions")
+FORMATS = ("csv", "parquet")
+CHUNK_SIZE = 5000
+
+STREAK_COLUMNS = ("user_id", "username", "current_streak", "longest_streak", "last_join_date", "timezone")
+SESSION_COLUMNS = ("user_id", "start", "end", "minutes")
+
+
+class ExportError(RuntimeError):
+  """Raised when an export can't be produced, e.g. pyarrow is missing."""
+
+
+def streak_rows(records: Iterable[Tuple[str, UserStreak]]) -> Iterator[Tuple]:
+  """
+  Turn streak records into export rows.
+
+  Args:
+    records (iterable): (user ID, UserStreak) pairs.
+
+  Yields:
+    tuple: One row per user, in STREAK_COLUMNS order.
+  """
+  for user_id, user in records:
+    yield (user_id, user.username, user.current_streak, user.longest_streak,
+           user.last_join_date, user.timezone)
+
+
+def session_rows(path: Optional[str] = None) -> Iterator[Tuple]:
+  """
+  Stream the session history as export rows.
+
+  Args:
+    path (str, optional): The history file; defaults to the bot's.
+
+  Yields:
+    tuple: One row per session, in SESSION_COLUMNS order, with UTC times.
+  """
+  for user_id, start, end in session_log.iter_sessions(path):
+    yield (user_id, datetime.fromtimestamp(start, timezone.utc),
+           datetime.fromtimestamp(end, timezone.utc), (end - start) // 60)
+
+
+def chunked(rows: Iterable[Tuple], size: int) -> Iterator[List[Tuple]]:
+  """Group rows into lists of at most size rows."""
+  iterator = iter(rows)
+  while chunk := list(itertools.islice(iterator, size)):
+    yield chunk
+
+
+def csv_value(value):
+  """Format a value for CSV: blanks for None and ISO 8601 for dates and times."""
+  if value is None:
+    return ""
+  return value.isoformat() if isinstance(value, (date, datetime)) else value
+
+
+def write_csv(rows: Iterable[Tuple], columns: Sequence[str], path: str,
+              chunk_size: int = CHUNK_SIZE) -> int:
+  """
+  Write rows to a CSV file with a header line.
+
+  Args:
+    rows (iterable): The rows to write.
+    columns (sequence): The column names.
+    path (str): The output file.
+    chunk_size (int): Rows written per batch.
+
+  Returns:
+    int: The number of rows written.
+  """
+  written = 0
+  with open(path, 'w', newline='') as file:
+    writer = csv.writer(file)
+    writer.writerow(columns)
+    for chunk in chunked(rows, chunk_size):
+      writer.writerows([csv_value(value) for value in row] for row in chunk)
+      written += len(chunk)
+  return written
+
+
+def parquet_schema(kind: str):
+  """Return the pyarrow schema for an export kind."""
+  import pyarrow as pa
+
+  if kind == "streaks":
+    return pa.schema([("user_id", pa.string()), ("username", pa.string()),
+                      ("current_streak", pa.int32()), ("longest_streak", pa.int32()),
+                      ("last_join_date", pa.date32()), ("timezone", pa.string())])
+  return pa.schema([("user_id", pa.string()), ("start", pa.timestamp("s", tz="UTC")),
+                    ("end", pa.timestamp("s", tz="UTC")), ("minutes", pa.int64())])
+
+
+def write_parquet(rows: Iterable[Tuple], kind: str, path: str, chunk_size: int = CHUNK_SIZE) -> int:
+  """
+  Write rows to a Parquet file, one row group per chunk.
+
+  Args:
+    rows (iterable): The rows to write.
+    kind (str): "streaks" or "sessions", selecting the schema.
+    path (str): The output file.
+    chunk_size (int): Rows per row group.
+
+  Returns:
+    int: The number of rows written.
+
+  Raises:
+    ExportError: If pyarrow is not installed.
+  """
+  try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+  except ImportError:
+    raise ExportError("Parquet export needs pyarrow; install it or export CSV instead.") from None
+
+  schema = parquet_schema(kind)
+  written = 0
+  with pq.ParquetWriter(path, schema) as writer:
+    for chunk in chunked(rows, chunk_size):
+      columns = list(zip(*chunk))
+      writer.write_table(pa.Table.from_arrays(
+        [pa.array(column, type=field.type) for column, field in zip(columns, schema)], schema=schema))
+      written += len(chunk)
+  return written
+
+
+def export(kind: str, fmt: str, path: str, records: Optional[Iterable[Tuple[str, UserStreak]]] = None,
+           sessions_path: Optional[str] = None, chunk_size: int = CHUNK_SIZE) -> int:
+  """
+  Export streak records or session history to a file.
+
+  Args:
+    kind (str): "streaks" or "sessions".
+    fmt (str): "csv" or "parquet".
+    path (str): The output file.
+    records (iterable, optional): (user ID, UserStreak) pairs, for streaks.
+    sessions_path (str, optional): The session history file, for sessions.
+    chunk_size (int): Rows per write.
+
+  Returns:
+    int: The number of rows written.
+  """
+  if kind not in KINDS or fmt not in FORMATS:
+    raise ExportError(f"Can't export {kind} as {fmt}; choose {'/'.join(KINDS)} and {'/'.join(FORMATS)}.")
+  if kind == "streaks":
+    rows, columns = streak_rows(records or ()), STREAK_COLUMNS
+  else:
+    rows, columns = session_rows(sessions_path), SESSION_COLUMNS
+  if fmt == "parquet":
+    return write_parquet(rows, kind, path, chunk_size)
+  return write_csv(rows, columns, path, chunk_size)
+
+
+def snapshot_is_current(snapshot_path: str, streaks_path: str) -> bool:
+  """
+  Return whether a streak snapshot is at least as new as the JSON streaks file.
+
+  The bot writes the snapshot right after the JSON, so an older snapshot
+  was left behind by a run with STREAK_SNAPSHOT turned off.
+  """
+  try:
+    snapshot_time = os.path.getmtime(snapshot_path)
+  except OSError:
+    return False
+  try:
+    return snapshot_time >= os.path.getmtime(streaks_path)
+  except OSError:
+    return True
+
+
+def stored_streak_records() -> Iterator[Tuple[str, UserStreak]]:
+  """
+  Stream the bot's saved streak records.
+
+  Records are read from the binary snapshot when STREAK_SNAPSHOT is on and
+  the snapshot is current; otherwise the JSON streaks file has to be
+  parsed as a whole.
+  """
+  from bot import core
+  from cogs import streaks
+  from domain.streak_snapshot import StreakSnapshot
+
+  if core.STREAK_SNAPSHOT and snapshot_is_current(streaks.STREAKS_SNAPSHOT_FILE, streaks.STREAKS_FILE):
+    snapshot = StreakSnapshot(streaks.STREAKS_SNAPSHOT_FILE)
+    if snapshot.available:
+      yield from snapshot.items()
+      snapshot.close()
+      return
+  yield from streaks.StreaksCog.load_streaks().items()
+
+
+def parse_args(argv=None):
+  parser = argparse.ArgumentParser(description="Export streak records or session history.")
+  parser.add_argument("kind", choices=KINDS)
+  parser.add_argument("--format", choices=FORMATS, default="csv")
+  parser.add_argument("--output", default=None, help="Output file (defaults to <kind>.<format>).")
+  parser.add_argument("--sessions", default=session_log.SESSIONS_FILE)
+  parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+  return parser.parse_args(argv)
+
+
+def main(argv=None):
+  logging.basicConfig(level=logging.INFO,
+                      format='%(asctime)s - %(levelname)s - %(message)s')
+  args = parse_args(argv)
+  output = args.output or f"{args.kind}.{args.format}"
+  records = stored_streak_records() if args.kind == "streaks" else None
+  try:
+    written = export(args.kind, args.format, output, records, args.sessions, args.chunk_size)
+  except ExportError as e:
+    raise SystemExit(str(e))
+  print(f"Exported {written} {args.kind} rows to {output}.")
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,224 @@
+"""
+Offline FAQ retrieval over our own documentation.
+
+Passages from data/faq.md, the system explanation in responses.py and the
+canned intent answers are embedded as hashed word uni/bigram TF-IDF vectors.
+The matrix is built once, cached as .npy files keyed by a hash of the corpus,
+and memory-mapped on later starts so every process shares the same pages.
+
+A question is scored against every passage with one sparse dot product. A
+high-confidence match is answered directly; weaker matches are handed to the
+LLM as compact context instead of letting it guess about the server.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import zlib
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from responses import get_hooter_explanation
+
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FAQ_FILE = os.path.join(ROOT_DIR, "data", "faq.md")
+INTENTS_FILE = os.path.join(ROOT_DIR, "data", "intents.json")
+INDEX_DIR = os.getenv("FAQ_INDEX_DIR", os.path.join(ROOT_DIR, ".cache", "faq_index"))
+
+DIMENSIONS = 2 ** 14
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+_STOP_WORDS = frozenset(
+  "a an and are as at be by can do does for from how i if in is it me my of on or "
+  "our so that the this to we what when where which who why will with you your".split())
+
+
+def tokenize(text: str) -> List[str]:
+  """Split text into lowercase word unigrams and bigrams, without stop words."""
+  words = [word for word in _TOKEN.findall(text.lower()) if word not in _STOP_WORDS]
+  return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+
+def hash_features(text: str, dimensions: int = DIMENSIONS) -> Dict[int, float]:
+  """
+  Map text to sublinear term frequencies over hashed feature buckets.
+
+  Args:
+    text (str): The text to featurize.
+    dimensions (int): The number of hash buckets.
+
+  Returns:
+    dict: Bucket index -> 1 + log(term frequency).
+  """
+  counts: Dict[int, int] = {}
+  for token in tokenize(text):
+    bucket = zlib.crc32(token.encode("utf-8")) % dimensions
+    counts[bucket] = counts.get(bucket, 0) + 1
+  return {bucket: 1.0 + np.log(count) for bucket, count in counts.items()}
+
+
+def load_corpus() -> List[str]:
+  """
+  Collect the passages describing the server and the bot.
+
+  Returns:
+    list: Passages from the FAQ file, the system explanation and the
+      intent answers, without duplicates.
+  """
+  passages = []
+  try:
+    with open(FAQ_FILE, 'r') as file:
+      blocks = file.read().split("\n\n")
+    # The first two blocks are the title and the note for editors
+    passages.extend(" ".join(block.split()) for block in blocks[2:] if block.strip())
+  except OSError as e:
+    logger.warning(f"Could not read FAQ passages from {FAQ_FILE}: {e}")
+
+  for line in get_hooter_explanation().splitlines():
+    if line.startswith("•"):
+      passages.append(line.lstrip("• ").replace("**", ""))
+
+  try:
+    with open(INTENTS_FILE, 'r') as file:
+      intents = json.load(file)["intents"]
+    passages.extend(intent["response"] for intent in intents if "response" in intent)
+  except (OSError, ValueError, KeyError) as e:
+    logger.warning(f"Could not read intent answers from {INTENTS_FILE}: {e}")
+
+  return list(dict.fromkeys(passages))
+
+
+class FaqIndex:
+  """
+  A TF-IDF index of FAQ passages.
+
+  Attributes:
+    passages (list): The indexed passages.
+    matrix (np.ndarray): L2-normalized passage vectors stored term-major,
+      one row per hash bucket and one column per passage.
+    idf (np.ndarray): Inverse document frequency per hash bucket.
+    answer_threshold (float): Minimum cosine score to answer directly.
+    context_threshold (float): Minimum cosine score to use as LLM context.
+  """
+  def __init__(self, passages: List[str], matrix: np.ndarray, idf: np.ndarray,
+               answer_threshold: float = 0.45, context_threshold: float = 0.15):
+    self.passages = passages
+    self.matrix = matrix
+    self.idf = idf
+    self.answer_threshold = answer_threshold
+    self.context_threshold = context_threshold
+
+  @classmethod
+  def build(cls, passages: List[str], index_dir: Optional[str] = INDEX_DIR, **kwargs) -> "FaqIndex":
+    """
+    Build the index, reusing a memory-mapped copy when the corpus is unchanged.
+
+    Args:
+      passages (list): The passages to index.
+      index_dir (str, optional): Where to cache the matrix; None disables caching.
+
+    Returns:
+      FaqIndex: The ready index.
+    """
+    digest = hashlib.sha1("\0".join(passages).encode("utf-8") + str(DIMENSIONS).encode()).hexdigest()[:16]
+    if index_dir:
+      matrix_path = os.path.join(index_dir, f"{digest}.matrix.npy")
+      idf_path = os.path.join(index_dir, f"{digest}.idf.npy")
+      if os.path.exists(matrix_path) and os.path.exists(idf_path):
+        logger.info(f"Memory-mapping FAQ index from {matrix_path}")
+        return cls(passages, np.load(matrix_path, mmap_mode='r'),
+                   np.load(idf_path, mmap_mode='r'), **kwargs)
+
+    matrix, idf = cls.vectorize(passages)
+    if index_dir:
+      try:
+        os.makedirs(index_dir, exist_ok=True)
+        np.save(matrix_path, matrix)
+        np.save(idf_path, idf)
+        matrix = np.load(matrix_path, mmap_mode='r')
+        idf = np.load(idf_path, mmap_mode='r')
+      except OSError as e:
+        logger.warning(f"Could not cache FAQ index in {index_dir}: {e}")
+    logger.info(f"Built FAQ index over {len(passages)} passages.")
+    return cls(passages, matrix, idf, **kwargs)
+
+  @staticmethod
+  def vectorize(passages: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute L2-normalized TF-IDF vectors for the passages.
+
+    Returns:
+      tuple: The (DIMENSIONS x passages) matrix and the IDF vector.
+    """
+    matrix = np.zeros((len(passages), DIMENSIONS), dtype=np.float32)
+    for row, passage in enumerate(passages):
+      features = hash_features(passage)
+      if features:
+        matrix[row, list(features)] = list(features.values())
+
+    document_frequency = np.count_nonzero(matrix, axis=0)
+    idf = (np.log((1 + len(passages)) / (1 + document_frequency)) + 1).astype(np.float32)
+    matrix *= idf
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix /= np.where(norms == 0, 1, norms)
+    # Term-major layout: a lookup reads one contiguous row per question term
+    return np.ascontiguousarray(matrix.T), idf
+
+  def search(self, question: str, top_k: int = 3) -> List[Tuple[float, str]]:
+    """
+    Score a question against every passage.
+
+    Only the rows of the question's non-zero features are read, so a
+    lookup touches a handful of pages of the memory-mapped matrix.
+
+    Args:
+      question (str): The question being asked.
+      top_k (int): The number of passages to return.
+
+    Returns:
+      list: (cosine score, passage) pairs, best first.
+    """
+    features = hash_features(question)
+    if not features or not self.passages:
+      return []
+    buckets = np.fromiter(features, dtype=np.intp, count=len(features))
+    weights = np.fromiter(features.values(), dtype=np.float32, count=len(features)) * self.idf[buckets]
+    norm = np.linalg.norm(weights)
+    if norm == 0:
+      return []
+    scores = (weights / norm) @ self.matrix[buckets]
+    best = np.argsort(scores)[::-1][:top_k]
+    return [(float(scores[i]), self.passages[i]) for i in best if scores[i] > 0]
+
+  def answer(self, question: str) -> Optional[str]:
+    """Return the best passage if it matches with high confidence."""
+    results = self.search(question, top_k=1)
+    if results and results[0][0] >= self.answer_threshold:
+      return results[0][1]
+    return None
+
+  def context(self, question: str, top_k: int = 3) -> Optional[Dict]:
+    """
+    Return relevant passages as a system message for the LLM.
+
+    Args:
+      question (str): The question being asked.
+      top_k (int): The maximum number of passages to include.
+
+    Returns:
+      dict, optional: A chat message, or None if nothing is relevant.
+    """
+    relevant = [passage for score, passage in self.search(question, top_k)
+                if score >= self.context_threshold]
+    if not relevant:
+      return None
+    facts = "\n".join(f"- {passage}" for passage in relevant)
+    return {"role": "system",
+            "content": f"Facts about this study server that may help answer:\n{facts}"}
@@ -0,0 +1,106 @@
+"""
+Coordinated flushing of in-memory state to disk.
+
+Stores (streak records, the member snapshot, the LeetCode cache) register a
+dirty check and a flush function. A flush writes only the stores with
+unsaved changes, so routine gateway disconnects cost nothing when the
+regular save paths already kept up, and a shutdown flush is bounded by a
+deadline: stores are written in registration order, most important first,
+and whatever the deadline doesn't leave time for is reported as missed
+rather than holding up the exit.
+
+Each write runs on a worker thread, so disk I/O doesn't block the event
+loop, and is given only what is left of the deadline. A write that runs
+over is reported as missed; its thread can't be stopped, but the stores
+write atomically, so it either lands whole or not at all. A store the loop
+changes mid-write fails that write and stays dirty for the next flush.
+"""
+
+import asyncio
+import logging
+import time
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+class FlushCoordinator:
+  """
+  Flushes registered stores that have unsaved changes.
+
+  Attributes:
+    flushes (int): Flushes run so far.
+    last (dict, optional): The summary of the most recent flush.
+  """
+  def __init__(self, clock: Callable[[], float] = time.monotonic):
+    self._stores: Dict[str, Tuple[Callable[[], bool], Callable[[], object]]] = {}
+    self._clock = clock
+    self.flushes = 0
+    self.last: Optional[Dict] = None
+
+  def register(self, name: str, dirty: Callable[[], bool], flush: Callable[[], object]) -> None:
+    """
+    Add a store, or replace one registered under the same name.
+
+    Args:
+      name (str): The store's name, used in logs.
+      dirty (callable): Returns whether the store has unsaved changes.
+      flush (callable): Writes the store; it is still dirty afterwards if
+        the write failed.
+    """
+    self._stores[name] = (dirty, flush)
+
+  def unregister(self, name: str) -> None:
+    self._stores.pop(name, None)
+
+  @property
+  def names(self) -> List[str]:
+    return list(self._stores)
+
+  async def flush(self, reason: str, deadline: Optional[float] = None) -> Dict:
+    """
+    Write every dirty store, stopping when the deadline has passed.
+
+    Args:
+      reason (str): Why the flush happened, e.g. "disconnect" or "SIGTERM".
+      deadline (float, optional): Seconds allowed for the whole flush.
+
+    Returns:
+      dict: The stores flushed, skipped as clean, failed and missed, and
+        the elapsed seconds.
+    """
+    started = self._clock()
+    summary = {"reason": reason, "flushed": [], "clean": [], "failed": [], "missed": []}
+    for name, (dirty, flush) in list(self._stores.items()):
+      remaining = None
+      if deadline is not None:
+        remaining = deadline - (self._clock() - started)
+        if remaining <= 0:
+          summary["missed"].append(name)
+          continue
+      try:
+        if not dirty():
+          summary["clean"].append(name)
+          continue
+        await asyncio.wait_for(asyncio.to_thread(flush), remaining)
+        summary["failed" if dirty() else "flushed"].append(name)
+      except asyncio.TimeoutError:
+        logger.warning(f"Flushing {name} ran past the deadline.")
+        summary["missed"].append(name)
+      except Exception as e:
+        logger.error(f"Flushing {name} failed: {e}")
+        summary["failed"].append(name)
+    summary["elapsed"] = round(self._clock() - started, 4)
+
+    self.flushes += 1
+    self.last = summary
+    if summary["flushed"] or summary["failed"] or summary["missed"]:
+      logger.info(f"Flush on {reason}: wrote {len(summary['flushed'])} of {len(self._stores)} stores "
+                  f"({', '.join(summary['flushed']) or 'none'}) in {summary['elapsed'] * 1000:.0f} ms; "
+                  f"failed: {', '.join(summary['failed']) or 'none'}; "
+                  f"missed: {', '.join(summary['missed']) or 'none'}.")
+    else:
+      logger.info(f"Flush on {reason}: nothing to write ({summary['elapsed'] * 1000:.0f} ms).")
+    return summary
@@ -0,0 +1,207 @@
+"""
+Canned answers for common questions, matched ahead of the LLM.
+
+The intent table lives in data/intents.json. Every phrase of every intent
+is compiled into a single Aho-Corasick automaton, so a question is scanned
+once, in time linear in its length, no matter how many phrases the table
+holds. Matched questions are answered without a paid API call. The table is
+reloaded automatically when the data file changes on disk.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from responses import get_hooter_explanation
+
+
+logger = logging.getLogger(__name__)
+
+INTENTS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            "data", "intents.json")
+
+# Responses that are generated in code rather than written in the data file
+RESPONSE_KEYS = {
+  "hooter_explanation": get_hooter_explanation,
+}
+
+_NON_WORD = re.compile(r"[^a-z0-9']+")
+
+
+def normalize(text: str) -> str:
+  """
+  Normalize text for matching: lowercase, single spaces, padded at both ends.
+
+  Padding with spaces lets phrases match only on whole-word boundaries.
+  """
+  words = _NON_WORD.sub(" ", text.lower()).split()
+  return f" {' '.join(words)} "
+
+
+class PhraseAutomaton:
+  """
+  An Aho-Corasick automaton over a fixed set of phrases.
+
+  Each phrase is associated with a value; search() reports the value of the
+  longest phrase found anywhere in the text.
+  """
+  def __init__(self, phrases: List[Tuple[str, str]]):
+    self._goto: List[Dict[str, int]] = [{}]
+    self._fail: List[int] = [0]
+    # Longest phrase ending at each state, as (length, value)
+    self._output: List[Optional[Tuple[int, str]]] = [None]
+
+    for phrase, value in phrases:
+      self._add(phrase, value)
+    self._build_failure_links()
+
+  def _add(self, phrase: str, value: str) -> None:
+    state = 0
+    for char in phrase:
+      next_state = self._goto[state].get(char)
+      if next_state is None:
+        next_state = len(self._goto)
+        self._goto.append({})
+        self._fail.append(0)
+        self._output.append(None)
+        self._goto[state][char] = next_state
+      state = next_state
+    current = self._output[state]
+    if current is None or current[0] < len(phrase):
+      self._output[state] = (len(phrase), value)
+
+  def _build_failure_links(self) -> None:
+    queue = deque(self._goto[0].values())
+    while queue:
+      state = queue.popleft()
+      for char, next_state in self._goto[state].items():
+        queue.append(next_state)
+        fallback = self._fail[state]
+        while fallback and char not in self._goto[fallback]:
+          fallback = self._fail[fallback]
+        link = self._goto[fallback].get(char, 0)
+        self._fail[next_state] = link if link != next_state else 0
+        inherited = self._output[self._fail[next_state]]
+        own = self._output[next_state]
+        if inherited and (own is None or inherited[0] > own[0]):
+          self._output[next_state] = inherited
+
+  def search(self, text: str) -> Optional[str]:
+    """
+    Return the value of the longest phrase contained in the text.
+
+    Args:
+      text (str): Normalized text to scan.
+
+    Returns:
+      str, optional: The matched value, or None if no phrase occurs.
+    """
+    state = 0
+    best = None
+    for char in text:
+      while state and char not in self._goto[state]:
+        state = self._fail[state]
+      state = self._goto[state].get(char, 0)
+      output = self._output[state]
+      if output and (best is None or output[0] > best[0]):
+        best = output
+    return best[1] if best else None
+
+
+class IntentMatcher:
+  """
+  Answers questions that match the intent table.
+
+  Attributes:
+    path (str): The intent data file.
+    reload_interval (float): Minimum seconds between checks for file changes.
+  """
+  def __init__(self, path: str = INTENTS_FILE, reload_interval: float = 5.0):
+    self.path = path
+    self.reload_interval = reload_interval
+    self._automaton = PhraseAutomaton([])
+    self._responses: Dict[str, Dict] = {}
+    self._mtime = None
+    self._checked_at = 0.0
+    self._lock = threading.Lock()
+    self.reload()
+
+  def reload(self) -> bool:
+    """
+    Rebuild the automaton from the data file.
+
+    A malformed file is logged and the previous table is kept.
+
+    Returns:
+      bool: True if the table was (re)loaded.
+    """
+    try:
+      mtime = os.path.getmtime(self.path)
+      with open(self.path, 'r') as file:
+        intents = json.load(file)["intents"]
+      phrases = [(normalize(phrase), intent["name"])
+                 for intent in intents for phrase in intent["phrases"]]
+      responses = {intent["name"]: intent for intent in intents}
+      automaton = PhraseAutomaton(phrases)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+      logger.error(f"Failed to load intents from {self.path}: {e}")
+      return False
+
+    with self._lock:
+      self._automaton = automaton
+      self._responses = responses
+      self._mtime = mtime
+    logger.info(f"Loaded {len(responses)} intents ({len(phrases)} phrases) from {self.path}")
+    return True
+
+  def _reload_if_changed(self) -> None:
+    now = time.monotonic()
+    if now - self._checked_at < self.reload_interval:
+      return
+    self._checked_at = now
+    try:
+      mtime = os.path.getmtime(self.path)
+    except OSError:
+      return
+    if mtime != self._mtime:
+      self.reload()
+
+  def match(self, user_message: str) -> Optional[str]:
+    """
+    Return the name of the intent a question matches.
+
+    Args:
+      user_message (str): The question being asked.
+
+    Returns:
+      str, optional: The intent name, or None.
+    """
+    self._reload_if_changed()
+    return self._automaton.search(normalize(user_message))
+
+  def respond(self, user_message: str) -> Optional[str]:
+    """
+    Return the canned answer for a question, if it matches an intent.
+
+    Args:
+      user_message (str): The question being asked.
+
+    Returns:
+      str, optional: The answer, or None if the LLM should answer.
+    """
+    self._reload_if_changed()
+    with self._lock:
+      automaton, responses = self._automaton, self._responses
+    name = automaton.search(normalize(user_message))
+    if name is None:
+      return None
+    intent = responses[name]
+    if "response_key" in intent:
+      return RESPONSE_KEYS[intent["response_key"]]()
+    return intent["response"]
@@ -0,0 +1,182 @@
+"""
+Persistent cache of LeetCode profiles for registered members.
+
+The public stats API runs on a free dyno that is often cold, so !leetcode
+answers from this cache and a background task keeps it fresh. Each profile
+has its own refresh interval: it halves when the solved count changed since
+the last fetch and doubles when it didn't, so active solvers are refreshed
+often and idle ones rarely.
+
+Each profile also keeps a short history of (time, easy, medium, hard)
+snapshots, appended only when the counts change, from which solves per
+local day are derived.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import time
+
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+LEETCODE_CACHE_FILE = "leetcode_cache.json"
+FORMAT_VERSION = 1
+
+MIN_INTERVAL = 15 * 60
+# Capped so a solve is seen on the day it happened, for streak credit
+MAX_INTERVAL = 6 * 60 * 60
+FAILURE_RETRY = 30 * 60
+HISTORY_LIMIT = 90
+
+
+def solved_count(data: Dict) -> int:
+  """Return the total number of problems solved in a profile."""
+  return data.get("totalSolved",
+                  data.get("easySolved", 0) + data.get("mediumSolved", 0) + data.get("hardSolved", 0))
+
+
+def daily_solves(history: List[List[int]], tz) -> Dict[date, int]:
+  """
+  Count new solves per local day from a profile's snapshot history.
+
+  Solves between two snapshots are counted on the day of the later one.
+
+  Args:
+    history (list): [timestamp, easy, medium, hard] snapshots, oldest first.
+    tz (tzinfo): The timezone days are counted in.
+
+  Returns:
+    dict: Local date -> problems solved that day.
+  """
+  solves: Dict[date, int] = defaultdict(int)
+  for previous, current in zip(history, history[1:]):
+    delta = sum(current[1:]) - sum(previous[1:])
+    if delta > 0:
+      solves[datetime.fromtimestamp(current[0], tz).date()] += delta
+  return dict(solves)
+
+
+class LeetCodeCache:
+  """
+  Registered LeetCode handles and their cached profiles.
+
+  Attributes:
+    path (str): The cache file.
+    handles (dict): Discord user ID -> LeetCode handle.
+    profiles (dict): Handle -> {"data", "fetched_at", "interval", "next_refresh", "history"}.
+    dirty (bool): Whether there are changes not yet saved.
+  """
+  def __init__(self, path: Optional[str] = None):
+    self.path = path or LEETCODE_CACHE_FILE
+    self.handles: Dict[str, str] = {}
+    self.profiles: Dict[str, Dict] = {}
+    self.dirty = False
+
+  def load(self) -> None:
+    """Read the cache file, starting empty if it is missing or unreadable."""
+    try:
+      with open(self.path, 'r') as file:
+        loaded = json.load(file)
+    except FileNotFoundError:
+      return
+    except (OSError, json.JSONDecodeError) as e:
+      logger.error(f"Ignoring unreadable LeetCode cache {self.path}: {e}")
+      return
+    if loaded.get("version") == FORMAT_VERSION:
+      self.handles = loaded["handles"]
+      self.profiles = loaded["profiles"]
+
+  def save(self) -> None:
+    """Write the cache atomically if it changed."""
+    if not self.dirty:
+      return
+    directory = os.path.dirname(os.path.abspath(self.path))
+    try:
+      with tempfile.NamedTemporaryFile(mode='w', dir=directory, delete=False) as temp_file:
+        json.dump({"version": FORMAT_VERSION, "handles": self.handles, "profiles": self.profiles},
+                  temp_file, separators=(",", ":"))
+      os.replace(temp_file.name, self.path)
+      self.dirty = False
+    except OSError as e:
+      logger.error(f"Failed to save LeetCode cache {self.path}: {e}")
+
+  def register(self, user_id: str, handle: str, now: Optional[float] = None) -> None:
+    """Link a member to a handle and queue it for an immediate refresh."""
+    self.handles[user_id] = handle
+    entry = self.profiles.setdefault(handle, {"data": None, "fetched_at": None,
+                                              "interval": MIN_INTERVAL, "next_refresh": 0})
+    if entry["data"] is None:
+      entry["next_refresh"] = now or time.time()
+    self.dirty = True
+
+  def unregister(self, user_id: str) -> Optional[str]:
+    """Unlink a member, dropping their profile if no one else uses it."""
+    handle = self.handles.pop(user_id, None)
+    if handle is not None:
+      if handle not in self.handles.values():
+        self.profiles.pop(handle, None)
+      self.dirty = True
+    return handle
+
+  def handle_for(self, user_id: str) -> Optional[str]:
+    return self.handles.get(user_id)
+
+  def users_for(self, handle: str) -> List[str]:
+    """Return the IDs of the members registered with a handle."""
+    return [user_id for user_id, registered in self.handles.items() if registered == handle]
+
+  def get(self, handle: str) -> Optional[Dict]:
+    """Return the cache entry for a handle if it has profile data."""
+    entry = self.profiles.get(handle)
+    return entry if entry and entry["data"] is not None else None
+
+  def store(self, handle: str, data: Optional[Dict], now: Optional[float] = None) -> int:
+    """
+    Record a fetch result and schedule the next refresh.
+
+    Args:
+      handle (str): The LeetCode handle.
+      data (dict, optional): The profile, or None if the fetch failed.
+      now (float, optional): The fetch time as POSIX seconds.
+
+    Returns:
+      int: Problems solved since the previous fetch (0 for the first one).
+    """
+    now = now or time.time()
+    entry = self.profiles.setdefault(handle, {"data": None, "fetched_at": None,
+                                              "interval": MIN_INTERVAL, "next_refresh": 0})
+    self.dirty = True
+    if data is None:
+      entry["next_refresh"] = now + min(FAILURE_RETRY, entry["interval"])
+      return 0
+
+    previous = entry["data"]
+    solved = solved_count(data) - solved_count(previous) if previous else 0
+    if previous is None or solved:
+      entry["interval"] = max(MIN_INTERVAL, entry["interval"] // 2)
+    else:
+      entry["interval"] = min(MAX_INTERVAL, entry["interval"] * 2)
+    entry["data"] = data
+    entry["fetched_at"] = now
+    entry["next_refresh"] = now + entry["interval"]
+
+    snapshot = [int(now), data.get("easySolved", 0), data.get("mediumSolved", 0), data.get("hardSolved", 0)]
+    history = entry.setdefault("history", [])
+    if not history or history[-1][1:] != snapshot[1:]:
+      history.append(snapshot)
+      del history[:-HISTORY_LIMIT]
+    return solved
+
+  def due(self, now: Optional[float] = None, limit: int = 5) -> List[str]:
+    """Return up to limit registered handles whose refresh is due, most overdue first."""
+    now = now or time.time()
+    registered = set(self.handles.values())
+    due = [(entry["next_refresh"], handle) for handle, entry in self.profiles.items()
+           if handle in registered and entry["next_refresh"] <= now]
+    return [handle for _, handle in sorted(due)[:limit]]
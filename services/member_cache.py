@@ -0,0 +1,169 @@
+"""
+A persistent snapshot of the guild members the bot has seen.
+
+initialize_streaks used to page through every guild member over REST on
+each start. The snapshot stores each guild's human member IDs and names with
+the guild's member count as a version marker, so a restart can tell whether
+its view is still current and fetch only what changed:
+
+  - if the gateway member cache is complete, it is used with no REST calls;
+  - if the member count still matches a snapshot younger than
+    MAX_SNAPSHOT_AGE, the snapshot is used;
+  - otherwise only members with IDs above the newest cached one are fetched,
+    falling back to a full fetch unless they account exactly for the change
+    in the count.
+
+The bot doesn't chunk guilds at startup (see bot.core), so the gateway cache
+is normally incomplete when this runs. A count is blind to a leave and a
+join that cancel out while the bot is down, and the delta fetch can't see
+who left, so the age limit bounds how long such a roster can stay stale.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import time
+
+from typing import Dict, Optional
+
+from discord import Object
+
+
+logger = logging.getLogger(__name__)
+
+MEMBER_CACHE_FILE = "member_cache.json"
+FORMAT_VERSION = 1
+MAX_SNAPSHOT_AGE = 24 * 3600
+
+
+class MemberCache:
+  """
+  Known human members per guild.
+
+  Attributes:
+    path (str): The snapshot file.
+    guilds (dict): Guild ID -> {"member_count": int, "members": {user ID: name},
+      "refreshed_at": POSIX seconds of the last fetch}.
+    rest_fetches (int): REST member listings started since loading.
+    dirty (bool): Whether there are changes not yet saved.
+  """
+  def __init__(self, path: Optional[str] = None):
+    self.path = path or MEMBER_CACHE_FILE
+    self.guilds: Dict[str, Dict] = {}
+    self.rest_fetches = 0
+    self.dirty = False
+
+  def load(self) -> None:
+    """Read the snapshot, starting empty if it is missing or unreadable."""
+    try:
+      with open(self.path, 'r') as file:
+        loaded = json.load(file)
+    except FileNotFoundError:
+      return
+    except (OSError, json.JSONDecodeError) as e:
+      logger.error(f"Ignoring unreadable member cache {self.path}: {e}")
+      return
+    if loaded.get("version") == FORMAT_VERSION:
+      self.guilds = loaded["guilds"]
+
+  def save(self) -> None:
+    """Write the snapshot atomically if it changed."""
+    if not self.dirty:
+      return
+    directory = os.path.dirname(os.path.abspath(self.path))
+    try:
+      with tempfile.NamedTemporaryFile(mode='w', dir=directory, delete=False) as temp_file:
+        json.dump({"version": FORMAT_VERSION, "guilds": self.guilds}, temp_file,
+                  separators=(",", ":"))
+      os.replace(temp_file.name, self.path)
+      self.dirty = False
+    except OSError as e:
+      logger.error(f"Failed to save member cache {self.path}: {e}")
+
+  def members(self, guild_id) -> Dict[str, str]:
+    """Return the cached user ID -> name map for a guild."""
+    return self.guilds.get(str(guild_id), {}).get("members", {})
+
+  def add(self, guild, member) -> None:
+    """
+    Record a member who joined a guild that has already been refreshed.
+
+    The member count is bumped rather than copied from the guild, so a
+    snapshot that was behind stays behind and is fetched on the next start.
+    """
+    entry = self.guilds.get(str(guild.id))
+    if entry is None or member.bot:
+      return
+    if str(member.id) not in entry["members"]:
+      entry["member_count"] += 1
+    entry["members"][str(member.id)] = member.name
+    self.dirty = True
+
+  def remove(self, guild, member) -> None:
+    """Forget a member who left a guild."""
+    entry = self.guilds.get(str(guild.id))
+    if entry is not None and entry["members"].pop(str(member.id), None) is not None:
+      entry["member_count"] -= 1
+      self.dirty = True
+
+  def _store(self, guild, members: Dict[str, str], refreshed_at: float) -> None:
+    entry = {"member_count": guild.member_count or 0, "members": members, "refreshed_at": refreshed_at}
+    if self.guilds.get(str(guild.id)) != entry:
+      self.guilds[str(guild.id)] = entry
+      self.dirty = True
+
+  async def refresh(self, guild, now: Optional[float] = None) -> Dict[str, str]:
+    """
+    Bring a guild's members up to date with as few REST calls as possible.
+
+    Args:
+      guild (discord.Guild): The guild to refresh.
+      now (float, optional): The current time as POSIX seconds.
+
+    Returns:
+      dict: User ID -> name for the guild's human members.
+    """
+    now = now or time.time()
+    cached = dict(self.members(guild.id))
+    entry = self.guilds.get(str(guild.id))
+    refreshed_at = now
+    fresh = entry is not None and now - entry.get("refreshed_at", 0) < MAX_SNAPSHOT_AGE
+
+    if guild.chunked:
+      members = {str(m.id): m.name for m in guild.members if not m.bot}
+      logger.info(f"{guild.name}: using {len(members)} members from the gateway cache.")
+    elif fresh and entry["member_count"] == guild.member_count:
+      members = cached
+      refreshed_at = entry["refreshed_at"]
+      logger.info(f"{guild.name}: member count unchanged, using {len(members)} cached members.")
+    else:
+      # An old snapshot may hide churn a delta can't see, so it is fetched in full
+      members = await self._fetch_delta(guild, cached if fresh else {})
+    self._store(guild, members, refreshed_at)
+    return dict(members)
+
+  async def _fetch_delta(self, guild, cached: Dict[str, str]) -> Dict[str, str]:
+    """Fetch members newer than the cache, or everyone if that isn't enough."""
+    entry = self.guilds.get(str(guild.id))
+    if cached and entry:
+      members = dict(cached)
+      fetched = 0
+      self.rest_fetches += 1
+      async for member in guild.fetch_members(limit=None, after=Object(id=max(map(int, cached)))):
+        fetched += 1
+        if not member.bot:
+          members[str(member.id)] = member.name
+      # Older accounts joining, or anyone leaving, since the snapshot would leave
+      # the new members short of or over the change in the count
+      if guild.member_count is not None and fetched == guild.member_count - entry["member_count"]:
+        logger.info(f"{guild.name}: fetched {fetched} new members on top of {len(cached)} cached.")
+        return members
+
+    self.rest_fetches += 1
+    members = {}
+    async for member in guild.fetch_members(limit=None):
+      if not member.bot:
+        members[str(member.id)] = member.name
+    logger.info(f"{guild.name}: fetched all {len(members)} members.")
+    return members
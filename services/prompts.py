@@ -0,0 +1,58 @@
+"""
+Reply preparation that can run in the main process or in a worker.
+
+Canned intent matching and FAQ retrieval are the CPU-bound part of answering
+a mention. They live here as plain module-level functions over per-process
+singletons so bot/events.py can run them through services.workers: each
+worker builds its matcher and memory-maps the cached FAQ index once, and
+only the question and the small result cross the process boundary.
+"""
+
+from typing import Dict, Optional, Tuple
+
+from services.faq_index import FaqIndex, load_corpus
+from services.intents import IntentMatcher
+
+
+_intents: Optional[IntentMatcher] = None
+_faq: Optional[FaqIndex] = None
+
+
+def get_intents() -> IntentMatcher:
+  """Return this process's intent matcher, creating it on first use."""
+  global _intents
+  if _intents is None:
+    _intents = IntentMatcher()
+  return _intents
+
+
+def get_faq() -> FaqIndex:
+  """Return this process's FAQ index, building or mapping it on first use."""
+  global _faq
+  if _faq is None:
+    _faq = FaqIndex.build(load_corpus())
+  return _faq
+
+
+def warm_up() -> None:
+  """Load the matcher and index ahead of the first question."""
+  get_intents()
+  get_faq()
+
+
+def prepare_reply(user_message: str) -> Tuple[Optional[str], Optional[Dict]]:
+  """
+  Answer a question locally if possible, otherwise find context for the LLM.
+
+  Args:
+    user_message (str): The user's question.
+
+  Returns:
+    tuple: (answer, context). answer is a canned or FAQ response, or None if
+      the LLM should answer; context is an optional system message of
+      relevant FAQ passages for it.
+  """
+  answer = get_intents().respond(user_message) or get_faq().answer(user_message)
+  if answer is not None:
+    return answer, None
+  return None, get_faq().context(user_message)
@@ -0,0 +1,182 @@
+"""
+Token-bucket quotas for tutor LLM usage.
+
+Each user, each channel and the bot as a whole get two buckets: one
+counting requests and one counting estimated tokens. A question is only
+sent to a provider if every bucket it draws from has room, and nothing is
+taken from any bucket unless all of them do, so a limited request never
+burns another scope's quota. Buckets refill continuously, which allows
+short bursts while holding the long-run rate.
+"""
+
+import math
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class TokenBucket:
+  """
+  A bucket that refills at a constant rate up to its capacity.
+
+  Attributes:
+    capacity (float): The most the bucket can hold (the allowed burst).
+    rate (float): Units added per second.
+  """
+  __slots__ = ("capacity", "rate", "_level", "_updated", "_clock")
+
+  def __init__(self, capacity: float, rate: float, clock: Callable[[], float] = time.monotonic):
+    self.capacity = capacity
+    self.rate = rate
+    self._clock = clock
+    self._level = capacity
+    self._updated = clock()
+
+  def _refill(self) -> None:
+    now = self._clock()
+    self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+    self._updated = now
+
+  @property
+  def level(self) -> float:
+    self._refill()
+    return self._level
+
+  @property
+  def full(self) -> bool:
+    return self.level >= self.capacity
+
+  def retry_after(self, amount: float) -> float:
+    """Return the seconds until amount can be taken (0 if it can now)."""
+    missing = min(amount, self.capacity) - self.level
+    if missing <= 0:
+      return 0.0
+    return missing / self.rate if self.rate > 0 else math.inf
+
+  def take(self, amount: float) -> None:
+    """Remove amount from the bucket; callers check retry_after first."""
+    self._refill()
+    self._level -= min(amount, self.capacity)
+
+
+class Quota:
+  """
+  The request and token allowances for one kind of scope.
+
+  Attributes:
+    requests_per_minute (float): Sustained request rate.
+    tokens_per_minute (float): Sustained estimated-token rate.
+    burst (float): Multiplier on the per-minute rates giving bucket capacity.
+  """
+  def __init__(self, requests_per_minute: float, tokens_per_minute: float, burst: float = 1.0):
+    self.requests_per_minute = requests_per_minute
+    self.tokens_per_minute = tokens_per_minute
+    self.burst = burst
+
+  def buckets(self, clock) -> Tuple[TokenBucket, TokenBucket]:
+    return (TokenBucket(self.requests_per_minute * self.burst, self.requests_per_minute / 60, clock),
+            TokenBucket(self.tokens_per_minute * self.burst, self.tokens_per_minute / 60, clock))
+
+
+class QuotaLimiter:
+  """
+  Per-user, per-channel and global quotas.
+
+  Attributes:
+    quotas (dict): Scope ("user", "channel", "global") -> Quota.
+    max_keys (int): The most users or channels tracked; the least recently
+      seen are dropped first, which only ever forgives their usage.
+  """
+  SCOPES = ("user", "channel", "global")
+
+  def __init__(self, user: Quota, channel: Quota, global_: Quota, max_keys: int = 10000,
+               clock: Callable[[], float] = time.monotonic):
+    self.quotas = {"user": user, "channel": channel, "global": global_}
+    self.max_keys = max_keys
+    self._clock = clock
+    self._buckets: Dict[str, "OrderedDict[str, Tuple[TokenBucket, TokenBucket]]"] = {
+      scope: OrderedDict() for scope in self.SCOPES}
+    self._limited: Dict[str, int] = {scope: 0 for scope in self.SCOPES}
+    self._lock = threading.Lock()
+
+  def _get(self, scope: str, key: str) -> Tuple[TokenBucket, TokenBucket]:
+    table = self._buckets[scope]
+    buckets = table.get(key)
+    if buckets is None:
+      buckets = table[key] = self.quotas[scope].buckets(self._clock)
+      if len(table) > self.max_keys:
+        table.popitem(last=False)
+    else:
+      table.move_to_end(key)
+    return buckets
+
+  def acquire(self, user_id, channel_id, tokens: int) -> Optional[Tuple[str, float]]:
+    """
+    Take one request and an estimated number of tokens from every scope.
+
+    Args:
+      user_id: The asking user's ID.
+      channel_id: The channel (or DM) the question came from.
+      tokens (int): The estimated tokens the request will use.
+
+    Returns:
+      tuple: (scope, seconds to wait) for the most constrained scope if the
+        request is limited, or None if it was admitted.
+    """
+    with self._lock:
+      scoped = [("user", self._get("user", str(user_id))),
+                ("channel", self._get("channel", str(channel_id))),
+                ("global", self._get("global", "*"))]
+      worst = None
+      for scope, (requests, budget) in scoped:
+        wait = max(requests.retry_after(1), budget.retry_after(tokens))
+        if wait > 0 and (worst is None or wait > worst[1]):
+          worst = (scope, wait)
+      if worst is not None:
+        self._limited[worst[0]] += 1
+        return worst
+      for _, (requests, budget) in scoped:
+        requests.take(1)
+        budget.take(tokens)
+      return None
+
+  def snapshot(self, top: int = 5) -> Dict:
+    """
+    Return bucket levels for monitoring.
+
+    Args:
+      top (int): How many of the most depleted users and channels to list.
+
+    Returns:
+      dict: Global levels, limit counts and the lowest user/channel buckets.
+    """
+    with self._lock:
+      def levels(buckets):
+        requests, budget = buckets
+        return {"requests": round(requests.level, 2), "tokens": round(budget.level)}
+
+      def lowest(scope) -> List[Dict]:
+        entries = [(key, levels(buckets)) for key, buckets in self._buckets[scope].items()]
+        entries.sort(key=lambda entry: (entry[1]["requests"] / max(1, self.quotas[scope].requests_per_minute),
+                                        entry[1]["tokens"]))
+        return [{"id": key, **level} for key, level in entries[:top]]
+
+      return {
+        "global": levels(self._get("global", "*")),
+        "limited": dict(self._limited),
+        "tracked": {"users": len(self._buckets["user"]), "channels": len(self._buckets["channel"])},
+        "users": lowest("user"),
+        "channels": lowest("channel"),
+      }
+
+
+def slow_down_message(scope: str, wait: float) -> str:
+  """Return a friendly reply for a limited request."""
+  seconds = max(1, math.ceil(wait))
+  if scope == "user":
+    return f"Hoo, slow down! You've asked me a lot in a short time. Try again in about {seconds} seconds."
+  if scope == "channel":
+    return f"Hoo, this channel is keeping me very busy! Give me about {seconds} seconds to catch up."
+  return f"Hoo, I'm answering a lot of questions right now. Please try again in about {seconds} seconds."
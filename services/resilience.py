@@ -0,0 +1,224 @@
+"""
+Resilience helpers for calls to LLM providers.
+
+ResilientModel wraps a model with a per-call deadline, a bounded number of
+retries with full-jitter exponential backoff, and a CircuitBreaker. The
+breaker counts logical calls, not attempts: a call that fails after all its
+retries is one failure. Once a provider keeps failing the breaker opens and calls fail fast instead of
+piling retries onto a degraded provider; after a cool-down a single trial
+call is let through to probe whether it has recovered. ResponseCache keeps
+recent good answers so the router can serve them while breakers are open.
+"""
+
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+  """Raised when a call is rejected because the circuit breaker is open."""
+
+
+class CircuitBreaker:
+  """
+  A thread-safe circuit breaker.
+
+  Attributes:
+    name (str): The name used in logs and monitoring.
+    failure_threshold (int): Consecutive failures that open the breaker.
+    reset_timeout (float): Seconds to stay open before allowing a trial call.
+  """
+  def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+    self.name = name
+    self.failure_threshold = failure_threshold
+    self.reset_timeout = reset_timeout
+    self._state = CLOSED
+    self._failures = 0
+    self._opened_at = 0.0
+    self._trial_in_flight = False
+    self._lock = threading.Lock()
+
+  @property
+  def state(self) -> str:
+    with self._lock:
+      if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+        return HALF_OPEN
+      return self._state
+
+  @property
+  def is_open(self) -> bool:
+    """True while calls would be rejected without reaching the provider."""
+    return self.state == OPEN
+
+  def allow(self) -> bool:
+    """
+    Check whether a call may proceed, claiming the trial slot when half open.
+
+    Returns:
+      bool: True if the call may be made.
+    """
+    with self._lock:
+      if self._state == CLOSED:
+        return True
+      if time.monotonic() - self._opened_at < self.reset_timeout:
+        return False
+      if self._trial_in_flight:
+        return False
+      self._state = HALF_OPEN
+      self._trial_in_flight = True
+      return True
+
+  def record_success(self) -> None:
+    with self._lock:
+      if self._state != CLOSED:
+        logger.info(f"Circuit breaker '{self.name}' closed.")
+      self._state = CLOSED
+      self._failures = 0
+      self._trial_in_flight = False
+
+  def record_failure(self) -> None:
+    with self._lock:
+      self._failures += 1
+      self._trial_in_flight = False
+      if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+        if self._state != OPEN:
+          logger.warning(f"Circuit breaker '{self.name}' opened after {self._failures} failures.")
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+
+  def snapshot(self) -> Dict:
+    """Return the breaker state as a plain dict for monitoring."""
+    state = self.state
+    with self._lock:
+      return {
+        "state": state,
+        "consecutive_failures": self._failures,
+        "seconds_open": round(time.monotonic() - self._opened_at, 1) if state != CLOSED else 0.0,
+      }
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+  """
+  Return a full-jitter exponential backoff delay.
+
+  Args:
+    attempt (int): The zero-based retry attempt.
+    base (float): The base delay in seconds.
+    cap (float): The maximum delay in seconds.
+
+  Returns:
+    float: A random delay between 0 and min(cap, base * 2 ** attempt).
+  """
+  return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class ResilientModel:
+  """
+  Wraps a model's complete() with deadlines, retries and a circuit breaker.
+
+  Attributes:
+    model: The wrapped model exposing complete(user_message, history, timeout).
+    breaker (CircuitBreaker): The breaker guarding the model.
+    deadline (float): The total seconds a call may take across retries.
+    max_retries (int): Retries after the first attempt.
+    backoff_base (float): The base backoff delay in seconds.
+    backoff_cap (float): The maximum backoff delay in seconds.
+  """
+  def __init__(self, model, name: str, deadline: float = 20.0, max_retries: int = 2,
+               backoff_base: float = 0.5, backoff_cap: float = 4.0,
+               breaker: Optional[CircuitBreaker] = None):
+    self.model = model
+    self.breaker = breaker or CircuitBreaker(name)
+    self.deadline = deadline
+    self.max_retries = max_retries
+    self.backoff_base = backoff_base
+    self.backoff_cap = backoff_cap
+    if hasattr(model, "max_retries"):
+      # Retries are made here; client-side retries would multiply the upstream requests per call
+      model.max_retries = 0
+
+  @property
+  def relative_cost(self) -> float:
+    return getattr(self.model, "relative_cost", 1.0)
+
+  def complete(self, user_message: str, history: Optional[List[Dict]] = None) -> str:
+    """
+    Ask the wrapped model, retrying transient failures within the deadline.
+
+    The breaker is checked once per call and records a single success or
+    failure for it, however many attempts were made.
+
+    Raises:
+      CircuitOpenError: If the breaker is open.
+      Exception: The last error once retries or the deadline are exhausted.
+    """
+    if not self.breaker.allow():
+      raise CircuitOpenError(f"Circuit breaker '{self.breaker.name}' is open.")
+    started = time.monotonic()
+    attempt = 0
+    while True:
+      remaining = self.deadline - (time.monotonic() - started)
+      try:
+        response = self.model.complete(user_message, history, timeout=remaining)
+      except Exception as e:
+        delay = backoff_delay(attempt, self.backoff_base, self.backoff_cap)
+        out_of_time = time.monotonic() - started + delay >= self.deadline
+        if attempt >= self.max_retries or out_of_time or self.breaker.is_open:
+          self.breaker.record_failure()
+          raise
+        logger.info(f"Retrying {self.breaker.name} in {delay:.2f}s after error: {e}")
+        time.sleep(delay)
+        attempt += 1
+        continue
+      self.breaker.record_success()
+      return response
+
+
+class ResponseCache:
+  """
+  A small thread-safe LRU of recent good answers.
+
+  Answers are keyed by the question and a hash of the conversation history
+  it was asked in, so a follow-up question is never answered out of context.
+  """
+  def __init__(self, max_entries: int = 256):
+    self.max_entries = max_entries
+    self._entries: "OrderedDict[str, str]" = OrderedDict()
+    self._lock = threading.Lock()
+
+  @staticmethod
+  def _key(user_message: str, history: Optional[List[Dict]] = None) -> str:
+    question = " ".join(user_message.lower().split())
+    if not history:
+      return question
+    digest = hashlib.sha1(json.dumps(history, sort_keys=True, default=str).encode()).hexdigest()
+    return f"{question}\0{digest}"
+
+  def get(self, user_message: str, history: Optional[List[Dict]] = None) -> Optional[str]:
+    key = self._key(user_message, history)
+    with self._lock:
+      response = self._entries.get(key)
+      if response is not None:
+        self._entries.move_to_end(key)
+      return response
+
+  def put(self, user_message: str, response: str, history: Optional[List[Dict]] = None) -> None:
+    key = self._key(user_message, history)
+    with self._lock:
+      self._entries[key] = response
+      self._entries.move_to_end(key)
+      if len(self._entries) > self.max_entries:
+        self._entries.popitem(last=False)
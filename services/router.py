@@ -0,0 +1,257 @@
+"""
+Latency-aware routing across LLM providers.
+
+The ProviderRouter keeps rolling latency and error statistics for each
+provider. Short questions go to the cheapest healthy provider and longer
+ones to the fastest. When the chosen provider has not answered by its p95
+deadline, a hedged request is sent to the next provider and whichever
+answers first wins. Cancelling the loser cannot stop its worker thread, so
+hedges are capped by a semaphore released only when the thread finishes;
+past the cap the router keeps waiting on the primary. Failed requests fall through to the remaining
+providers. Providers whose circuit breaker is open are skipped, and when
+none can answer a recently cached answer (or the generic apology) is served.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+
+from collections import deque
+from typing import Dict, List, Optional
+
+from services.resilience import ResponseCache
+
+
+logger = logging.getLogger(__name__)
+
+FALLBACK_RESPONSE = "Sorry, I couldn't generate a response."
+
+
+class ProviderStats:
+  """
+  Rolling latency and error statistics for one provider.
+
+  Attributes:
+    window (int): The number of recent calls kept.
+    min_samples (int): Calls required before the statistics are trusted.
+  """
+  def __init__(self, window: int = 50, min_samples: int = 5):
+    self.window = window
+    self.min_samples = min_samples
+    self._samples = deque(maxlen=window)
+
+  def record(self, latency: float, ok: bool) -> None:
+    """Record the latency in seconds and outcome of a call."""
+    self._samples.append((latency, ok))
+
+  @property
+  def count(self) -> int:
+    return len(self._samples)
+
+  @property
+  def error_rate(self) -> float:
+    if not self._samples:
+      return 0.0
+    return sum(1 for _, ok in self._samples if not ok) / len(self._samples)
+
+  def percentile(self, fraction: float) -> Optional[float]:
+    """
+    Return a latency percentile of the successful calls.
+
+    Args:
+      fraction (float): The percentile as a fraction, e.g. 0.95.
+
+    Returns:
+      float, optional: The latency in seconds, or None without enough samples.
+    """
+    latencies = sorted(latency for latency, ok in self._samples if ok)
+    if len(latencies) < self.min_samples:
+      return None
+    index = min(len(latencies) - 1, int(fraction * len(latencies)))
+    return latencies[index]
+
+  def snapshot(self) -> Dict:
+    """Return the statistics as a plain dict for monitoring."""
+    return {
+      "calls": self.count,
+      "error_rate": round(self.error_rate, 3),
+      "p50": self.percentile(0.5),
+      "p95": self.percentile(0.95),
+    }
+
+
+class Provider:
+  """
+  An LLM provider the router can send questions to.
+
+  Attributes:
+    name (str): The provider name, e.g. "openAI".
+    model: A model exposing complete(user_message, history).
+    cost (float): The relative cost of a call.
+    stats (ProviderStats): Rolling statistics for the provider.
+  """
+  def __init__(self, name: str, model, cost: float = None):
+    self.name = name
+    self.model = model
+    self.cost = cost if cost is not None else getattr(model, "relative_cost", 1.0)
+    self.stats = ProviderStats()
+
+  @property
+  def breaker(self):
+    return getattr(self.model, "breaker", None)
+
+  @property
+  def available(self) -> bool:
+    """False while the provider's circuit breaker is rejecting calls."""
+    return self.breaker is None or not self.breaker.is_open
+
+  def invoke(self, user_message: str, history: Optional[List[Dict]]) -> str:
+    """Call the model synchronously, recording latency and outcome."""
+    started = time.monotonic()
+    try:
+      response = self.model.complete(user_message, history)
+    except Exception:
+      self.stats.record(time.monotonic() - started, False)
+      raise
+    self.stats.record(time.monotonic() - started, True)
+    return response
+
+
+class ProviderRouter:
+  """
+  Routes each question to a provider, hedging slow calls.
+
+  Attributes:
+    providers (list): The providers in order of preference.
+    short_question_chars (int): Questions up to this length are routed by cost.
+    default_deadline (float): The hedge deadline in seconds before a provider
+      has enough samples for a p95.
+    min_deadline (float): The smallest hedge deadline in seconds.
+    max_error_rate (float): Providers above this error rate are tried last.
+    cache (ResponseCache): Recent good answers served when no provider can answer.
+    max_hedges (int): Hedged upstream calls that may be running at once,
+      including ones that already lost the race.
+  """
+  def __init__(self, providers: List[Provider], short_question_chars: int = 120,
+               default_deadline: float = 4.0, min_deadline: float = 0.5,
+               max_error_rate: float = 0.5, cache: Optional[ResponseCache] = None,
+               max_hedges: int = 2):
+    if not providers:
+      raise ValueError("ProviderRouter needs at least one provider.")
+    self.providers = providers
+    self.short_question_chars = short_question_chars
+    self.default_deadline = default_deadline
+    self.min_deadline = min_deadline
+    self.max_error_rate = max_error_rate
+    self.cache = cache or ResponseCache()
+    self.max_hedges = max_hedges
+    self._hedge_slots = threading.BoundedSemaphore(max_hedges)
+
+  def rank(self, user_message: str) -> List[Provider]:
+    """
+    Order the providers for a question.
+
+    Healthy providers come first: by cost for short questions, otherwise by
+    p95 latency. Providers with a high error rate are kept as a last resort,
+    and providers with an open circuit breaker are left out.
+
+    Args:
+      user_message (str): The question being asked.
+
+    Returns:
+      list: The providers in the order they should be tried.
+    """
+    def latency(provider):
+      p95 = provider.stats.percentile(0.95)
+      return p95 if p95 is not None else self.default_deadline
+
+    available = [p for p in self.providers if p.available]
+    healthy = [p for p in available if p.stats.error_rate <= self.max_error_rate]
+    unhealthy = [p for p in available if p.stats.error_rate > self.max_error_rate]
+
+    if len(user_message) <= self.short_question_chars:
+      healthy.sort(key=lambda p: (p.cost, latency(p)))
+    else:
+      healthy.sort(key=latency)
+    unhealthy.sort(key=lambda p: p.stats.error_rate)
+    return healthy + unhealthy
+
+  def hedge_deadline(self, provider: Provider) -> float:
+    """Return how long to wait on a provider before sending a hedged request."""
+    p95 = provider.stats.percentile(0.95)
+    if p95 is None:
+      return self.default_deadline
+    return max(self.min_deadline, p95)
+
+  async def generate_response(self, user_message: str, history: Optional[List[Dict]] = None) -> str:
+    """
+    Answer a question with the first provider to respond successfully.
+
+    Args:
+      user_message (str): The question being asked.
+      history (list, optional): Earlier conversation turns as chat messages.
+
+    Returns:
+      str: The answer, or a cached answer or generic apology if every
+        provider failed.
+    """
+    remaining = self.rank(user_message)
+    if not remaining:
+      logger.warning("No provider available; serving fallback response.")
+      return self.fallback(user_message, history)
+    pending = {}
+
+    def launch(call=Provider.invoke):
+      provider = remaining.pop(0)
+      task = asyncio.create_task(asyncio.to_thread(call, provider, user_message, history))
+      pending[task] = provider
+      return provider
+
+    primary = launch()
+    deadline = self.hedge_deadline(primary)
+    try:
+      while pending:
+        done, _ = await asyncio.wait(pending, timeout=deadline,
+                                     return_when=asyncio.FIRST_COMPLETED)
+        if not done:
+          # Primary is slower than its p95: hedge with the next provider if a slot is free
+          if remaining and self._hedge_slots.acquire(blocking=False):
+            hedge = launch(self._invoke_hedge)
+            logger.info(f"Hedging request to {hedge.name} after {deadline:.2f}s")
+          deadline = None
+          continue
+
+        for task in done:
+          provider = pending.pop(task)
+          if task.exception() is None:
+            self.cache.put(user_message, task.result(), history)
+            return task.result()
+          logger.warning(f"Provider {provider.name} failed: {task.exception()}")
+
+        if not pending and remaining:
+          launch()
+      return self.fallback(user_message, history)
+    finally:
+      for task in pending:
+        task.cancel()
+
+  def _invoke_hedge(self, provider: Provider, user_message: str, history: Optional[List[Dict]]) -> str:
+    """Run a hedged call, holding its hedge slot until the thread finishes."""
+    try:
+      return provider.invoke(user_message, history)
+    finally:
+      self._hedge_slots.release()
+
+  def fallback(self, user_message: str, history: Optional[List[Dict]] = None) -> str:
+    """Return a cached answer to the same question in the same conversation, or the generic apology."""
+    return self.cache.get(user_message, history) or FALLBACK_RESPONSE
+
+  def snapshot(self) -> Dict:
+    """Return per-provider statistics and breaker states for monitoring."""
+    snapshot = {}
+    for provider in self.providers:
+      snapshot[provider.name] = provider.stats.snapshot()
+      if provider.breaker is not None:
+        snapshot[provider.name]["breaker"] = provider.breaker.snapshot()
+    return snapshot
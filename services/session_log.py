@@ -0,0 +1,76 @@
+"""
+Append-only history of study sessions.
+
+Every completed study-channel session is appended to a CSV file as
+"user_id,start,end" with integer POSIX timestamps. The history lets streaks
+be recomputed in bulk when the rules change, and can be loaded straight
+into NumPy arrays without per-line Python parsing.
+"""
+
+import logging
+import os
+
+from datetime import datetime
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+SESSIONS_FILE = "sessions.csv"
+
+
+def append_session(user_id: str, start: datetime, end: datetime, path: Optional[str] = None) -> None:
+  """
+  Record one study session.
+
+  Args:
+    user_id (str): The user's ID.
+    start (datetime): When the user joined the study channel.
+    end (datetime): When the user left the study channel.
+    path (str, optional): The history file; defaults to SESSIONS_FILE.
+  """
+  path = path or SESSIONS_FILE
+  try:
+    with open(path, 'a') as file:
+      file.write(f"{user_id},{int(start.timestamp())},{int(end.timestamp())}\n")
+  except OSError as e:
+    logger.error(f"Failed to record session for {user_id} in {path}: {e}")
+
+
+def iter_sessions(path: Optional[str] = None) -> Iterator[Tuple[str, int, int]]:
+  """
+  Stream the recorded sessions one at a time.
+
+  Args:
+    path (str, optional): The history file; defaults to SESSIONS_FILE.
+
+  Yields:
+    tuple: (user_id, start, end) with POSIX timestamps.
+  """
+  path = path or SESSIONS_FILE
+  if not os.path.exists(path):
+    return
+  with open(path, 'r') as file:
+    for line in file:
+      user_id, start, end = line.rstrip("\n").split(",")
+      yield user_id, int(start), int(end)
+
+
+def load_sessions(path: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+  """
+  Load the whole session history into arrays.
+
+  Args:
+    path (str, optional): The history file; defaults to SESSIONS_FILE.
+
+  Returns:
+    tuple: (user_ids, starts, ends) as int64 arrays.
+  """
+  path = path or SESSIONS_FILE
+  if not os.path.exists(path) or os.path.getsize(path) == 0:
+    empty = np.empty(0, dtype=np.int64)
+    return empty, empty.copy(), empty.copy()
+  data = np.loadtxt(path, delimiter=",", dtype=np.int64, ndmin=2)
+  return data[:, 0], data[:, 1], data[:, 2]
@@ -0,0 +1,324 @@
+"""
+Bulk recomputation of study streaks from the recorded session history.
+
+The live rules in StreaksCog (update_streak, increment_streak, reset_streak,
+start_new_streak and the rollover expiry) apply one event at a time, so a
+rule change can never be applied to existing streaks. This module replays
+the whole history at once with NumPy: sessions are split at local midnight
+per timezone, each (user, day)'s distinct study time is summed with a
+grouped running maximum, and runs of consecutive qualifying days are found
+with a vectorized diff / cumsum / bincount.
+
+The running bot keeps the streak records in memory and writes them back on
+its next save, so changes written to streaks.json while it runs are lost.
+--apply therefore also needs --bot-stopped: stop the bot, apply, then start
+it again.
+
+Days credited for LeetCode solves (LEETCODE_STREAKS) aren't in the session
+history, so a backfill would drop them. With LEETCODE_STREAKS on, --apply
+is refused unless --drop-leetcode-days accepts that.
+
+Usage:
+  python -m services.streak_backfill --minimum-minutes 25 --grace-days 0          # dry run
+  python -m services.streak_backfill --minimum-minutes 20 --apply --bot-stopped
+"""
+
+import argparse
+import logging
+
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pytz
+
+from bot import core
+from domain.streak_data import from_epoch_day
+from services import session_log
+from utils.rollover import DEFAULT_TIMEZONE, get_timezone
+
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 86400
+
+
+class StreakRules:
+  """
+  The rules a streak is computed under.
+
+  Attributes:
+    minimum_minutes (int): The study time a day needs to count.
+    grace_days (int): Missed days allowed between study days before a
+      streak breaks.
+  """
+  def __init__(self, minimum_minutes: int = core.MINIMUM_MINUTES, grace_days: int = 0):
+    self.minimum_minutes = minimum_minutes
+    self.grace_days = grace_days
+
+
+def local_seconds(timestamps: np.ndarray, tz) -> np.ndarray:
+  """
+  Shift POSIX timestamps to local wall-clock seconds since 1970-01-01.
+
+  UTC offsets are looked up once per distinct hour rather than per
+  timestamp, which keeps DST handling exact at hour granularity.
+
+  Args:
+    timestamps (np.ndarray): POSIX timestamps in seconds.
+    tz (tzinfo): The timezone to shift into.
+
+  Returns:
+    np.ndarray: int64 local seconds.
+  """
+  if timestamps.size == 0:
+    return np.empty(0, dtype=np.int64)
+  hours, inverse = np.unique(timestamps // 3600, return_inverse=True)
+  offsets = np.fromiter(
+    (datetime.fromtimestamp(int(hour) * 3600, tz).utcoffset().total_seconds() for hour in hours),
+    dtype=np.int64, count=hours.size)
+  return timestamps + offsets[inverse.reshape(-1)]
+
+
+def local_epoch_days(timestamps: np.ndarray, tz) -> np.ndarray:
+  """
+  Map POSIX timestamps to local day numbers (days since 1970-01-01 local).
+
+  Args:
+    timestamps (np.ndarray): POSIX timestamps in seconds.
+    tz (tzinfo): The timezone the days are counted in.
+
+  Returns:
+    np.ndarray: int64 local day numbers.
+  """
+  return local_seconds(timestamps, tz) // SECONDS_PER_DAY
+
+
+def daily_study_seconds(groups: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+  """
+  Sum each group's distinct time, counting overlapping intervals once.
+
+  Intervals must be sorted by group and then start. Each interval only adds
+  the part past the furthest end seen so far in its group; the running
+  maximum is taken over group * span + end, so it never carries from one
+  group into the next.
+
+  Args:
+    groups (np.ndarray): Non-decreasing group numbers from 0.
+    starts (np.ndarray): Interval starts.
+    ends (np.ndarray): Interval ends.
+
+  Returns:
+    np.ndarray: The distinct seconds per group.
+  """
+  base = starts.min()
+  span = ends.max() - base + 1
+  keyed_ends = groups * span + (ends - base)
+  reached = np.maximum.accumulate(keyed_ends)
+  previous = np.empty_like(reached)
+  previous[0] = 0
+  previous[1:] = reached[:-1]
+  keyed_starts = np.maximum(groups * span + (starts - base), previous)
+  added = np.maximum(keyed_ends - keyed_starts, 0)
+  return np.bincount(groups, weights=added).astype(np.int64)
+
+
+def no_streak() -> Dict:
+  """Return the recomputed values for a user without a single counted day."""
+  return {"current_streak": 0, "longest_streak": 0, "last_join_date": None}
+
+
+def recompute_streaks(user_ids: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+                      timezones: Dict[str, Optional[str]], now: datetime,
+                      rules: StreakRules) -> Dict[str, Dict]:
+  """
+  Recompute every user's current and longest streak from their sessions.
+
+  As in the live bot, sessions are split at local midnight and a day counts
+  once its distinct study time reaches the minimum, however many sessions
+  it took.
+
+  Args:
+    user_ids (np.ndarray): The user ID of each session.
+    starts (np.ndarray): Session start timestamps.
+    ends (np.ndarray): Session end timestamps.
+    timezones (dict): User ID -> timezone name (None for the default).
+    now (datetime): An aware datetime used to decide whether streaks are alive.
+    rules (StreakRules): The rules to apply.
+
+  Returns:
+    dict: User ID -> {"current_streak", "longest_streak", "last_join_date"}
+      for every user in the session history; users without a counted day
+      get no_streak().
+  """
+  valid = ends > starts
+  user_ids, starts, ends = user_ids[valid], starts[valid], ends[valid]
+  if user_ids.size == 0:
+    return {}
+
+  unique_users, user_index = np.unique(user_ids, return_inverse=True)
+  user_index = user_index.reshape(-1)
+  user_tz = np.array([timezones.get(str(user)) or DEFAULT_TIMEZONE for user in unique_users])
+  recomputed = {str(user): no_streak() for user in unique_users}
+
+  # Sessions in local seconds, so local days are whole multiples of a day
+  local_starts = np.empty_like(starts)
+  local_ends = np.empty_like(ends)
+  today = np.empty(unique_users.size, dtype=np.int64)
+  now_timestamp = np.array([int(now.timestamp())], dtype=np.int64)
+  session_tz = user_tz[user_index]
+  for name in np.unique(user_tz):
+    tz = get_timezone(name)
+    in_tz = session_tz == name
+    local_starts[in_tz] = local_seconds(starts[in_tz], tz)
+    local_ends[in_tz] = local_seconds(ends[in_tz], tz)
+    today[user_tz == name] = local_epoch_days(now_timestamp, tz)[0]
+
+  # One piece per local day each session touches
+  first_days = local_starts // SECONDS_PER_DAY
+  pieces = (local_ends - 1) // SECONDS_PER_DAY - first_days + 1
+  session_of = np.repeat(np.arange(pieces.size), pieces)
+  offsets = np.arange(session_of.size) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+  piece_days = first_days[session_of] + offsets
+  piece_starts = np.maximum(local_starts[session_of], piece_days * SECONDS_PER_DAY)
+  piece_ends = np.minimum(local_ends[session_of], (piece_days + 1) * SECONDS_PER_DAY)
+  piece_users = user_index[session_of]
+
+  # Distinct study time per sorted (user, day), keeping the days that count
+  order = np.lexsort((piece_starts, piece_days, piece_users))
+  piece_users, piece_days = piece_users[order], piece_days[order]
+  new_group = np.ones(order.size, dtype=bool)
+  new_group[1:] = (piece_users[1:] != piece_users[:-1]) | (piece_days[1:] != piece_days[:-1])
+  groups = np.cumsum(new_group) - 1
+  totals = daily_study_seconds(groups, piece_starts[order], piece_ends[order])
+  counted = totals >= rules.minimum_minutes * 60
+  users, days = piece_users[new_group][counted], piece_days[new_group][counted]
+  if users.size == 0:
+    return recomputed
+
+  # A run breaks at each new user or at a gap longer than the grace period
+  new_user = np.ones(users.size, dtype=bool)
+  new_user[1:] = users[1:] != users[:-1]
+  new_run = new_user.copy()
+  new_run[1:] |= (days[1:] - days[:-1]) > 1 + rules.grace_days
+  run_ids = np.cumsum(new_run) - 1
+  run_lengths = np.bincount(run_ids)
+
+  user_starts = np.flatnonzero(new_user)
+  user_ends = np.append(user_starts[1:], users.size) - 1
+  longest = np.maximum.reduceat(run_lengths[run_ids], user_starts)
+  last_days = days[user_ends]
+  user_rows = users[user_starts]
+  alive = today[user_rows] - last_days <= 1 + rules.grace_days
+  current = np.where(alive, run_lengths[run_ids[user_ends]], 0)
+
+  for i, row in enumerate(user_rows):
+    recomputed[str(unique_users[row])] = {
+      "current_streak": int(current[i]),
+      "longest_streak": int(longest[i]),
+      "last_join_date": from_epoch_day(int(last_days[i])),
+    }
+  return recomputed
+
+
+def diff_streaks(streaks_data: Dict, recomputed: Dict) -> List[Tuple[str, str, str, object, object]]:
+  """
+  Compare recomputed streaks with the live data.
+
+  Live users missing from the recomputed streaks have no counted day, so
+  they are compared against no_streak().
+
+  Returns:
+    list: (user_id, username, field, live value, recomputed value) for
+      every field that would change.
+  """
+  changes = []
+  for user_id, user_data in streaks_data.items():
+    new_values = recomputed.get(user_id) or no_streak()
+    for field, new_value in new_values.items():
+      if getattr(user_data, field) != new_value:
+        changes.append((user_id, user_data.username, field, getattr(user_data, field), new_value))
+  return changes
+
+
+def apply_streaks(streaks_data: Dict, recomputed: Dict, preserve_longest: bool = False) -> int:
+  """
+  Write recomputed streaks into the live data.
+
+  Args:
+    streaks_data (dict): User ID -> UserStreak, updated in place.
+    recomputed (dict): The output of recompute_streaks; live users missing
+      from it are reset to no_streak().
+    preserve_longest (bool): Keep a longer live longest streak, e.g. one
+      earned before session history was recorded.
+
+  Returns:
+    int: The number of users updated.
+  """
+  updated = 0
+  for user_id, user_data in streaks_data.items():
+    new_values = recomputed.get(user_id) or no_streak()
+    user_data.current_streak = new_values["current_streak"]
+    user_data.last_join_date = new_values["last_join_date"]
+    longest = new_values["longest_streak"]
+    user_data.longest_streak = max(longest, user_data.longest_streak) if preserve_longest else longest
+    updated += 1
+  return updated
+
+
+def parse_args(argv=None):
+  parser = argparse.ArgumentParser(description="Recompute streaks from the session history.")
+  parser.add_argument("--sessions", default=session_log.SESSIONS_FILE)
+  parser.add_argument("--streaks", default=None, help="Streaks file (defaults to the bot's).")
+  parser.add_argument("--minimum-minutes", type=int, default=core.MINIMUM_MINUTES)
+  parser.add_argument("--grace-days", type=int, default=0)
+  parser.add_argument("--preserve-longest", action="store_true")
+  parser.add_argument("--apply", action="store_true", help="Write the changes (default is a dry run).")
+  parser.add_argument("--bot-stopped", action="store_true",
+                      help="Confirm the bot isn't running, so --apply won't be overwritten by its next save.")
+  parser.add_argument("--drop-leetcode-days", action="store_true",
+                      help="Apply even though days credited for LeetCode solves will be lost.")
+  parser.add_argument("--show", type=int, default=50, help="Number of changes to print.")
+  return parser.parse_args(argv)
+
+
+def main(argv=None):
+  from cogs import streaks
+
+  logging.basicConfig(level=logging.INFO,
+                      format='%(asctime)s - %(levelname)s - %(message)s')
+  args = parse_args(argv)
+  if args.apply and not args.bot_stopped:
+    raise SystemExit("The running bot would overwrite the backfill on its next save. "
+                     "Stop the bot, then rerun with --apply --bot-stopped.")
+  if args.apply and core.LEETCODE_STREAKS and not args.drop_leetcode_days:
+    raise SystemExit("LEETCODE_STREAKS is on, and days credited for LeetCode solves aren't in the "
+                     "session history, so applying would drop them. Rerun with --drop-leetcode-days "
+                     "to apply anyway.")
+  if args.streaks:
+    streaks.STREAKS_FILE = args.streaks
+
+  streaks_data = streaks.StreaksCog.load_streaks()
+  rules = StreakRules(args.minimum_minutes, args.grace_days)
+  started = datetime.now(pytz.utc)
+  recomputed = recompute_streaks(
+    *session_log.load_sessions(args.sessions),
+    {user_id: data.timezone for user_id, data in streaks_data.items()},
+    started, rules)
+  elapsed = (datetime.now(pytz.utc) - started).total_seconds()
+
+  changes = diff_streaks(streaks_data, recomputed)
+  print(f"Recomputed {len(recomputed)} users in {elapsed:.2f}s; {len(changes)} field changes.")
+  for user_id, username, field, old, new in changes[:args.show]:
+    print(f"  {username} ({user_id}) {field}: {old} -> {new}")
+
+  if args.apply:
+    updated = apply_streaks(streaks_data, recomputed, args.preserve_longest)
+    streaks.StreaksCog.save_streaks(streaks_data)
+    print(f"Applied recomputed streaks to {updated} users.")
+  else:
+    print("Dry run: no changes written. Pass --apply to save them.")
+
+
+if __name__ == '__main__':
+  main()
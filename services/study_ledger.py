@@ -0,0 +1,97 @@
+"""
+Persistent per-user study time for the current local day.
+
+Only each user's latest day is kept, since earlier days can no longer earn
+credit, so the ledger holds at most one bounded StudyDay per member. It is
+saved as compact rows (see StudyDay.as_row) next to the streaks file.
+"""
+
+import json
+import logging
+import os
+import tempfile
+
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from domain.streak_data import epoch_day
+from domain.study_time import StudyDay, split_by_day
+
+
+logger = logging.getLogger(__name__)
+
+STUDY_TIME_FILE = "study_time.json"
+FORMAT_VERSION = 1
+
+
+class StudyLedger:
+  """
+  Each user's study intervals on their latest local day.
+
+  Attributes:
+    path (str): The ledger file.
+    days (dict): User ID -> StudyDay.
+    dirty (bool): Whether there are changes not yet saved.
+  """
+  def __init__(self, path: Optional[str] = None):
+    self.path = path or STUDY_TIME_FILE
+    self.days: Dict[str, StudyDay] = {}
+    self.dirty = False
+
+  def load(self) -> None:
+    """Read the ledger file, starting empty if it is missing or unreadable."""
+    try:
+      with open(self.path, 'r') as file:
+        loaded = json.load(file)
+    except FileNotFoundError:
+      return
+    except (OSError, json.JSONDecodeError) as e:
+      logger.error(f"Ignoring unreadable study ledger {self.path}: {e}")
+      return
+    if loaded.get("version") == FORMAT_VERSION:
+      self.days = {user_id: StudyDay.from_row(row) for user_id, row in loaded["users"].items()}
+
+  def save(self) -> None:
+    """Write the ledger atomically if it changed."""
+    if not self.dirty:
+      return
+    directory = os.path.dirname(os.path.abspath(self.path))
+    try:
+      with tempfile.NamedTemporaryFile(mode='w', dir=directory, delete=False) as temp_file:
+        json.dump({"version": FORMAT_VERSION,
+                   "users": {user_id: day.as_row() for user_id, day in self.days.items()}},
+                  temp_file, separators=(",", ":"))
+      os.replace(temp_file.name, self.path)
+      self.dirty = False
+    except OSError as e:
+      logger.error(f"Failed to save study ledger {self.path}: {e}")
+
+  def get(self, user_id: str) -> Optional[StudyDay]:
+    return self.days.get(user_id)
+
+  def record(self, user_id: str, start: datetime, end: datetime, tz) -> List[Tuple[StudyDay, datetime]]:
+    """
+    Add a finished session, split at local midnight.
+
+    Args:
+      user_id (str): The user's ID.
+      start (datetime): When the session started.
+      end (datetime): When the session ended.
+      tz (tzinfo): The user's timezone.
+
+    Returns:
+      list: (StudyDay, end of the session's part of that day) for each day
+        the session touched, oldest first.
+    """
+    touched = []
+    for day, piece_start, piece_end in split_by_day(start, end, tz):
+      day = epoch_day(day)
+      record = self.days.get(user_id)
+      if record is None or record.day < day:
+        record = self.days[user_id] = StudyDay(day)
+      elif record.day > day:
+        continue
+      record.add(int(piece_start.timestamp()), int(piece_end.timestamp()))
+      touched.append((record, piece_end))
+      self.dirty = True
+    return touched
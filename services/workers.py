@@ -0,0 +1,142 @@
+"""
+An optional process-pool tier for CPU-bound work.
+
+Everything the bot does normally runs on the gateway event loop, so a slow
+CPU-bound step (retrieval scoring, prompt building, bulk aggregation) delays
+heartbeats and every other event. WorkerPool hands such functions to a pool
+of worker processes and awaits their results, bounding how much work may be
+queued so a burst of messages slows callers down instead of growing an
+unbounded backlog. With no processes configured the work runs inline, which
+is the same behaviour as before the tier existed.
+
+Submitted functions and their arguments must be picklable, i.e. module-level
+functions with plain-data arguments.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerPoolBusy(RuntimeError):
+  """Raised when work could not be queued before the queue timeout."""
+
+
+class WorkerPool:
+  """
+  Runs functions in worker processes with bounded in-flight work.
+
+  Attributes:
+    processes (int): The number of worker processes; 0 runs work inline.
+    max_pending (int): The most submissions queued or running at once.
+    queue_timeout (float, optional): Seconds to wait for a free slot before
+      raising WorkerPoolBusy; None waits indefinitely.
+    initializer (callable, optional): Run once in each worker when it starts,
+      e.g. to load shared indexes.
+  """
+  def __init__(self, processes: int = 0, max_pending: int = 64,
+               queue_timeout: Optional[float] = None,
+               initializer: Optional[Callable] = None):
+    self.processes = processes
+    self.max_pending = max_pending
+    self.queue_timeout = queue_timeout
+    self.initializer = initializer
+    self._executor: Optional[ProcessPoolExecutor] = None
+    self._slots: Optional[asyncio.Semaphore] = None
+    self.pending = 0
+    self.completed = 0
+    self.failed = 0
+    self.rejected = 0
+    self.restarts = 0
+
+  @property
+  def enabled(self) -> bool:
+    return self.processes > 0
+
+  def _get_executor(self) -> ProcessPoolExecutor:
+    if self._executor is None:
+      # Spawned workers don't inherit the gateway's threads or sockets
+      self._executor = ProcessPoolExecutor(
+        max_workers=self.processes,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=self.initializer)
+      logger.info(f"Started {self.processes} worker processes.")
+    return self._executor
+
+  def _restart(self) -> None:
+    """Replace a pool whose worker died."""
+    if self._executor is not None:
+      self._executor.shutdown(wait=False, cancel_futures=True)
+    self._executor = None
+    self.restarts += 1
+    logger.warning("Worker pool broke; starting a new one.")
+
+  async def _acquire(self) -> None:
+    if self._slots is None:
+      self._slots = asyncio.Semaphore(self.max_pending)
+    try:
+      await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+    except asyncio.TimeoutError:
+      self.rejected += 1
+      raise WorkerPoolBusy(f"{self.pending} tasks already pending") from None
+
+  async def run(self, fn: Callable, *args):
+    """
+    Run fn(*args) in a worker process and return its result.
+
+    Args:
+      fn (callable): A picklable function.
+      *args: Picklable arguments.
+
+    Returns:
+      The function's return value.
+
+    Raises:
+      WorkerPoolBusy: If no slot became free within queue_timeout.
+      Exception: Whatever fn raised.
+    """
+    if not self.enabled:
+      return fn(*args)
+
+    await self._acquire()
+    self.pending += 1
+    try:
+      loop = asyncio.get_running_loop()
+      try:
+        result = await loop.run_in_executor(self._get_executor(), fn, *args)
+      except BrokenProcessPool:
+        self._restart()
+        result = await loop.run_in_executor(self._get_executor(), fn, *args)
+      self.completed += 1
+      return result
+    except Exception:
+      self.failed += 1
+      raise
+    finally:
+      self.pending -= 1
+      self._slots.release()
+
+  def snapshot(self) -> Dict:
+    """Return the pool's counters for status reporting."""
+    return {
+      "processes": self.processes,
+      "max_pending": self.max_pending,
+      "pending": self.pending,
+      "completed": self.completed,
+      "failed": self.failed,
+      "rejected": self.rejected,
+      "restarts": self.restarts,
+    }
+
+  def shutdown(self, wait: bool = True) -> None:
+    """Stop the worker processes."""
+    if self._executor is not None:
+      self._executor.shutdown(wait=wait, cancel_futures=True)
+      self._executor = None
@@ -0,0 +1,47 @@
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from cogs import admin
+
+
+@pytest.fixture
+def cog():
+  return admin.AdminCog(Mock())
+
+
+@pytest.mark.asyncio
+async def test_cog_check_requires_manage_guild(cog):
+  # Arrange
+  admin_ctx, member_ctx = Mock(), Mock()
+  admin_ctx.author.guild_permissions.manage_guild = True
+  member_ctx.author.guild_permissions.manage_guild = False
+
+  # Act / Assert
+  assert await cog.cog_check(admin_ctx)
+  assert not await cog.cog_check(member_ctx)
+
+
+@pytest.mark.asyncio
+async def test_quotas_command_reports_snapshot(cog):
+  # Arrange
+  ctx = AsyncMock()
+  quotas = Mock()
+  quotas.snapshot.return_value = {
+    "global": {"requests": 55.0, "tokens": 80000},
+    "limited": {"user": 3, "channel": 0, "global": 0},
+    "tracked": {"users": 2, "channels": 1},
+    "users": [{"id": "42", "requests": 0.5, "tokens": 100}],
+    "channels": [],
+  }
+
+  # Act
+  with patch.dict("sys.modules", {"bot.events": Mock(quotas=quotas)}):
+    await cog.quotas.callback(cog, ctx)
+
+  # Assert
+  message = ctx.send.call_args[0][0]
+  assert "Global: 55.0 / 80000" in message
+  assert "user 3" in message
+  assert "Lowest users: 42 (0.5 / 100)" in message
+  assert "Lowest channels" not in message
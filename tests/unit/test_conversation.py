@@ -0,0 +1,77 @@
+from services.conversation import ConversationMemory, compact_summary, estimate_tokens
+
+
+def test_history_returns_turns_oldest_first():
+  # Arrange
+  memory = ConversationMemory(token_budget=1000)
+  memory.add("channel:1", "user", "What is recursion?")
+  memory.add("channel:1", "assistant", "A function calling itself.")
+
+  # Act
+  history = memory.history("channel:1")
+
+  # Assert
+  assert history == [
+    {"role": "user", "content": "What is recursion?"},
+    {"role": "assistant", "content": "A function calling itself."},
+  ]
+  assert memory.history("channel:2") == []
+
+
+def test_add_trims_history_to_token_budget():
+  # Arrange
+  memory = ConversationMemory(token_budget=30)
+  long_message = "x" * 80  # 20 tokens
+
+  # Act
+  memory.add("channel:1", "user", long_message)
+  memory.add("channel:1", "assistant", long_message)
+
+  # Assert
+  assert memory.history("channel:1") == [{"role": "assistant", "content": long_message}]
+  assert memory.token_count("channel:1") == estimate_tokens(long_message)
+
+
+def test_ring_buffer_keeps_only_max_turns():
+  # Arrange
+  memory = ConversationMemory(token_budget=10_000, max_turns=3)
+
+  # Act
+  for i in range(5):
+    memory.add("dm:7", "user", f"question {i}")
+
+  # Assert
+  contents = [turn["content"] for turn in memory.history("dm:7")]
+  assert contents == ["question 2", "question 3", "question 4"]
+  assert memory.token_count("dm:7") == sum(estimate_tokens(c) for c in contents)
+
+
+def test_dropped_turns_are_summarized():
+  # Arrange
+  memory = ConversationMemory(token_budget=32, summarizer=compact_summary)
+
+  # Act
+  memory.add("channel:1", "user", "How do binary trees work. Please explain in detail.")
+  memory.add("channel:1", "assistant", "y" * 100)
+
+  # Assert
+  history = memory.history("channel:1")
+  assert history[0]["role"] == "system"
+  assert "How do binary trees work" in history[0]["content"]
+  assert history[-1]["content"] == "y" * 100
+
+
+def test_least_recently_used_conversation_is_forgotten():
+  # Arrange
+  memory = ConversationMemory(max_conversations=2)
+  memory.add("a", "user", "hi")
+  memory.add("b", "user", "hi")
+  memory.history("a")
+
+  # Act
+  memory.add("c", "user", "hi")
+
+  # Assert
+  assert len(memory) == 2
+  assert memory.history("b") == []
+  assert memory.history("a") != []
@@ -0,0 +1,126 @@
+import csv
+import os
+import sys
+from datetime import date
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from bot import core
+from cogs import owner, streaks
+from domain.streak_data import UserStreak
+from domain.streak_snapshot import write_snapshot
+from services import export
+
+
+def make_records():
+  alice = UserStreak("Alice", 3, 5, timezone="Europe/Berlin")
+  alice.last_join_date = date(2024, 5, 1)
+  return [("42", alice), ("7", UserStreak("Bob"))]
+
+
+def read_csv(path):
+  with open(path, newline='') as file:
+    return list(csv.reader(file))
+
+
+def test_streaks_export_to_csv(tmp_path):
+  # Arrange
+  path = str(tmp_path / "streaks.csv")
+
+  # Act
+  written = export.export("streaks", "csv", path, make_records(), chunk_size=1)
+
+  # Assert
+  assert written == 2
+  assert read_csv(path) == [list(export.STREAK_COLUMNS),
+                            ["42", "Alice", "3", "5", "2024-05-01", "Europe/Berlin"],
+                            ["7", "Bob", "0", "0", "", ""]]
+
+
+def test_sessions_export_streams_history(tmp_path):
+  # Arrange
+  sessions = tmp_path / "sessions.csv"
+  sessions.write_text("42,1700000000,1700001800\n7,1700003600,1700003700\n")
+  path = str(tmp_path / "out.csv")
+
+  # Act
+  written = export.export("sessions", "csv", path, sessions_path=str(sessions))
+
+  # Assert
+  assert written == 2
+  assert read_csv(path)[1] == ["42", "2023-11-14T22:13:20+00:00", "2023-11-14T22:43:20+00:00", "30"]
+
+
+def test_stale_snapshot_is_not_exported(tmp_path, monkeypatch):
+  # Arrange
+  monkeypatch.setattr(streaks, "STREAKS_FILE", str(tmp_path / "streaks.json"))
+  monkeypatch.setattr(streaks, "STREAKS_SNAPSHOT_FILE", str(tmp_path / "streaks.bin"))
+  monkeypatch.setattr(core, "STREAK_SNAPSHOT", True)
+  write_snapshot(streaks.STREAKS_SNAPSHOT_FILE, {"42": UserStreak("Alice", 1, 1)})
+  with open(streaks.STREAKS_FILE, 'w') as file:
+    file.write(streaks.encode_streaks({"42": UserStreak("Alice", 4, 4)}))
+  os.utime(streaks.STREAKS_SNAPSHOT_FILE, (1, 1))
+
+  # Act
+  current = dict(export.stored_streak_records())
+  monkeypatch.setattr(core, "STREAK_SNAPSHOT", False)
+  os.utime(streaks.STREAKS_SNAPSHOT_FILE, None)
+  disabled = dict(export.stored_streak_records())
+  monkeypatch.setattr(core, "STREAK_SNAPSHOT", True)
+  fresh = dict(export.stored_streak_records())
+
+  # Assert
+  assert current["42"].current_streak == 4
+  assert disabled["42"].current_streak == 4
+  assert fresh["42"].current_streak == 1
+
+
+def test_chunked_bounds_batch_size():
+  # Act
+  chunks = list(export.chunked(iter(range(7)), 3))
+
+  # Assert
+  assert chunks == [[0, 1, 2], [3, 4, 5], [6]]
+
+
+def test_parquet_without_pyarrow_raises_export_error(tmp_path, monkeypatch):
+  # Arrange
+  monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+  # Act / Assert
+  with pytest.raises(export.ExportError):
+    export.export("streaks", "parquet", str(tmp_path / "streaks.parquet"), make_records())
+
+
+def test_streaks_export_to_parquet(tmp_path):
+  # Arrange
+  pq = pytest.importorskip("pyarrow.parquet")
+  path = str(tmp_path / "streaks.parquet")
+
+  # Act
+  export.export("streaks", "parquet", path, make_records(), chunk_size=1)
+
+  # Assert
+  table = pq.read_table(path)
+  assert table.column("username").to_pylist() == ["Alice", "Bob"]
+  assert pq.ParquetFile(path).num_row_groups == 2
+
+
+@pytest.mark.asyncio
+async def test_export_command_uploads_attachment():
+  # Arrange
+  bot = Mock()
+  bot.get_cog.return_value.state.return_value = dict(make_records())
+  cog = owner.OwnerCog(bot)
+  ctx = AsyncMock()
+  ctx.guild.filesize_limit = 10 * 1024 * 1024
+
+  # Act
+  await cog.export.callback(cog, ctx, "streaks", "csv")
+
+  # Assert
+  message = ctx.send.call_args[0][0]
+  attachment = ctx.send.call_args[1]["file"]
+  assert message == "Exported 2 streaks rows."
+  assert attachment.filename == "streaks.csv"
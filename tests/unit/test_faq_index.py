@@ -0,0 +1,67 @@
+import numpy as np
+
+from services.faq_index import FaqIndex, load_corpus, tokenize
+
+
+PASSAGES = [
+  "Stay in the Accountability Room for at least 25 minutes for the session to count toward your streak.",
+  "We hold a group accountability session every day at 9 PM PST.",
+  "Use !leetcode with a username to see a LeetCode profile.",
+]
+
+
+def test_tokenize_drops_stop_words_and_adds_bigrams():
+  assert tokenize("How do I keep my streak") == ["keep", "streak", "keep streak"]
+
+
+def test_search_ranks_most_relevant_passage_first():
+  # Arrange
+  index = FaqIndex.build(PASSAGES, index_dir=None)
+
+  # Act
+  results = index.search("what time is the daily group session?")
+
+  # Assert
+  assert results[0][1] == PASSAGES[1]
+  assert all(results[i][0] >= results[i + 1][0] for i in range(len(results) - 1))
+
+
+def test_answer_requires_high_confidence():
+  # Arrange
+  index = FaqIndex.build(PASSAGES, index_dir=None, answer_threshold=0.4)
+
+  # Act / Assert
+  assert index.answer("How many minutes in the Accountability Room count toward my streak?") == PASSAGES[0]
+  assert index.answer("Explain dynamic programming") is None
+
+
+def test_context_wraps_relevant_passages_as_system_message():
+  # Arrange
+  index = FaqIndex.build(PASSAGES, index_dir=None, context_threshold=0.1)
+
+  # Act
+  context = index.context("leetcode profile stats")
+
+  # Assert
+  assert context["role"] == "system"
+  assert PASSAGES[2] in context["content"]
+  assert index.context("quantum chromodynamics") is None
+
+
+def test_build_reuses_memory_mapped_cache(tmp_path):
+  # Arrange
+  first = FaqIndex.build(PASSAGES, index_dir=str(tmp_path))
+
+  # Act
+  second = FaqIndex.build(PASSAGES, index_dir=str(tmp_path))
+
+  # Assert
+  assert isinstance(second.matrix, np.memmap)
+  assert np.allclose(first.matrix, second.matrix)
+  assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_load_corpus_includes_docs_and_explanation():
+  corpus = load_corpus()
+  assert any("!timezone" in passage for passage in corpus)
+  assert any(passage.startswith("Join the Accountability Room") for passage in corpus)
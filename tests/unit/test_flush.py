@@ -0,0 +1,100 @@
+import itertools
+import threading
+import time
+
+import pytest
+
+from services.flush import FlushCoordinator
+
+
+class Store:
+  def __init__(self, dirty=True, fails=False):
+    self.dirty = dirty
+    self.fails = fails
+    self.writes = 0
+
+  def save(self):
+    self.writes += 1
+    if not self.fails:
+      self.dirty = False
+
+
+def register(coordinator, name, store):
+  coordinator.register(name, lambda: store.dirty, store.save)
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_only_dirty_stores():
+  # Arrange
+  coordinator = FlushCoordinator()
+  streaks, members, leetcode = Store(), Store(dirty=False), Store(fails=True)
+  register(coordinator, "streaks", streaks)
+  register(coordinator, "member_cache", members)
+  register(coordinator, "leetcode", leetcode)
+
+  # Act
+  summary = await coordinator.flush("disconnect")
+  again = await coordinator.flush("disconnect")
+
+  # Assert
+  assert summary["flushed"] == ["streaks"]
+  assert summary["clean"] == ["member_cache"]
+  assert summary["failed"] == ["leetcode"]
+  assert (streaks.writes, members.writes) == (1, 0)
+  assert again["flushed"] == [] and again["clean"] == ["streaks", "member_cache"]
+  assert coordinator.flushes == 2
+
+
+@pytest.mark.asyncio
+async def test_flush_reports_stores_past_the_deadline_as_missed():
+  # Arrange
+  ticks = itertools.count()
+  coordinator = FlushCoordinator(clock=lambda: next(ticks))
+  first, second = Store(), Store()
+  register(coordinator, "first", first)
+  register(coordinator, "second", second)
+
+  # Act
+  summary = await coordinator.flush("SIGTERM", deadline=1.5)
+
+  # Assert
+  assert summary["flushed"] == ["first"]
+  assert summary["missed"] == ["second"]
+  assert second.writes == 0
+
+
+@pytest.mark.asyncio
+async def test_flush_survives_a_raising_store():
+  # Arrange
+  coordinator = FlushCoordinator()
+  coordinator.register("broken", lambda: True, lambda: 1 / 0)
+  store = Store()
+  register(coordinator, "streaks", store)
+  coordinator.unregister("missing")
+
+  # Act
+  summary = await coordinator.flush("SIGTERM")
+
+  # Assert
+  assert summary["failed"] == ["broken"]
+  assert summary["flushed"] == ["streaks"]
+
+
+@pytest.mark.asyncio
+async def test_slow_store_is_cut_off_by_the_deadline_off_the_loop():
+  # Arrange
+  coordinator = FlushCoordinator()
+  release = threading.Event()
+  slow, fast = Store(), Store()
+  coordinator.register("slow", lambda: slow.dirty, lambda: release.wait(5))
+  register(coordinator, "fast", fast)
+
+  # Act
+  started = time.monotonic()
+  summary = await coordinator.flush("SIGTERM", deadline=0.2)
+  elapsed = time.monotonic() - started
+  release.set()
+
+  # Assert
+  assert summary["missed"] == ["slow", "fast"]
+  assert elapsed < 1
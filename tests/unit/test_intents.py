@@ -0,0 +1,81 @@
+import json
+import os
+
+from services.intents import IntentMatcher, PhraseAutomaton, normalize
+
+
+def test_automaton_prefers_longest_phrase():
+  # Arrange
+  automaton = PhraseAutomaton([
+    (normalize("streak"), "short"),
+    (normalize("streak freeze"), "long"),
+  ])
+
+  # Act / Assert
+  assert automaton.search(normalize("Is there a STREAK freeze?")) == "long"
+  assert automaton.search(normalize("my streak")) == "short"
+  assert automaton.search(normalize("streaks")) is None
+
+
+def test_automaton_follows_failure_links():
+  # Arrange
+  automaton = PhraseAutomaton([(" she ", "she"), (" he says ", "says")])
+
+  # Act / Assert
+  assert automaton.search(" well he says hi ") == "says"
+  assert automaton.search(" and she left ") == "she"
+
+
+def test_respond_answers_bundled_intents():
+  # Arrange
+  matcher = IntentMatcher()
+
+  # Act / Assert
+  assert "Here’s how our accountability system" in matcher.respond("How does this accountability work again?")
+  assert "9 PM PST" in matcher.respond("When is the daily session?")
+  assert "Streak freezes" in matcher.respond("do we have a streak freeze")
+  assert matcher.respond("How do I reverse a linked list?") is None
+
+
+def test_respond_leaves_tutoring_questions_to_the_model():
+  # Arrange
+  matcher = IntentMatcher()
+
+  # Act / Assert
+  assert matcher.respond("how do i register bot commands in discord.py") is None
+  assert matcher.respond("help me make a study session schedule for finals") is None
+  assert matcher.respond("I think a streak freeze should take 7 days") is None
+  assert "`!streak [member]`" in matcher.respond("Hooter, what are your commands?")
+  assert "9 PM PST" in matcher.respond("when are study sessions?")
+
+
+def test_respond_hot_reloads_changed_file(tmp_path):
+  # Arrange
+  path = tmp_path / "intents.json"
+  path.write_text(json.dumps({"intents": [
+    {"name": "greeting", "phrases": ["hello hooter"], "response": "Hoo hoo!"}]}))
+  matcher = IntentMatcher(str(path), reload_interval=0)
+  assert matcher.respond("hello hooter") == "Hoo hoo!"
+
+  # Act
+  path.write_text(json.dumps({"intents": [
+    {"name": "greeting", "phrases": ["hello hooter"], "response": "Hi there!"}]}))
+  os.utime(path, (1, 1))
+
+  # Assert
+  assert matcher.respond("Hello, Hooter!") == "Hi there!"
+
+
+def test_reload_keeps_previous_table_when_file_is_malformed(tmp_path):
+  # Arrange
+  path = tmp_path / "intents.json"
+  path.write_text(json.dumps({"intents": [
+    {"name": "greeting", "phrases": ["hello hooter"], "response": "Hoo hoo!"}]}))
+  matcher = IntentMatcher(str(path))
+
+  # Act
+  path.write_text("{not json")
+
+  # Assert
+  assert matcher.reload() is False
+  assert matcher.respond("hello hooter") == "Hoo hoo!"
@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+from utils.keyed_locks import KeyedLocks
+
+
+@pytest.mark.asyncio
+async def test_same_key_runs_in_order_and_other_keys_interleave():
+  # Arrange
+  locks = KeyedLocks()
+  events = []
+
+  async def work(key, label, delay):
+    async with locks.hold(key):
+      events.append(f"start {label}")
+      await asyncio.sleep(delay)
+      events.append(f"end {label}")
+
+  # Act
+  await asyncio.gather(work("a", "a1", 0.02), work("a", "a2", 0), work("b", "b1", 0.01))
+
+  # Assert
+  assert events.index("end a1") < events.index("start a2")
+  assert events.index("start b1") < events.index("end a1")
+  assert len(locks) == 0
+
+
+@pytest.mark.asyncio
+async def test_lock_is_released_on_error():
+  # Arrange
+  locks = KeyedLocks()
+
+  # Act
+  with pytest.raises(ValueError):
+    async with locks.hold("a"):
+      assert locks.locked("a")
+      raise ValueError("boom")
+
+  # Assert
+  assert not locks.locked("a")
+  assert locks.active() == []
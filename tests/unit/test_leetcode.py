@@ -1,7 +1,16 @@
+import json
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
 import discord
 import pytest
+import pytz
 from unittest.mock import Mock, patch, AsyncMock
 from cogs import leetcode
+from domain.streak_data import UserStreak
+from services.leetcode_cache import LeetCodeCache
 
 
 @pytest.fixture
@@ -53,7 +62,7 @@ def test_fetch_leetcode_profile_success(cog):
     result = cog.fetch_leetcode_profile('testuser')
 
     # Assert
-    mock_get.assert_called_once_with(expected_url)
+    mock_get.assert_called_once_with(expected_url, timeout=leetcode.FETCH_TIMEOUT)
 
     # Check that the result is not None (indicating successful retrieval)
     assert result is not None, "Expected a non-None result"
@@ -86,6 +95,19 @@ def test_fetch_leetcode_profile_failure(cog):
     result = cog.fetch_leetcode_profile('nonexistentuser')
     assert result is None
 
+
+def test_fetch_leetcode_profile_error_status_is_a_failure(cog):
+  # Arrange
+  with patch('requests.get') as mock_get:
+    mock_get.return_value.status_code = 200
+    mock_get.return_value.json.return_value = {"status": "error", "message": "user does not exist"}
+
+    # Act
+    result = cog.fetch_leetcode_profile('nobody')
+
+  # Assert
+  assert result is None
+
 @pytest.mark.asyncio
 async def test_leetcode_command_success(cog):
   """
@@ -188,4 +210,220 @@ async def test_leetcode_command_failure(cog):
     mock_fetch.assert_called_once_with(username)
     ctx.send.assert_called_once_with(f"Could not fetch data for {username}.")
 
-# Add more tests for edge cases and other scenarios
\ No newline at end of file
+# Add more tests for edge cases and other scenarios
+
+
+STUB_PROFILE = {
+  'totalSolved': 35, 'easySolved': 10, 'totalEasy': 100,
+  'mediumSolved': 20, 'totalMedium': 200,
+  'hardSolved': 5, 'totalHard': 50
+}
+
+
+class StubLeetCodeHandler(BaseHTTPRequestHandler):
+  requests_seen = []
+
+  def do_GET(self):
+    self.requests_seen.append(self.path)
+    if self.path == "/knownuser":
+      body = json.dumps(STUB_PROFILE).encode()
+      self.send_response(200)
+      self.send_header("Content-Type", "application/json")
+      self.send_header("Content-Length", str(len(body)))
+      self.end_headers()
+      self.wfile.write(body)
+    else:
+      self.send_response(404)
+      self.end_headers()
+
+  def log_message(self, *args):
+    pass
+
+
+@pytest.fixture
+def stub_api(monkeypatch):
+  server = HTTPServer(("127.0.0.1", 0), StubLeetCodeHandler)
+  thread = threading.Thread(target=server.serve_forever, daemon=True)
+  thread.start()
+  StubLeetCodeHandler.requests_seen = []
+  monkeypatch.setattr(leetcode, "API_URL", f"http://127.0.0.1:{server.server_port}")
+  yield StubLeetCodeHandler.requests_seen
+  server.shutdown()
+
+
+@pytest.fixture
+def cached_cog(bot, tmp_path):
+  cog = leetcode.LeetCodeCog(bot)
+  cog.cache = LeetCodeCache(str(tmp_path / "leetcode_cache.json"))
+  return cog
+
+
+def test_fetch_leetcode_profile_from_stub_api(cog, stub_api):
+  # Act
+  found = cog.fetch_leetcode_profile('knownuser')
+  missing = cog.fetch_leetcode_profile('nobody')
+
+  # Assert
+  assert found == STUB_PROFILE
+  assert missing is None
+  assert stub_api == ["/knownuser", "/nobody"]
+
+
+@pytest.mark.asyncio
+async def test_registered_profile_is_served_from_cache(cached_cog, stub_api):
+  # Arrange
+  ctx = AsyncMock()
+  ctx.author.id = 42
+  await cached_cog.register.callback(cached_cog, ctx, 'knownuser')
+  stub_api.clear()
+
+  # Act
+  await cached_cog.leetcode.callback(cached_cog, ctx)
+
+  # Assert
+  assert stub_api == []
+  embed = ctx.send.call_args[1]['embed']
+  assert embed.title == "LeetCode Profile: knownuser"
+  assert embed.footer.text.startswith("Updated")
+  reloaded = LeetCodeCache(cached_cog.cache.path)
+  reloaded.load()
+  assert reloaded.handle_for("42") == 'knownuser'
+
+
+@pytest.mark.asyncio
+async def test_register_rejects_unknown_profile(cached_cog, stub_api):
+  # Arrange
+  ctx = AsyncMock()
+  ctx.author.id = 42
+
+  # Act
+  await cached_cog.register.callback(cached_cog, ctx, 'nobody')
+
+  # Assert
+  ctx.send.assert_called_once_with("Could not find a LeetCode profile for nobody.")
+  assert cached_cog.cache.handle_for("42") is None
+
+
+@pytest.mark.asyncio
+async def test_prefetch_refreshes_due_profiles(cached_cog, stub_api):
+  # Arrange
+  cached_cog.cache.register("42", 'knownuser')
+
+  # Act
+  await cached_cog.prefetch_profiles.coro(cached_cog)
+
+  # Assert
+  assert stub_api == ["/knownuser"]
+  assert cached_cog.cache.get('knownuser')["data"] == STUB_PROFILE
+  assert cached_cog.cache.due() == []
+
+
+@pytest.mark.asyncio
+async def test_prefetch_credits_new_solves_to_streaks(cached_cog, monkeypatch):
+  # Arrange
+  monkeypatch.setattr(leetcode.core, "LEETCODE_STREAKS", True)
+  streaks_cog = Mock()
+  streaks_cog.state.return_value = {"42": UserStreak("Alice")}
+  cached_cog.bot.get_cog.return_value = streaks_cog
+  cached_cog.cache.register("42", 'knownuser', now=1)
+  cached_cog.cache.store('knownuser', dict(STUB_PROFILE), now=time.time() - 60)
+  cached_cog.cache.profiles['knownuser']["next_refresh"] = 0
+  solved_more = dict(STUB_PROFILE, totalSolved=36, easySolved=11)
+  cached_cog.fetch_profile = AsyncMock(return_value=solved_more)
+
+  # Act
+  await cached_cog.prefetch_profiles.coro(cached_cog)
+
+  # Assert
+  cached_cog.bot.get_cog.assert_called_once_with('StreaksCog')
+  user_id, username, _ = streaks_cog.credit_activity.call_args[0]
+  assert (user_id, username) == ("42", 'Alice')
+
+
+@pytest.mark.asyncio
+async def test_prefetch_passes_previous_fetch_time_to_credit(cached_cog, monkeypatch):
+  # Arrange
+  monkeypatch.setattr(leetcode.core, "LEETCODE_STREAKS", True)
+  cached_cog.cache.register("42", 'knownuser', now=1)
+  cached_cog.cache.store('knownuser', dict(STUB_PROFILE), now=1000)
+  cached_cog.cache.profiles['knownuser']["next_refresh"] = 0
+  cached_cog.fetch_profile = AsyncMock(return_value=dict(STUB_PROFILE, totalSolved=36, easySolved=11))
+  cached_cog.credit_solves = Mock()
+
+  # Act
+  await cached_cog.prefetch_profiles.coro(cached_cog)
+
+  # Assert
+  cached_cog.credit_solves.assert_called_once_with('knownuser', 1, 1000)
+
+
+def test_credit_solves_uses_discord_name_and_skips_strangers(cached_cog, monkeypatch):
+  # Arrange
+  monkeypatch.setattr(leetcode.core, "LEETCODE_STREAKS", True)
+  streaks_cog = Mock()
+  streaks_cog.state.return_value = {}
+  cached_cog.bot.get_cog.return_value = streaks_cog
+  member = Mock()
+  member.name = "alice_discord"
+  guild = Mock()
+  guild.get_member.side_effect = lambda member_id: member if member_id == 42 else None
+  cached_cog.bot.guilds = [guild]
+  cached_cog.cache.register("42", 'knownuser')
+  cached_cog.cache.register("7", 'knownuser')
+
+  # Act
+  cached_cog.credit_solves('knownuser', 1)
+
+  # Assert
+  streaks_cog.credit_activity.assert_called_once()
+  user_id, username, _ = streaks_cog.credit_activity.call_args[0]
+  assert (user_id, username) == ("42", "alice_discord")
+
+
+def test_credit_solves_across_midnight_credits_previous_day(cached_cog, monkeypatch):
+  # Arrange
+  monkeypatch.setattr(leetcode.core, "LEETCODE_STREAKS", True)
+  streaks_cog = Mock()
+  streaks_cog.state.return_value = {"42": UserStreak("Alice", timezone="UTC")}
+  cached_cog.bot.get_cog.return_value = streaks_cog
+  cached_cog.cache.register("42", 'knownuser')
+  evening = pytz.utc.localize(datetime(2024, 3, 1, 22))
+  morning = pytz.utc.localize(datetime(2024, 3, 2, 3))
+
+  # Act
+  with patch('cogs.leetcode.datetime', wraps=datetime) as mock_datetime:
+    mock_datetime.now.return_value = morning
+    cached_cog.credit_solves('knownuser', 2, since=evening.timestamp())
+
+  # Assert
+  _, _, moment = streaks_cog.credit_activity.call_args[0]
+  assert moment == evening
+
+
+@pytest.mark.asyncio
+async def test_leetcode_slash_defers_then_follows_up(cached_cog, stub_api):
+  # Arrange
+  interaction = AsyncMock()
+  interaction.user.id = 42
+
+  # Act
+  await cached_cog.leetcode_slash.callback(cached_cog, interaction, 'knownuser', private=True)
+
+  # Assert
+  interaction.response.defer.assert_awaited_once_with(ephemeral=True, thinking=True)
+  kwargs = interaction.followup.send.call_args[1]
+  assert kwargs['ephemeral'] is True
+  assert kwargs['embed'].title == "LeetCode Profile: knownuser"
+
+
+@pytest.mark.asyncio
+async def test_leetcode_slash_unknown_profile_replies_privately(cached_cog, stub_api):
+  # Arrange
+  interaction = AsyncMock()
+
+  # Act
+  await cached_cog.leetcode_slash.callback(cached_cog, interaction, 'nobody')
+
+  # Assert
+  interaction.response.defer.assert_awaited_once_with(ephemeral=False, thinking=True)
+  interaction.followup.send.assert_awaited_once_with("Could not fetch data for nobody.", ephemeral=True)
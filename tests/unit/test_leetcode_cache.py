@@ -0,0 +1,111 @@
+from datetime import date, datetime
+
+import pytz
+
+from services.leetcode_cache import (FAILURE_RETRY, MAX_INTERVAL, MIN_INTERVAL, LeetCodeCache,
+                                     daily_solves)
+
+
+def profile(solved):
+  return {'totalSolved': solved, 'easySolved': solved, 'mediumSolved': 0, 'hardSolved': 0}
+
+
+def test_refresh_interval_adapts_to_activity(tmp_path):
+  # Arrange
+  cache = LeetCodeCache(str(tmp_path / "cache.json"))
+  cache.register("1", "solver", now=1000)
+  cache.store("solver", profile(10), now=1000)
+
+  # Act
+  cache.store("solver", profile(10), now=2000)
+  idle_interval = cache.profiles["solver"]["interval"]
+  cache.store("solver", profile(11), now=3000)
+  active_interval = cache.profiles["solver"]["interval"]
+
+  # Assert
+  assert idle_interval == 2 * MIN_INTERVAL
+  assert active_interval == MIN_INTERVAL
+  assert cache.profiles["solver"]["next_refresh"] == 3000 + MIN_INTERVAL
+
+
+def test_interval_is_capped_and_failures_retry(tmp_path):
+  # Arrange
+  cache = LeetCodeCache(str(tmp_path / "cache.json"))
+  cache.register("1", "idle", now=1)
+  for step in range(20):
+    cache.store("idle", profile(3), now=1 + step)
+
+  # Act
+  cache.store("idle", None, now=5000)
+
+  # Assert
+  assert cache.profiles["idle"]["interval"] == MAX_INTERVAL
+  assert cache.profiles["idle"]["next_refresh"] == 5000 + FAILURE_RETRY
+  assert cache.get("idle")["data"] == profile(3)
+
+
+def test_due_returns_registered_handles_most_overdue_first(tmp_path):
+  # Arrange
+  cache = LeetCodeCache(str(tmp_path / "cache.json"))
+  cache.register("1", "late", now=100)
+  cache.register("2", "later", now=50)
+  cache.register("3", "gone", now=10)
+  cache.unregister("3")
+
+  # Act
+  due = cache.due(now=200)
+
+  # Assert
+  assert due == ["later", "late"]
+  assert "gone" not in cache.profiles
+
+
+def test_save_and_load_round_trip(tmp_path):
+  # Arrange
+  path = str(tmp_path / "cache.json")
+  cache = LeetCodeCache(path)
+  cache.register("1", "solver", now=1)
+  cache.store("solver", profile(4), now=2)
+
+  # Act
+  cache.save()
+  reloaded = LeetCodeCache(path)
+  reloaded.load()
+
+  # Assert
+  assert not cache.dirty
+  assert reloaded.handles == {"1": "solver"}
+  assert reloaded.get("solver")["data"] == profile(4)
+
+
+def test_store_reports_new_solves_and_keeps_changed_snapshots(tmp_path):
+  # Arrange
+  cache = LeetCodeCache(str(tmp_path / "cache.json"))
+  cache.register("1", "solver", now=1)
+
+  # Act
+  first = cache.store("solver", profile(10), now=100)
+  unchanged = cache.store("solver", profile(10), now=200)
+  solved = cache.store("solver", profile(13), now=300)
+
+  # Assert
+  assert (first, unchanged, solved) == (0, 0, 3)
+  assert cache.profiles["solver"]["history"] == [[100, 10, 0, 0], [300, 13, 0, 0]]
+  assert cache.users_for("solver") == ["1"]
+
+
+def test_daily_solves_groups_by_local_day():
+  # Arrange
+  tz = pytz.timezone("US/Pacific")
+  history = [
+    [int(tz.localize(datetime(2024, 3, 1, 9)).timestamp()), 10, 5, 1],
+    [int(tz.localize(datetime(2024, 3, 1, 20)).timestamp()), 11, 5, 1],
+    [int(tz.localize(datetime(2024, 3, 1, 23)).timestamp()), 11, 6, 2],
+    [int(tz.localize(datetime(2024, 3, 2, 8)).timestamp()), 12, 6, 2],
+  ]
+
+  # Act
+  solves = daily_solves(history, tz)
+
+  # Assert
+  assert solves == {date(2024, 3, 1): 3, date(2024, 3, 2): 1}
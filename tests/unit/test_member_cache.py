@@ -0,0 +1,175 @@
+import pytest
+
+from services import member_cache
+from services.member_cache import MemberCache
+
+
+class FakeMember:
+  def __init__(self, member_id, name, bot=False):
+    self.id = member_id
+    self.name = name
+    self.bot = bot
+
+
+class FakeGuild:
+  def __init__(self, members, chunked=False):
+    self.id = 1
+    self.name = "Study Hall"
+    self.members = members
+    self.member_count = len(members)
+    self.chunked = chunked
+    self.fetches = []
+
+  async def fetch_members(self, limit=None, after=None):
+    self.fetches.append(after.id if after else None)
+    for member in sorted(self.members, key=lambda m: m.id):
+      if after is None or member.id > after.id:
+        yield member
+
+
+def make_cache(tmp_path):
+  return MemberCache(str(tmp_path / "member_cache.json"))
+
+
+@pytest.mark.asyncio
+async def test_first_start_fetches_everyone_and_saves(tmp_path):
+  # Arrange
+  guild = FakeGuild([FakeMember(10, "ada"), FakeMember(20, "hooter", bot=True), FakeMember(30, "bo")])
+  cache = make_cache(tmp_path)
+
+  # Act
+  members = await cache.refresh(guild)
+  cache.save()
+  reloaded = make_cache(tmp_path)
+  reloaded.load()
+
+  # Assert
+  assert members == {"10": "ada", "30": "bo"}
+  assert guild.fetches == [None]
+  assert reloaded.members(guild.id) == members
+
+
+@pytest.mark.asyncio
+async def test_restart_with_unchanged_count_skips_rest(tmp_path):
+  # Arrange
+  guild = FakeGuild([FakeMember(10, "ada"), FakeMember(30, "bo")])
+  cache = make_cache(tmp_path)
+  await cache.refresh(guild)
+  cache.save()
+  guild.fetches.clear()
+  restarted = make_cache(tmp_path)
+  restarted.load()
+
+  # Act
+  members = await restarted.refresh(guild)
+
+  # Assert
+  assert members == {"10": "ada", "30": "bo"}
+  assert guild.fetches == []
+
+
+@pytest.mark.asyncio
+async def test_restart_fetches_only_newer_members(tmp_path):
+  # Arrange
+  guild = FakeGuild([FakeMember(10, "ada"), FakeMember(30, "bo")])
+  cache = make_cache(tmp_path)
+  await cache.refresh(guild)
+  guild.members.append(FakeMember(40, "cy"))
+  guild.member_count += 1
+  guild.fetches.clear()
+
+  # Act
+  members = await cache.refresh(guild)
+
+  # Assert
+  assert members == {"10": "ada", "30": "bo", "40": "cy"}
+  assert guild.fetches == [30]
+
+
+@pytest.mark.asyncio
+async def test_older_account_joining_triggers_full_fetch(tmp_path):
+  # Arrange
+  guild = FakeGuild([FakeMember(10, "ada"), FakeMember(30, "bo")])
+  cache = make_cache(tmp_path)
+  await cache.refresh(guild)
+  guild.members.append(FakeMember(5, "old-timer"))
+  guild.member_count += 1
+  guild.fetches.clear()
+
+  # Act
+  members = await cache.refresh(guild)
+
+  # Assert
+  assert "5" in members
+  assert guild.fetches == [30, None]
+
+
+@pytest.mark.asyncio
+async def test_chunked_guild_uses_gateway_cache(tmp_path):
+  # Arrange
+  guild = FakeGuild([FakeMember(10, "ada"), FakeMember(30, "bo")], chunked=True)
+  cache = make_cache(tmp_path)
+
+  # Act
+  members = await cache.refresh(guild)
+  cache.add(guild, FakeMember(50, "di"))
+
+  # Assert
+  assert members == {"10": "ada", "30": "bo"}
+  assert guild.fetches == []
+  assert cache.guilds["1"]["member_count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_unchanged_refresh_leaves_cache_clean(tmp_path):
+  # Arrange
+  guild = FakeGuild([FakeMember(10, "ada")])
+  cache = make_cache(tmp_path)
+  await cache.refresh(guild)
+  cache.save()
+
+  # Act
+  await cache.refresh(guild)
+  clean = cache.dirty
+  cache.add(guild, FakeMember(40, "cy"))
+
+  # Assert
+  assert not clean
+  assert cache.dirty
+
+
+@pytest.mark.asyncio
+async def test_old_snapshot_is_refetched_even_with_matching_count(tmp_path):
+  # Arrange: one member left and another joined while the bot was down
+  guild = FakeGuild([FakeMember(10, "ada"), FakeMember(30, "bo")])
+  cache = make_cache(tmp_path)
+  await cache.refresh(guild, now=1000)
+  guild.members = [FakeMember(10, "ada"), FakeMember(5, "old-timer")]
+  guild.fetches.clear()
+
+  # Act
+  recent = await cache.refresh(guild, now=2000)
+  old = await cache.refresh(guild, now=1000 + member_cache.MAX_SNAPSHOT_AGE)
+
+  # Assert
+  assert recent == {"10": "ada", "30": "bo"}
+  assert old == {"10": "ada", "5": "old-timer"}
+  assert guild.fetches == [None]
+
+
+@pytest.mark.asyncio
+async def test_delta_fetch_with_departures_falls_back_to_full_fetch(tmp_path):
+  # Arrange: bo left and cy joined, so the count is unchanged net of the newcomer
+  guild = FakeGuild([FakeMember(10, "ada"), FakeMember(30, "bo")])
+  cache = make_cache(tmp_path)
+  await cache.refresh(guild)
+  guild.members = [FakeMember(10, "ada"), FakeMember(40, "cy"), FakeMember(50, "di")]
+  guild.member_count = 3
+  guild.fetches.clear()
+
+  # Act
+  members = await cache.refresh(guild)
+
+  # Assert
+  assert members == {"10": "ada", "40": "cy", "50": "di"}
+  assert guild.fetches == [30, None]
@@ -0,0 +1,23 @@
+from utils.messages import split_message
+
+
+def test_split_message_breaks_between_lines():
+  # Arrange
+  text = "\n".join(f"line {i:02d}" for i in range(10))
+
+  # Act
+  messages = split_message(text, limit=25)
+
+  # Assert
+  assert all(len(message) <= 25 for message in messages)
+  assert "\n".join(messages) == text
+  assert messages[0] == "line 00\nline 01\nline 02"
+
+
+def test_split_message_shortens_overlong_lines():
+  # Act
+  messages = split_message("short\n" + "x" * 30, limit=10)
+
+  # Assert
+  assert messages == ["short", "x" * 9 + "…"]
+  assert split_message("") == []
@@ -0,0 +1,59 @@
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from scripts.load_test import percentile
+from scripts.openai_stub_server import StubConfig, make_app
+
+
+@pytest.mark.asyncio
+async def test_chat_completions_returns_openai_shaped_body():
+  # Arrange
+  config = StubConfig(latency_median=0, latency_sigma=0, reply="stub answer")
+
+  async with TestClient(TestServer(make_app(config))) as client:
+    # Act
+    response = await client.post("/v1/chat/completions",
+                                 json={"model": "gpt-4o-mini", "messages": []})
+    body = await response.json()
+
+  # Assert
+  assert response.status == 200
+  assert body["choices"][0]["message"] == {"role": "assistant", "content": "stub answer"}
+  assert body["model"] == "gpt-4o-mini"
+
+
+@pytest.mark.asyncio
+async def test_chat_completions_injects_errors():
+  # Arrange
+  config = StubConfig(latency_median=0, latency_sigma=0, error_rate=1.0, error_status=429)
+
+  async with TestClient(TestServer(make_app(config))) as client:
+    # Act
+    response = await client.post("/v1/chat/completions", json={"messages": []})
+    stats = await (await client.get("/stats")).json()
+
+  # Assert
+  assert response.status == 429
+  assert stats == {"requests": 1, "errors": 1, "hangs": 0}
+
+
+@pytest.mark.asyncio
+async def test_chat_completions_streams_chunks():
+  # Arrange
+  config = StubConfig(latency_median=0, latency_sigma=0, reply="one two", stream_chunk_delay=0)
+
+  async with TestClient(TestServer(make_app(config))) as client:
+    # Act
+    response = await client.post("/v1/chat/completions", json={"messages": [], "stream": True})
+    text = await response.text()
+
+  # Assert
+  events = [line for line in text.split("\n\n") if line]
+  assert events[-1] == "data: [DONE]"
+  assert '"content": "one "' in text and '"content": "two "' in text
+
+
+def test_percentile_picks_nearest_rank():
+  assert percentile([], 0.5) == 0.0
+  assert percentile([3, 1, 2, 4], 0.5) == 3
+  assert percentile([3, 1, 2, 4], 1.0) == 4
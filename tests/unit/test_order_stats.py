@@ -0,0 +1,72 @@
+import random
+
+from utils.order_stats import FenwickTree, StreakRanking
+
+
+def test_fenwick_tree_grows_and_finds():
+  # Arrange
+  tree = FenwickTree(size=4)
+
+  # Act
+  for value in (0, 3, 3, 9, 100):
+    tree.add(value, 1)
+
+  # Assert
+  assert tree.size == 128
+  assert tree.prefix(3) == 3
+  assert tree.prefix(1000) == 5
+  assert tree.range_count(3) == 2
+  assert [tree.find(k) for k in range(1, 6)] == [0, 3, 3, 9, 100]
+
+
+def test_ranking_uses_competition_ranks():
+  # Arrange
+  ranking = StreakRanking()
+  ranking.rebuild([("a", 5), ("b", 3), ("c", 3), ("d", 0)])
+
+  # Act
+  ranks = {user_id: ranking.rank(user_id) for user_id in "abcd"}
+
+  # Assert
+  assert ranks == {"a": 1, "b": 2, "c": 2, "d": 4}
+  assert ranking.percentile("a") == 100.0
+  assert ranking.percentile("d") == 0.0
+  assert ranking.neighbors("b") == (("a", 5), ("d", 0))
+  above, below = ranking.neighbors("a")
+  assert above is None
+  assert below in (("b", 3), ("c", 3))
+  assert ranking.rank("missing") is None
+
+
+def test_ranking_tracks_updates():
+  # Arrange
+  ranking = StreakRanking()
+  ranking.rebuild([("a", 5), ("b", 3)])
+
+  # Act
+  ranking.set("b", 7)
+  ranking.set("a", 0)
+  ranking.remove("missing")
+
+  # Assert
+  assert ranking.rank("b") == 1
+  assert ranking.rank("a") == 2
+  assert ranking.neighbors("a") == (("b", 7), None)
+
+
+def test_ranking_matches_sorting():
+  # Arrange
+  rng = random.Random(7)
+  ranking = StreakRanking()
+  values = {}
+  for step in range(2000):
+    user_id = str(rng.randrange(200))
+    values[user_id] = rng.randrange(400)
+    ranking.set(user_id, values[user_id])
+
+  # Act
+  ranks = {user_id: ranking.rank(user_id) for user_id in values}
+
+  # Assert
+  for user_id, value in values.items():
+    assert ranks[user_id] == 1 + sum(other > value for other in values.values())
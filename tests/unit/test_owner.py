@@ -0,0 +1,94 @@
+import asyncio
+import sys
+from unittest.mock import AsyncMock, Mock
+
+import discord
+import pytest
+import pytest_asyncio
+
+from bot.core import HooterBot
+from cogs import owner
+
+
+@pytest_asyncio.fixture
+async def bot():
+  bot = HooterBot(command_prefix='!', intents=discord.Intents.none())
+  # Never logged in, so keep the cogs' background tasks waiting
+  bot.wait_until_ready = asyncio.Event().wait
+  # Loading and reloading replace the cog modules; put back the ones other tests imported
+  modules = {name: module for name, module in sys.modules.items() if name.startswith("cogs.")}
+  yield bot
+  for extension in list(bot.extensions):
+    await bot.unload_extension(extension)
+  sys.modules.update(modules)
+
+
+def test_extension_name_accepts_cog_and_module_names():
+  # Act / Assert
+  assert owner.extension_name("streaks") == "cogs.streaks"
+  assert owner.extension_name("StreaksCog") == "cogs.streaks"
+  assert owner.extension_name("cogs.leetcode") == "cogs.leetcode"
+
+
+@pytest.mark.asyncio
+async def test_cog_check_requires_owner():
+  # Arrange
+  bot = Mock()
+  bot.is_owner = AsyncMock(side_effect=[True, False])
+  cog = owner.OwnerCog(bot)
+
+  # Act / Assert
+  assert await cog.cog_check(Mock())
+  assert not await cog.cog_check(Mock())
+
+
+@pytest.mark.asyncio
+async def test_reload_hands_streak_state_to_new_cog(bot):
+  # Arrange
+  await bot.load_extension("cogs.streaks")
+  previous = bot.get_cog("StreaksCog")
+  streaks_data = {"42": previous.new_user_data("Alice")}
+  previous._streaks = streaks_data
+  cog = owner.OwnerCog(bot)
+  ctx = AsyncMock()
+
+  # Act
+  await cog.reload.callback(cog, ctx, "streaks")
+
+  # Assert
+  current = bot.get_cog("StreaksCog")
+  assert current is not previous
+  assert current._streaks is streaks_data
+  assert current.rollover is previous.rollover
+  assert bot.handover == {}
+  assert ctx.send.call_args[0][0].startswith("Reloaded cogs.streaks in ")
+
+
+@pytest.mark.asyncio
+async def test_reload_keeps_leetcode_cache(bot, tmp_path, monkeypatch):
+  # Arrange
+  monkeypatch.chdir(tmp_path)
+  await bot.load_extension("cogs.leetcode")
+  previous = bot.get_cog("LeetCodeCog")
+  previous.cache.register("42", "knownuser")
+  cog = owner.OwnerCog(bot)
+
+  # Act
+  await cog.reload.callback(cog, AsyncMock(), "leetcode")
+
+  # Assert
+  assert bot.get_cog("LeetCodeCog").cache is previous.cache
+
+
+@pytest.mark.asyncio
+async def test_reload_unknown_cog_lists_loaded_cogs(bot):
+  # Arrange
+  await bot.load_extension("cogs.admin")
+  cog = owner.OwnerCog(bot)
+  ctx = AsyncMock()
+
+  # Act
+  await cog.reload.callback(cog, ctx, "nope")
+
+  # Assert
+  ctx.send.assert_awaited_once_with("There's no loaded cog called nope. Loaded cogs: admin.")
@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta
+
+import pytz
+
+from domain.presence import PresenceIndex, format_occupants
+
+
+NOW = datetime(2024, 3, 1, 12, tzinfo=pytz.utc)
+
+
+def test_update_tracks_joins_moves_and_leaves():
+  # Arrange
+  index = PresenceIndex()
+
+  # Act
+  index.update("1", "Ada", None, 10, NOW)
+  index.update("2", "Bo", None, 10, NOW + timedelta(minutes=1))
+  index.update("1", "Ada", 10, 10, NOW + timedelta(minutes=2))
+  index.update("2", "Bo", 10, 20, NOW + timedelta(minutes=3))
+  index.update("3", "Cy", None, 10, NOW + timedelta(minutes=4))
+  index.update("1", "Ada", 10, None, NOW + timedelta(minutes=5))
+
+  # Assert
+  assert [p.name for p in index.occupants(10)] == ["Cy"]
+  assert index.occupants(20)[0].joined_at == NOW + timedelta(minutes=3)
+  assert index.channel_of("1") is None
+  assert len(index) == 2
+  assert index.leave("1") is None
+
+
+def test_format_occupants_flags_progress_to_minimum():
+  # Arrange
+  index = PresenceIndex()
+  index.join(10, "1", "Ada", NOW - timedelta(minutes=40))
+  index.join(10, "2", "Bo", NOW - timedelta(minutes=22))
+  index.join(10, "3", "Cy", NOW - timedelta(minutes=3))
+
+  # Act
+  message = format_occupants(index.occupants(10), NOW, 25)
+
+  # Assert
+  assert message == ("**Studying now (3):**\n"
+                     "Ada: 40 min ✅\n"
+                     "Bo: 22 min, almost there (3 to go) ⏳\n"
+                     "Cy: 3 min (22 to go)")
+  assert format_occupants([], NOW, 25).startswith("Nobody is studying")
@@ -0,0 +1,91 @@
+import pytest
+
+from services.rate_limit import Quota, QuotaLimiter, TokenBucket, slow_down_message
+
+
+class FakeClock:
+  def __init__(self):
+    self.now = 0.0
+
+  def __call__(self):
+    return self.now
+
+
+def make_limiter(clock, user=(2, 1000), channel=(3, 1000), global_=(10, 1000)):
+  return QuotaLimiter(Quota(*user), Quota(*channel), Quota(*global_), clock=clock)
+
+
+def test_token_bucket_refills_up_to_capacity():
+  # Arrange
+  clock = FakeClock()
+  bucket = TokenBucket(capacity=2, rate=1, clock=clock)
+
+  # Act
+  bucket.take(2)
+  empty_wait = bucket.retry_after(1)
+  clock.now = 10
+
+  # Assert
+  assert empty_wait == pytest.approx(1.0)
+  assert bucket.level == 2
+  assert bucket.full
+
+
+def test_user_quota_limits_only_that_user():
+  # Arrange
+  clock = FakeClock()
+  limiter = make_limiter(clock)
+
+  # Act
+  results = [limiter.acquire("alice", "general", 10) for _ in range(3)]
+  other = limiter.acquire("bob", "study", 10)
+
+  # Assert
+  assert results[:2] == [None, None]
+  assert results[2][0] == "user"
+  assert results[2][1] == pytest.approx(30.0)
+  assert other is None
+
+
+def test_limited_request_consumes_nothing():
+  # Arrange
+  clock = FakeClock()
+  limiter = make_limiter(clock, user=(10, 1000), channel=(1, 1000))
+  assert limiter.acquire("alice", "general", 10) is None
+
+  # Act
+  limited = limiter.acquire("bob", "general", 10)
+  snapshot = limiter.snapshot()
+
+  # Assert
+  assert limited[0] == "channel"
+  bob = next(entry for entry in snapshot["users"] if entry["id"] == "bob")
+  assert bob["requests"] == 10
+  assert snapshot["limited"]["channel"] == 1
+
+
+def test_token_budget_limits_large_requests():
+  # Arrange
+  clock = FakeClock()
+  limiter = make_limiter(clock, user=(100, 600))
+
+  # Act
+  first = limiter.acquire("alice", "general", 500)
+  second = limiter.acquire("alice", "general", 500)
+  clock.now = 60
+  third = limiter.acquire("alice", "general", 500)
+
+  # Assert
+  assert first is None
+  assert second[0] == "user"
+  assert third is None
+
+
+def test_slow_down_message_names_the_scope():
+  # Act
+  user = slow_down_message("user", 12.2)
+  channel = slow_down_message("channel", 0.1)
+
+  # Assert
+  assert "slow down" in user and "13 seconds" in user
+  assert "this channel" in channel and "1 seconds" in channel
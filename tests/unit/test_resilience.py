@@ -0,0 +1,146 @@
+from unittest.mock import patch
+
+import pytest
+
+from services.resilience import (CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError,
+                                 ResilientModel, ResponseCache, backoff_delay)
+from services.router import FALLBACK_RESPONSE, Provider, ProviderRouter
+
+
+class FlakyModel:
+  def __init__(self, failures):
+    self.failures = failures
+    self.calls = 0
+    self.timeouts = []
+
+  def complete(self, user_message, history=None, timeout=None):
+    self.calls += 1
+    self.timeouts.append(timeout)
+    if self.calls <= self.failures:
+      raise TimeoutError("slow provider")
+    return "answer"
+
+
+def test_breaker_opens_after_threshold_and_half_opens_after_timeout():
+  # Arrange
+  breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=10)
+
+  with patch('services.resilience.time.monotonic', return_value=100.0):
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+
+    # Assert
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+  with patch('services.resilience.time.monotonic', return_value=111.0):
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()  # only one trial call at a time
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+
+def test_backoff_delay_is_capped():
+  for attempt in range(10):
+    assert 0 <= backoff_delay(attempt, base=0.5, cap=2.0) <= 2.0
+
+
+def test_resilient_model_retries_transient_failures():
+  # Arrange
+  model = FlakyModel(failures=2)
+  resilient = ResilientModel(model, "flaky", deadline=5, max_retries=2, backoff_base=0.001)
+
+  # Act
+  response = resilient.complete("hi")
+
+  # Assert
+  assert response == "answer"
+  assert model.calls == 3
+  assert all(timeout <= 5 for timeout in model.timeouts)
+  assert resilient.breaker.state == CLOSED
+
+
+def test_resilient_model_fails_fast_when_breaker_open():
+  # Arrange
+  model = FlakyModel(failures=100)
+  breaker = CircuitBreaker("flaky", failure_threshold=2, reset_timeout=60)
+  resilient = ResilientModel(model, "flaky", max_retries=2, backoff_base=0.001, breaker=breaker)
+
+  # Act
+  for _ in range(2):
+    with pytest.raises(TimeoutError):
+      resilient.complete("hi")
+  with pytest.raises(CircuitOpenError):
+    resilient.complete("hi")
+
+  # Assert
+  assert model.calls == 6
+  assert breaker.snapshot()["state"] == OPEN
+
+
+def test_resilient_model_counts_one_failure_per_call():
+  # Arrange
+  model = FlakyModel(failures=100)
+  breaker = CircuitBreaker("flaky", failure_threshold=3, reset_timeout=60)
+  resilient = ResilientModel(model, "flaky", max_retries=4, backoff_base=0.001, breaker=breaker)
+
+  # Act
+  with pytest.raises(TimeoutError):
+    resilient.complete("hi")
+
+  # Assert
+  assert model.calls == 5
+  assert breaker.snapshot() == {"state": CLOSED, "consecutive_failures": 1, "seconds_open": 0.0}
+
+
+def test_resilient_model_disables_client_retries():
+  # Arrange
+  model = FlakyModel(failures=0)
+  model.max_retries = 2
+
+  # Act
+  ResilientModel(model, "flaky")
+
+  # Assert
+  assert model.max_retries == 0
+
+
+def test_response_cache_normalizes_questions():
+  # Arrange
+  cache = ResponseCache(max_entries=1)
+  cache.put("What is  Big O?", "answer")
+
+  # Act / Assert
+  assert cache.get("what is big o?") == "answer"
+  cache.put("another", "other")
+  assert cache.get("what is big o?") is None
+
+
+def test_response_cache_keys_on_conversation_history():
+  # Arrange
+  cache = ResponseCache()
+  history = [{"role": "user", "content": "Let's talk about heaps."},
+             {"role": "assistant", "content": "Sure!"}]
+  cache.put("Why is it faster?", "because of the heap", history)
+
+  # Act / Assert
+  assert cache.get("why is it faster?", history) == "because of the heap"
+  assert cache.get("why is it faster?") is None
+  assert cache.get("why is it faster?", history[:1]) is None
+
+
+@pytest.mark.asyncio
+async def test_router_serves_cached_answer_while_breakers_open():
+  # Arrange
+  breaker = CircuitBreaker("down", failure_threshold=1, reset_timeout=60)
+  resilient = ResilientModel(FlakyModel(failures=0), "down", breaker=breaker)
+  router = ProviderRouter([Provider("down", resilient)])
+  assert await router.generate_response("What is Big O?") == "answer"
+  breaker.record_failure()
+
+  # Act / Assert
+  assert await router.generate_response("what is big o?") == "answer"
+  assert await router.generate_response("something new") == FALLBACK_RESPONSE
+  assert router.snapshot()["down"]["breaker"]["state"] == OPEN
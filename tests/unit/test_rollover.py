@@ -0,0 +1,64 @@
+from datetime import date, datetime, timedelta
+
+import pytz
+
+from utils.rollover import RolloverScheduler, get_timezone, local_date, streak_expiry
+
+
+def test_streak_expiry_is_local_midnight_two_days_later():
+  # Arrange
+  tz = pytz.timezone("Asia/Tokyo")
+
+  # Act
+  expiry = streak_expiry(date(2024, 3, 1), tz)
+
+  # Assert
+  assert expiry == tz.localize(datetime(2024, 3, 3))
+
+
+def test_local_date_uses_user_timezone():
+  # Arrange
+  moment = pytz.utc.localize(datetime(2024, 3, 1, 23, 30))
+
+  # Act / Assert
+  assert local_date(moment, pytz.timezone("Europe/Berlin")) == date(2024, 3, 2)
+  assert local_date(moment, pytz.timezone("US/Pacific")) == date(2024, 3, 1)
+
+
+def test_get_timezone_unknown_falls_back_to_default():
+  assert get_timezone("Not/AZone").zone == "US/Pacific"
+  assert get_timezone(None).zone == "US/Pacific"
+
+
+def test_pop_due_returns_only_expired_users():
+  # Arrange
+  scheduler = RolloverScheduler()
+  now = pytz.utc.localize(datetime(2024, 3, 1, 12))
+  scheduler.schedule("early", now - timedelta(minutes=1))
+  scheduler.schedule("late", now + timedelta(hours=1))
+
+  # Act
+  due = scheduler.pop_due(now)
+
+  # Assert
+  assert due == ["early"]
+  assert "early" not in scheduler
+  assert "late" in scheduler
+
+
+def test_pop_due_skips_rescheduled_and_cancelled_entries():
+  # Arrange
+  scheduler = RolloverScheduler()
+  now = pytz.utc.localize(datetime(2024, 3, 1, 12))
+  scheduler.schedule("moved", now - timedelta(minutes=5))
+  scheduler.schedule("moved", now + timedelta(days=1))
+  scheduler.schedule("cancelled", now - timedelta(minutes=5))
+  scheduler.cancel("cancelled")
+
+  # Act
+  due = scheduler.pop_due(now)
+
+  # Assert
+  assert due == []
+  assert len(scheduler) == 1
+  assert scheduler.next_deadline() == (now + timedelta(days=1)).timestamp()
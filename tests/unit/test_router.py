@@ -0,0 +1,115 @@
+import asyncio
+import time
+
+import pytest
+
+from services.router import FALLBACK_RESPONSE, Provider, ProviderRouter
+
+
+class FakeModel:
+  def __init__(self, answer, delay=0.0, fail=False, relative_cost=1.0):
+    self.answer = answer
+    self.delay = delay
+    self.fail = fail
+    self.relative_cost = relative_cost
+    self.calls = 0
+
+  def complete(self, user_message, history=None):
+    self.calls += 1
+    time.sleep(self.delay)
+    if self.fail:
+      raise RuntimeError("provider down")
+    return self.answer
+
+
+def test_rank_routes_short_questions_to_cheapest_provider():
+  # Arrange
+  expensive = Provider("expensive", FakeModel("a", relative_cost=3.0))
+  cheap = Provider("cheap", FakeModel("b", relative_cost=1.0))
+  router = ProviderRouter([expensive, cheap], short_question_chars=20)
+
+  # Act / Assert
+  assert router.rank("short?")[0] is cheap
+
+
+def test_rank_routes_long_questions_to_fastest_provider():
+  # Arrange
+  slow = Provider("slow", FakeModel("a", relative_cost=1.0))
+  fast = Provider("fast", FakeModel("b", relative_cost=3.0))
+  for _ in range(5):
+    slow.stats.record(3.0, True)
+    fast.stats.record(0.5, True)
+  router = ProviderRouter([slow, fast], short_question_chars=5)
+
+  # Act / Assert
+  assert router.rank("a much longer question")[0] is fast
+
+
+def test_rank_demotes_failing_provider():
+  # Arrange
+  failing = Provider("failing", FakeModel("a", relative_cost=0.5))
+  healthy = Provider("healthy", FakeModel("b", relative_cost=2.0))
+  for _ in range(5):
+    failing.stats.record(0.1, False)
+
+  # Act
+  order = ProviderRouter([failing, healthy]).rank("hi")
+
+  # Assert
+  assert [p.name for p in order] == ["healthy", "failing"]
+
+
+@pytest.mark.asyncio
+async def test_generate_response_hedges_slow_provider():
+  # Arrange
+  slow = Provider("slow", FakeModel("slow answer", delay=0.5, relative_cost=1.0))
+  fast = Provider("fast", FakeModel("fast answer", relative_cost=2.0))
+  router = ProviderRouter([slow, fast], default_deadline=0.05)
+
+  # Act
+  response = await router.generate_response("hi")
+
+  # Assert
+  assert response == "fast answer"
+  assert fast.model.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_generate_response_caps_running_hedges():
+  # Arrange
+  slow = Provider("slow", FakeModel("slow answer", delay=0.3, relative_cost=1.0))
+  backup = Provider("backup", FakeModel("backup answer", delay=0.5, relative_cost=2.0))
+  router = ProviderRouter([slow, backup], default_deadline=0.05, max_hedges=1)
+
+  # Act
+  responses = await asyncio.gather(router.generate_response("hi"), router.generate_response("hi"))
+  await asyncio.sleep(0.4)
+
+  # Assert
+  assert responses == ["slow answer", "slow answer"]
+  assert backup.model.calls == 1
+  assert router._hedge_slots.acquire(blocking=False)
+
+
+@pytest.mark.asyncio
+async def test_generate_response_falls_back_after_failure():
+  # Arrange
+  down = Provider("down", FakeModel("", fail=True, relative_cost=1.0))
+  up = Provider("up", FakeModel("answer", relative_cost=2.0))
+  router = ProviderRouter([down, up])
+
+  # Act
+  response = await router.generate_response("hi")
+
+  # Assert
+  assert response == "answer"
+  assert down.stats.error_rate == 1.0
+
+
+@pytest.mark.asyncio
+async def test_generate_response_apologizes_when_all_providers_fail():
+  # Arrange
+  router = ProviderRouter([Provider("down", FakeModel("", fail=True))])
+
+  # Act / Assert
+  assert await router.generate_response("hi") == FALLBACK_RESPONSE
@@ -0,0 +1,175 @@
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+import pytz
+
+from domain.streak_data import UserStreak
+from services import session_log, streak_backfill
+from services.streak_backfill import (StreakRules, apply_streaks, diff_streaks,
+                                      local_epoch_days, main, no_streak, recompute_streaks)
+
+
+PACIFIC = pytz.timezone("US/Pacific")
+
+
+def session(user_id, day, minutes=30, hour=20, tz=PACIFIC):
+  start = tz.localize(datetime.combine(day, datetime.min.time()) + timedelta(hours=hour))
+  return user_id, int(start.timestamp()), int((start + timedelta(minutes=minutes)).timestamp())
+
+
+def arrays(sessions):
+  user_ids, starts, ends = zip(*sessions)
+  return np.array(user_ids, dtype=np.int64), np.array(starts), np.array(ends)
+
+
+def test_local_epoch_days_respects_timezone():
+  # Arrange: 2024-03-02 06:30 UTC is still March 1st in Pacific time
+  timestamp = int(pytz.utc.localize(datetime(2024, 3, 2, 6, 30)).timestamp())
+
+  # Act
+  pacific = local_epoch_days(np.array([timestamp]), PACIFIC)[0]
+  utc = local_epoch_days(np.array([timestamp]), pytz.utc)[0]
+
+  # Assert
+  assert date(1970, 1, 1) + timedelta(days=int(pacific)) == date(2024, 3, 1)
+  assert utc == pacific + 1
+
+
+def test_recompute_streaks_finds_current_and_longest_runs():
+  # Arrange
+  start = date(2024, 1, 1)
+  sessions = [session(1, start + timedelta(days=i)) for i in range(5)]        # 5-day run
+  sessions += [session(1, start + timedelta(days=i)) for i in (8, 9)]          # current 2-day run
+  sessions += [session(1, start + timedelta(days=9), hour=21)]                 # same day twice
+  sessions += [session(2, start + timedelta(days=i)) for i in (0, 1, 2)]       # broken streak
+  sessions += [session(3, start + timedelta(days=9), minutes=10)]              # too short
+  now = PACIFIC.localize(datetime(2024, 1, 11, 9))
+
+  # Act
+  result = recompute_streaks(*arrays(sessions), {}, now, StreakRules(minimum_minutes=25))
+
+  # Assert
+  assert result["1"] == {"current_streak": 2, "longest_streak": 5,
+                         "last_join_date": date(2024, 1, 10)}
+  assert result["2"] == {"current_streak": 0, "longest_streak": 3,
+                         "last_join_date": date(2024, 1, 3)}
+  assert result["3"] == no_streak()
+
+
+def test_recompute_streaks_applies_rule_changes():
+  # Arrange
+  start = date(2024, 1, 1)
+  sessions = [session(1, start + timedelta(days=i), minutes=20) for i in (0, 1, 3, 4)]
+  now = PACIFIC.localize(datetime(2024, 1, 5, 12))
+
+  # Act
+  strict = recompute_streaks(*arrays(sessions), {}, now, StreakRules(minimum_minutes=25))
+  lenient = recompute_streaks(*arrays(sessions), {}, now, StreakRules(minimum_minutes=15, grace_days=1))
+
+  # Assert
+  assert strict == {"1": no_streak()}
+  assert lenient["1"]["current_streak"] == 4
+  assert lenient["1"]["longest_streak"] == 4
+
+
+def test_recompute_streaks_sums_distinct_time_per_local_day():
+  # Arrange
+  start = date(2024, 1, 1)
+  sessions = [session(1, start, minutes=15, hour=9), session(1, start, minutes=15, hour=18)]
+  sessions += [session(2, start, minutes=20, hour=9), session(2, start, minutes=20, hour=9)]   # same time twice
+  sessions += [session(3, start, minutes=40, hour=23)]
+  sessions += [session(4, start, minutes=30, hour=23.75)]                                      # 15 min each side of midnight
+  now = PACIFIC.localize(datetime(2024, 1, 2, 9))
+
+  # Act
+  result = recompute_streaks(*arrays(sessions), {}, now, StreakRules(minimum_minutes=25))
+
+  # Assert
+  assert result["1"]["current_streak"] == 1
+  assert result["2"] == no_streak()
+  assert result["3"]["last_join_date"] == start
+  assert result["4"] == no_streak()
+
+
+def test_diff_and_apply_streaks():
+  # Arrange
+  live = {"1": UserStreak("TestUser", 1, 9)}
+  live["1"].last_join_date = date(2024, 1, 10)
+  recomputed = {"1": {"current_streak": 2, "longest_streak": 5, "last_join_date": date(2024, 1, 10)},
+                "2": {"current_streak": 1, "longest_streak": 1, "last_join_date": date(2024, 1, 10)}}
+
+  # Act
+  changes = diff_streaks(live, recomputed)
+  updated = apply_streaks(live, recomputed, preserve_longest=True)
+
+  # Assert
+  assert changes == [("1", "TestUser", "current_streak", 1, 2),
+                     ("1", "TestUser", "longest_streak", 9, 5)]
+  assert updated == 1
+  assert live["1"].current_streak == 2
+  assert live["1"].longest_streak == 9
+
+
+def test_session_log_round_trip(tmp_path):
+  # Arrange
+  path = str(tmp_path / "sessions.csv")
+  start = pytz.utc.localize(datetime(2024, 1, 1, 12))
+
+  # Act
+  session_log.append_session("42", start, start + timedelta(minutes=30), path)
+  session_log.append_session("43", start, start + timedelta(minutes=5), path)
+  user_ids, starts, ends = session_log.load_sessions(path)
+
+  # Assert
+  assert user_ids.tolist() == [42, 43]
+  assert (ends - starts).tolist() == [1800, 300]
+  assert list(session_log.iter_sessions(path))[0] == ("42", int(start.timestamp()), int(start.timestamp()) + 1800)
+  assert session_log.load_sessions(str(tmp_path / "missing.csv"))[0].size == 0
+
+
+def test_apply_requires_the_bot_to_be_stopped(tmp_path):
+  # Arrange
+  streaks_file = tmp_path / "streaks.json"
+
+  # Act
+  with pytest.raises(SystemExit) as stopped:
+    main(["--streaks", str(streaks_file), "--apply"])
+
+  # Assert
+  assert "--bot-stopped" in str(stopped.value)
+  assert not streaks_file.exists()
+
+
+def test_users_without_counted_days_are_reset():
+  # Arrange
+  live = {"1": UserStreak("Raised", 5, 5), "2": UserStreak("NoHistory", 2, 3)}
+  live["1"].last_join_date = date(2024, 1, 10)
+  sessions = [session(1, date(2024, 1, 10), minutes=30)]
+  now = PACIFIC.localize(datetime(2024, 1, 11, 9))
+  recomputed = recompute_streaks(*arrays(sessions), {}, now, StreakRules(minimum_minutes=60))
+
+  # Act
+  changes = diff_streaks(live, recomputed)
+  updated = apply_streaks(live, recomputed)
+
+  # Assert
+  assert ("1", "Raised", "current_streak", 5, 0) in changes
+  assert ("2", "NoHistory", "longest_streak", 3, 0) in changes
+  assert updated == 2
+  assert (live["1"].current_streak, live["1"].longest_streak, live["1"].last_join_date) == (0, 0, None)
+  assert live["2"].current_streak == 0
+
+
+def test_apply_refuses_to_drop_leetcode_days(tmp_path, monkeypatch):
+  # Arrange
+  monkeypatch.setattr(streak_backfill.core, "LEETCODE_STREAKS", True)
+  streaks_file = tmp_path / "streaks.json"
+
+  # Act
+  with pytest.raises(SystemExit) as stopped:
+    main(["--streaks", str(streaks_file), "--apply", "--bot-stopped"])
+
+  # Assert
+  assert "--drop-leetcode-days" in str(stopped.value)
+  assert not streaks_file.exists()
@@ -0,0 +1,110 @@
+from domain.streak_changes import StreakChangeSet, format_digest
+from domain.streak_data import UserStreak
+
+
+def change(changes, user_id, user, current, longest=None):
+  changes.before(user_id, user)
+  user.current_streak = current
+  user.longest_streak = max(user.longest_streak, current) if longest is None else longest
+  changes.after(user_id, user)
+
+
+def test_changes_collapse_to_net_effect():
+  # Arrange
+  changes = StreakChangeSet()
+  climber = UserStreak("Climber", 2, 4)
+  bouncer = UserStreak("Bouncer", 3, 3)
+
+  # Act
+  change(changes, "1", climber, 3)
+  change(changes, "1", climber, 4)
+  change(changes, "2", bouncer, 0)
+  change(changes, "2", bouncer, 3)
+
+  # Assert
+  result = changes.changes()
+  assert [entry.username for entry in result] == ["Climber"]
+  assert (result[0].current_before, result[0].current_after) == (2, 4)
+
+
+def test_digest_orders_milestones_records_increases_and_resets():
+  # Arrange
+  changes = StreakChangeSet()
+  change(changes, "1", UserStreak("Resetter", 6, 6), 0)
+  change(changes, "2", UserStreak("Climber", 1, 5), 2)
+  change(changes, "3", UserStreak("Recorder", 5, 5), 6)
+  change(changes, "4", UserStreak("Milestoner", 29, 29), 30)
+
+  # Act
+  digest = format_digest(changes.changes())
+
+  # Assert
+  lines = digest.splitlines()
+  assert lines[0] == "**Daily Streak Update:** 4 streaks changed today."
+  assert lines[1] == "🎯 Milestoner reached 30 days!"
+  assert lines[2] == "🏆 Recorder set a new record of 6 days."
+  assert lines[3] == "🔥 Climber: 1 → 2 days"
+  assert lines[4] == "💤 Resetter's streak of 6 days was reset."
+  assert "!board" in lines[-1]
+
+
+def test_digest_truncates_long_lists():
+  # Arrange
+  changes = StreakChangeSet()
+  for user in range(5):
+    change(changes, str(user), UserStreak(f"user{user}", 1, 9), 2)
+
+  # Act
+  digest = format_digest(changes.changes(), max_lines=3)
+
+  # Assert
+  assert "...and 2 more." in digest
+  assert digest.count("🔥") == 3
+
+
+def test_digest_caps_change_lines_by_length():
+  # Arrange
+  changes = StreakChangeSet()
+  for user in range(10):
+    change(changes, str(user), UserStreak(f"user{user}" + "x" * 40, 1, 9), 2)
+
+  # Act
+  digest = format_digest(changes.changes(), max_chars=200)
+
+  # Assert
+  assert digest.count("🔥") == 3
+  assert "...and 7 more." in digest
+
+
+def test_settle_keeps_changes_made_while_posting():
+  # Arrange
+  changes = StreakChangeSet()
+  climber, idle = UserStreak("Climber", 1, 5), UserStreak("Idle", 3, 3)
+  change(changes, "1", climber, 2)
+  change(changes, "2", idle, 4)
+  posted = changes.pending()
+  change(changes, "2", idle, 5)
+
+  # Act
+  changes.settle(posted)
+
+  # Assert
+  [remaining] = changes.changes()
+  assert (remaining.username, remaining.current_before, remaining.current_after) == ("Idle", 4, 5)
+
+
+def test_pending_changes_survive_a_restart(tmp_path):
+  # Arrange
+  path = str(tmp_path / "pending_digest.json")
+  changes = StreakChangeSet(path)
+  change(changes, "1", UserStreak("Climber", 6, 6), 7)
+
+  # Act
+  changes.save()
+  restarted = StreakChangeSet(path)
+  restarted.load()
+
+  # Assert
+  assert not changes.dirty
+  [pending] = restarted.changes()
+  assert (pending.username, pending.current_before, pending.current_after, pending.milestone) == ("Climber", 6, 7, 7)
@@ -0,0 +1,57 @@
+import json
+from datetime import date, datetime
+
+import pytz
+
+from domain.streak_data import FORMAT_VERSION, UserStreak, decode_streaks, encode_streaks
+
+
+def test_user_streak_stores_epoch_integers():
+  # Arrange
+  user = UserStreak("TestUser", 3, 5)
+  joined = pytz.utc.localize(datetime(2024, 3, 1, 20, 15))
+
+  # Act
+  user.last_join_date = date(1970, 1, 11)
+  user.join_time = joined
+
+  # Assert
+  assert user.last_join_day == 10
+  assert user.join_ts == int(joined.timestamp())
+  assert user.last_join_date == date(1970, 1, 11)
+  assert user.join_time == joined
+  assert not hasattr(user, "__dict__")
+
+
+def test_encode_decode_round_trip():
+  # Arrange
+  user = UserStreak("TestUser", 3, 5, timezone="Europe/Berlin")
+  user.last_join_date = date(2024, 3, 1)
+  streaks_data = {"1": user, "2": UserStreak("Other")}
+
+  # Act
+  text = encode_streaks(streaks_data)
+
+  # Assert
+  assert json.loads(text)["version"] == FORMAT_VERSION
+  assert decode_streaks(text) == streaks_data
+
+
+def test_decode_reads_legacy_format():
+  # Arrange
+  legacy = json.dumps({"1": {
+    "username": "TestUser",
+    "current_streak": 2,
+    "longest_streak": 4,
+    "last_join_date": "2024-03-01",
+    "join_time": "2024-03-02T20:00:00-08:00",
+  }})
+
+  # Act
+  user = decode_streaks(legacy)["1"]
+
+  # Assert
+  assert user.current_streak == 2
+  assert user.last_join_date == date(2024, 3, 1)
+  assert user.join_time == pytz.utc.localize(datetime(2024, 3, 3, 4))
+  assert user.timezone is None
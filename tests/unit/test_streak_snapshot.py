@@ -0,0 +1,88 @@
+from domain.streak_data import UserStreak
+from domain.streak_snapshot import StreakSnapshot, write_snapshot
+
+
+def make_streaks(count):
+  return {str(10**17 + user): UserStreak(f"user{user}", user % 7, user % 11, 19700 + user, None,
+                                         "Europe/Berlin" if user % 2 else None)
+          for user in range(count)}
+
+
+def test_snapshot_reads_single_records(tmp_path):
+  # Arrange
+  path = str(tmp_path / "streaks.bin")
+  streaks_data = make_streaks(500)
+  streaks_data["42"] = UserStreak("Hööter 🦉", 3, 5, None, 1700000000)
+  write_snapshot(path, streaks_data)
+  snapshot = StreakSnapshot(path)
+
+  # Act
+  records = {user_id: snapshot.get(user_id) for user_id in streaks_data}
+
+  # Assert
+  assert records == streaks_data
+  assert snapshot.get("7") is None
+  assert len(snapshot) == 501
+
+
+def test_snapshot_remaps_replaced_file(tmp_path):
+  # Arrange
+  path = str(tmp_path / "streaks.bin")
+  write_snapshot(path, {"1": UserStreak("TestUser", 1, 1)})
+  snapshot = StreakSnapshot(path)
+  assert snapshot.get("1").current_streak == 1
+
+  # Act
+  write_snapshot(path, {"1": UserStreak("TestUser", 2, 2), "2": UserStreak("Other")})
+
+  # Assert
+  assert snapshot.get("1").current_streak == 2
+  assert snapshot.get("2").username == "Other"
+
+
+def test_snapshot_missing_or_malformed_file(tmp_path):
+  # Arrange
+  path = tmp_path / "streaks.bin"
+  snapshot = StreakSnapshot(str(path))
+
+  # Act
+  missing = snapshot.get("1")
+  path.write_bytes(b"not a snapshot at all")
+
+  # Assert
+  assert missing is None
+  assert not snapshot.available
+  assert snapshot.get("1") is None
+
+
+def test_snapshot_truncated_or_empty_file(tmp_path):
+  # Arrange
+  path = tmp_path / "streaks.bin"
+  write_snapshot(str(path), make_streaks(5))
+  snapshot = StreakSnapshot(str(path))
+
+  # Act
+  path.write_bytes(path.read_bytes()[:6])
+  truncated = snapshot.get(str(10**17))
+  path.write_bytes(b"")
+  empty = snapshot.get(str(10**17))
+
+  # Assert
+  assert truncated is None
+  assert empty is None
+  assert not snapshot.available
+  assert list(snapshot.items()) == []
+
+
+def test_snapshot_items_streams_every_record(tmp_path):
+  # Arrange
+  path = str(tmp_path / "streaks.bin")
+  streaks_data = make_streaks(50)
+  write_snapshot(path, streaks_data)
+
+  # Act
+  records = dict(StreakSnapshot(path).items())
+
+  # Assert
+  assert records == streaks_data
+  assert list(StreakSnapshot(str(tmp_path / "missing.bin")).items()) == []
@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, Mock, MagicMock, patch
 
@@ -6,6 +7,9 @@ from discord import Member, VoiceState
 
 from bot import core
 from cogs import streaks
+from domain import streak_changes
+from domain.streak_data import UserStreak
+from services import session_log, study_ledger
 
 
 @pytest.fixture
@@ -13,8 +17,17 @@ def bot():
   return Mock()
 
 
+def make_user(username, current_streak, longest_streak, last_join_date=None, timezone=None):
+  user = UserStreak(username, current_streak, longest_streak, timezone=timezone)
+  user.last_join_date = last_join_date
+  return user
+
+
 @pytest.fixture
-def cog(bot):
+def cog(bot, tmp_path, monkeypatch):
+  monkeypatch.setattr(session_log, "SESSIONS_FILE", str(tmp_path / "sessions.csv"))
+  monkeypatch.setattr(study_ledger, "STUDY_TIME_FILE", str(tmp_path / "study_time.json"))
+  monkeypatch.setattr(streak_changes, "PENDING_DIGEST_FILE", str(tmp_path / "pending_digest.json"))
   return streaks.StreaksCog(bot)
 
 
@@ -58,14 +71,93 @@ async def test_daily_streak_update(cog):
   cog.bot = MagicMock()
   channel = AsyncMock()
   cog.bot.get_channel.return_value = channel
-  cog.list_all_streaks = AsyncMock()
+  cog.post_digest = AsyncMock()
 
   # Act
   await cog.daily_streak_update()
 
   # Assert
   cog.bot.get_channel.assert_called_once_with(core.GENERAL_CHANNEL_ID)
-  cog.list_all_streaks.assert_called_once_with(channel)
+  cog.post_digest.assert_called_once_with(channel)
+
+
+@pytest.mark.asyncio
+async def test_post_digest_reports_only_changed_streaks(cog):
+  # Arrange
+  yesterday = datetime(2024, 3, 1)
+  streaks_data = {
+    "1": make_user("Climber", 6, 6, yesterday.date()),
+    "2": make_user("Idle", 3, 5, yesterday.date()),
+  }
+  channel = AsyncMock()
+  with patch.object(cog, 'load_streaks', return_value=streaks_data), \
+      patch.object(cog, 'save_streaks', return_value=True):
+    cog.update_streak("1", "Climber", streaks.PST.localize(yesterday + timedelta(days=1, hours=12)))
+
+  # Act
+  await cog.post_digest(channel)
+  await cog.post_digest(channel)
+
+  # Assert
+  channel.send.assert_called_once()
+  digest = channel.send.call_args[0][0]
+  assert "Climber reached 7 days!" in digest
+  assert "Idle" not in digest
+  assert "1 streaks changed" in digest
+
+
+@pytest.mark.asyncio
+async def test_failed_digest_send_keeps_changes(cog):
+  # Arrange
+  yesterday = datetime(2024, 3, 1)
+  streaks_data = {"1": make_user("Climber", 6, 6, yesterday.date())}
+  channel = AsyncMock()
+  channel.send.side_effect = [RuntimeError("rate limited"), None]
+  with patch.object(cog, 'load_streaks', return_value=streaks_data), \
+      patch.object(cog, 'save_streaks', return_value=True):
+    cog.update_streak("1", "Climber", streaks.PST.localize(yesterday + timedelta(days=1, hours=12)))
+
+  # Act
+  with pytest.raises(RuntimeError):
+    await cog.post_digest(channel)
+  await cog.post_digest(channel)
+
+  # Assert
+  assert "Climber reached 7 days!" in channel.send.call_args[0][0]
+  assert len(cog.changes) == 0
+
+
+@pytest.mark.asyncio
+async def test_board_splits_large_servers_into_messages(cog):
+  # Arrange
+  ctx = AsyncMock()
+  streaks_data = {str(i): make_user(f"member_with_a_long_name_{i:04d}", i % 30, 30) for i in range(200)}
+
+  # Act
+  with patch.object(cog, 'load_streaks', return_value=streaks_data):
+    await cog.board.callback(cog, ctx)
+
+  # Assert
+  sent = [call[0][0] for call in ctx.send.call_args_list]
+  assert len(sent) > 1
+  assert all(len(message) <= 2000 for message in sent)
+  assert sum(message.count(" days") for message in sent) == 200
+
+
+@pytest.mark.asyncio
+async def test_board_command_lists_all_streaks(cog):
+  # Arrange
+  ctx = AsyncMock()
+  streaks_data = {"1": make_user("Climber", 6, 6), "2": make_user("Idle", 3, 5)}
+
+  # Act
+  with patch.object(cog, 'load_streaks', return_value=streaks_data):
+    await cog.board.callback(cog, ctx)
+
+  # Assert
+  board = ctx.send.call_args[0][0]
+  assert "Climber: 6 days" in board
+  assert "Idle: 3 days" in board
 
 
 @pytest.mark.asyncio
@@ -201,13 +293,7 @@ async def test_increment_streak_next_day(cog):
 
   # Mock initial streak data
   initial_streak_data = {
-    user_id: {
-      "username": username,
-      "current_streak": 1,
-      "longest_streak": 1,
-      "last_join_date": (datetime.now() - timedelta(days=1)).date(),
-      "join_time": None
-    }
+    user_id: make_user(username, 1, 1, (datetime.now() - timedelta(days=1)).date())
   }
 
   # Mock member and channel
@@ -237,10 +323,10 @@ async def test_increment_streak_next_day(cog):
     # Assert
     mock_save.assert_called()
     saved_data = mock_save.call_args[0][0]
-    assert saved_data[user_id]["current_streak"] == 2
-    assert saved_data[user_id]["longest_streak"] == 2
-    assert saved_data[user_id]["last_join_date"] == leave_time.date()
-    assert saved_data[user_id]["join_time"] is None
+    assert saved_data[user_id].current_streak == 2
+    assert saved_data[user_id].longest_streak == 2
+    assert saved_data[user_id].last_join_date == leave_time.date()
+    assert saved_data[user_id].join_time is None
 
 
 @pytest.mark.asyncio
@@ -251,13 +337,7 @@ async def test_reset_streak_after_two_days(cog):
 
   # Mock initial streak data
   initial_streak_data = {
-    user_id: {
-      "username": username,
-      "current_streak": 5,
-      "longest_streak": 10,
-      "last_join_date": (datetime.now() - timedelta(days=2)).date(),
-      "join_time": None
-    }
+    user_id: make_user(username, 5, 10, (datetime.now() - timedelta(days=2)).date())
   }
 
   # Mock member and channel
@@ -287,10 +367,10 @@ async def test_reset_streak_after_two_days(cog):
     # Assert
     mock_save.assert_called()
     saved_data = mock_save.call_args[0][0]
-    assert saved_data[user_id]["current_streak"] == 1
-    assert saved_data[user_id]["longest_streak"] == 10
-    assert saved_data[user_id]["last_join_date"] == leave_time.date()
-    assert saved_data[user_id]["join_time"] is None
+    assert saved_data[user_id].current_streak == 1
+    assert saved_data[user_id].longest_streak == 10
+    assert saved_data[user_id].last_join_date == leave_time.date()
+    assert saved_data[user_id].join_time is None
 
 @pytest.mark.asyncio
 async def test_multiple_joins_in_one_day(cog):
@@ -300,13 +380,7 @@ async def test_multiple_joins_in_one_day(cog):
 
   # Mock initial streak data
   initial_streak_data = {
-    user_id: {
-      "username": username,
-      "current_streak": 1,
-      "longest_streak": 1,
-      "last_join_date": (datetime.now() - timedelta(days=1)).date(),
-      "join_time": None
-    }
+    user_id: make_user(username, 1, 1, (datetime.now() - timedelta(days=1)).date())
   }
 
   # Mock member and channel
@@ -341,8 +415,415 @@ async def test_multiple_joins_in_one_day(cog):
     # Assert
     mock_save.assert_called()
     saved_data = mock_save.call_args[0][0]
-    assert saved_data[user_id][
-             "current_streak"] == 2  # Streak should only increment once
-    assert saved_data[user_id]["longest_streak"] == 2
-    assert saved_data[user_id]["last_join_date"] == leave_time2.date()
-    assert saved_data[user_id]["join_time"] is None
+    assert saved_data[user_id].current_streak == 2  # Streak should only increment once
+    assert saved_data[user_id].longest_streak == 2
+    assert saved_data[user_id].last_join_date == leave_time2.date()
+    assert saved_data[user_id].join_time is None
+
+
+@pytest.mark.asyncio
+async def test_short_sessions_add_up_to_the_daily_minimum(cog):
+  # Arrange
+  user_id = "12345"
+  streaks_data = {user_id: make_user("TestUser", 1, 1, datetime(2024, 2, 29).date())}
+  member = AsyncMock(spec=Member)
+  member.id = user_id
+  member.name = "TestUser"
+  channel = AsyncMock()
+  starts = [streaks.PST.localize(datetime(2024, 3, 1, hour)) for hour in (9, 12, 18)]
+
+  # Act
+  with patch.object(cog, 'load_streaks', return_value=streaks_data), \
+      patch.object(cog, 'save_streaks', return_value=True):
+    for start in starts:
+      cog.handle_join(user_id, "TestUser", start)
+      await cog.handle_leave(user_id, "TestUser", 30, member, channel, start + timedelta(minutes=10))
+
+  # Assert
+  assert streaks_data[user_id].current_streak == 2
+  assert streaks_data[user_id].last_join_date == datetime(2024, 3, 1).date()
+  messages = [call[0][0] for call in channel.send.call_args_list]
+  assert "10 of your 30 minutes" in messages[0]
+  assert "20 of your 30 minutes" in messages[1]
+  assert cog.ledger.get(user_id).total() == 30 * 60
+
+
+@pytest.mark.asyncio
+async def test_join_arms_credit_timer_for_remaining_minutes(cog):
+  # Arrange
+  user_id = "12345"
+  streaks_data = {user_id: make_user("TestUser", 0, 0)}
+  member = Mock(spec=Member)
+  member.id = user_id
+  now = streaks.PST.localize(datetime(2024, 3, 1, 9))
+  cog.ledger.record(user_id, now - timedelta(minutes=50), now - timedelta(minutes=30), streaks.PST)
+
+  # Act
+  with patch.object(cog, 'load_streaks', return_value=streaks_data), \
+      patch.object(cog, 'save_streaks', return_value=True):
+    cog.handle_join(user_id, "TestUser", now)
+    cog.schedule_credit(member, AsyncMock(), now, 30)
+
+  # Assert
+  timer = cog.credit_timers[user_id]
+  assert timer.when() - asyncio.get_running_loop().time() == pytest.approx(10 * 60, abs=5)
+  cog.cancel_credit(user_id)
+  assert user_id not in cog.credit_timers
+  assert timer.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_credit_open_session_credits_while_still_studying(cog):
+  # Arrange
+  user_id = "12345"
+  streaks_data = {user_id: make_user("TestUser", 3, 3, datetime(2024, 2, 29).date())}
+  member = Mock(spec=Member)
+  member.id = user_id
+  member.name = "TestUser"
+  channel = AsyncMock()
+  joined = streaks.PST.localize(datetime(2024, 3, 1, 9))
+
+  # Act
+  with patch.object(cog, 'load_streaks', return_value=streaks_data), \
+      patch.object(cog, 'save_streaks', return_value=True), \
+      patch('cogs.streaks.datetime') as mock_datetime:
+    cog.handle_join(user_id, "TestUser", joined)
+    mock_datetime.now.return_value = joined + timedelta(minutes=30)
+    await cog.credit_open_session(member, channel, 30)
+
+  # Assert
+  assert streaks_data[user_id].current_streak == 4
+  assert streaks_data[user_id].join_time is not None
+  channel.send.assert_called()
+  # Today is done, so the next timer is for tomorrow's minutes
+  assert user_id in cog.credit_timers
+  cog.cancel_credit(user_id)
+
+
+@pytest.mark.asyncio
+async def test_mute_in_study_room_keeps_open_session(cog):
+  # Arrange
+  study = Mock()
+  study.id = core.STUDY_CHANNEL_ID
+  member = Mock(spec=Member)
+  member.id, member.name = 42, "Alice"
+  joined = streaks.PST.localize(datetime(2024, 3, 1, 9))
+  streaks_data = {"42": make_user("Alice", 0, 0)}
+  streaks_data["42"].join_time = joined
+
+  # Act
+  with patch.object(cog, 'load_streaks', return_value=streaks_data), \
+      patch.object(cog, 'save_streaks', return_value=True), \
+      patch('cogs.streaks.datetime') as mock_datetime:
+    mock_datetime.now.return_value = joined + timedelta(minutes=20)
+    await cog.process_streak(member, Mock(channel=study), Mock(channel=study),
+                             core.STUDY_CHANNEL_ID, core.MINIMUM_MINUTES)
+
+  # Assert
+  assert streaks_data["42"].join_time == joined
+  assert "42" not in cog.credit_timers
+
+
+@pytest.mark.asyncio
+async def test_credit_tasks_are_kept_until_done(cog):
+  # Arrange
+  started = asyncio.Event()
+
+  async def credit(member, channel, minimum_minutes):
+    started.set()
+    raise RuntimeError("boom")
+
+  cog.credit_open_session = credit
+
+  # Act
+  cog.start_credit(Mock(), AsyncMock(), 30)
+  task = next(iter(cog.credit_tasks))
+  await asyncio.gather(task, return_exceptions=True)
+
+  # Assert
+  assert started.is_set()
+  assert cog.credit_tasks == set()
+
+
+def test_expire_streaks_resets_broken_streaks(cog):
+  # Arrange
+  now = datetime(2024, 3, 10, 12, tzinfo=streaks.pytz.utc)
+  streaks_data = {
+    "1": make_user("Broken", 4, 4, (now - timedelta(days=3)).date()),
+    "2": make_user("Active", 2, 2, (now - timedelta(days=1)).date()),
+  }
+  for user_id, user_data in streaks_data.items():
+    cog.schedule_rollover(user_id, user_data)
+
+  with patch.object(cog, 'load_streaks', return_value=streaks_data), \
+      patch.object(cog, 'save_streaks') as mock_save:
+    # Act
+    expired = cog.expire_streaks(now)
+
+  # Assert
+  assert expired == 1
+  mock_save.assert_called_once()
+  assert streaks_data["1"].current_streak == 0
+  assert streaks_data["1"].longest_streak == 4
+  assert streaks_data["2"].current_streak == 2
+  assert "2" in cog.rollover
+
+
+@pytest.mark.asyncio
+async def test_timezone_command_rejects_unknown_timezone(cog):
+  # Arrange
+  ctx = AsyncMock()
+  ctx.author.id = 12345
+  ctx.author.name = "TestUser"
+
+  with patch.object(cog, 'load_streaks', return_value={}), \
+      patch.object(cog, 'save_streaks') as mock_save:
+    # Act
+    await cog.timezone.callback(cog, ctx, "Mars/Olympus_Mons")
+
+  # Assert
+  mock_save.assert_not_called()
+  assert "isn't one I recognize" in ctx.send.call_args[0][0]
+
+
+@pytest.mark.asyncio
+async def test_timezone_command_sets_timezone(cog):
+  # Arrange
+  ctx = AsyncMock()
+  ctx.author.id = 12345
+  ctx.author.name = "TestUser"
+  streaks_data = {}
+
+  with patch.object(cog, 'load_streaks', return_value=streaks_data), \
+      patch.object(cog, 'save_streaks') as mock_save:
+    # Act
+    await cog.timezone.callback(cog, ctx, "Europe/Berlin")
+
+  # Assert
+  mock_save.assert_called_once()
+  assert streaks_data["12345"].timezone == "Europe/Berlin"
+
+
+@pytest.mark.asyncio
+async def test_streak_command_reads_snapshot(cog, tmp_path, monkeypatch):
+  # Arrange
+  monkeypatch.setattr(core, "STREAK_SNAPSHOT", True)
+  monkeypatch.setattr(streaks, "STREAKS_FILE", str(tmp_path / "streaks.json"))
+  monkeypatch.setattr(streaks, "STREAKS_SNAPSHOT_FILE", str(tmp_path / "streaks.bin"))
+  cog = streaks.StreaksCog(cog.bot)
+  cog.save_streaks({"123": make_user("TestUser", 4, 6), "456": make_user("Other", 1, 1)})
+  ctx = AsyncMock()
+  member = Mock(spec=Member)
+  member.id = 123
+
+  # Act
+  with patch.object(cog, 'load_streaks') as mock_load:
+    await cog.streak.callback(cog, ctx, member)
+
+  # Assert
+  mock_load.assert_not_called()
+  message = ctx.send.call_args[0][0]
+  assert "Current streak: 4 days" in message
+  assert "Longest streak: 6 days" in message
+
+
+def test_load_user_streak_falls_back_to_json_for_truncated_snapshot(cog, tmp_path, monkeypatch):
+  # Arrange
+  monkeypatch.setattr(core, "STREAK_SNAPSHOT", True)
+  monkeypatch.setattr(streaks, "STREAKS_FILE", str(tmp_path / "streaks.json"))
+  monkeypatch.setattr(streaks, "STREAKS_SNAPSHOT_FILE", str(tmp_path / "streaks.bin"))
+  cog = streaks.StreaksCog(cog.bot)
+  cog.save_streaks({"123": make_user("TestUser", 4, 6)})
+  (tmp_path / "streaks.bin").write_bytes(b"HOO")
+
+  # Act
+  with patch.object(streaks.StreaksCog, 'save_snapshot'):
+    record = cog.load_user_streak("123")
+
+  # Assert
+  assert record.current_streak == 4
+
+
+@pytest.mark.asyncio
+async def test_rank_command_reports_rank_and_neighbors(cog):
+  # Arrange
+  streaks_data = {
+    "1": make_user("Leader", 9, 9),
+    "2": make_user("TestUser", 4, 6),
+    "3": make_user("Trailer", 1, 2),
+  }
+  ctx = AsyncMock()
+  member = Mock(spec=Member)
+  member.id = 2
+  member.display_name = "TestUser"
+
+  # Act
+  with patch.object(cog, 'load_streaks', return_value=streaks_data):
+    await cog.rank.callback(cog, ctx, member)
+
+  # Assert
+  message = ctx.send.call_args[0][0]
+  assert "ranked #2 of 3 with a 4 day streak" in message
+  assert "Next up: Leader with 9 days." in message
+  assert "Right behind: Trailer with 1 days." in message
+
+
+def test_update_streak_moves_user_on_leaderboard(cog):
+  # Arrange
+  yesterday = datetime(2024, 3, 1)
+  streaks_data = {"1": make_user("Leader", 2, 2), "2": make_user("TestUser", 2, 2, yesterday.date())}
+  cog.load_ranking(streaks_data)
+
+  # Act
+  with patch.object(cog, 'load_streaks', return_value=streaks_data), \
+      patch.object(cog, 'save_streaks', return_value=True):
+    cog.update_streak("2", "TestUser", streaks.PST.localize(yesterday + timedelta(days=1, hours=12)))
+
+  # Assert
+  assert cog.ranking.rank("2") == 1
+  assert cog.ranking.rank("1") == 2
+
+
+@pytest.mark.asyncio
+async def test_initialize_streaks_adds_members_from_cache(cog, tmp_path):
+  # Arrange
+  guild = MagicMock()
+  guild.name = "Study Hall"
+  cog.member_cache = MagicMock()
+  cog.member_cache.refresh = AsyncMock(return_value={"1": "Existing", "2": "Newcomer"})
+  streaks_data = {"1": make_user("Existing", 2, 2)}
+
+  # Act
+  with patch.object(cog, 'load_streaks', return_value=streaks_data), \
+      patch.object(cog, 'save_streaks') as mock_save, \
+      patch.object(core, 'bot', Mock(guilds=[guild])):
+    await cog.initialize_streaks()
+
+  # Assert
+  cog.member_cache.refresh.assert_awaited_once_with(guild)
+  cog.member_cache.save.assert_called_once()
+  saved = mock_save.call_args[0][0]
+  assert saved["1"].current_streak == 2
+  assert saved["2"] == UserStreak("Newcomer")
+
+
+def test_credit_activity_creates_record_and_updates_streak(cog):
+  # Arrange
+  now = streaks.PST.localize(datetime(2024, 3, 1, 12))
+
+  # Act
+  with patch.object(cog, 'load_streaks', return_value={}), \
+      patch.object(cog, 'initialize_user_data') as mock_init, \
+      patch.object(cog, 'update_streak', return_value=True) as mock_update:
+    result = cog.credit_activity("7", "solver", now)
+
+  # Assert
+  assert result is True
+  mock_init.assert_called_once_with("7", "solver")
+  mock_update.assert_called_once_with("7", "solver", now)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_voice_events_do_not_lose_updates(cog):
+  # Arrange
+  study = Mock()
+  study.id = core.STUDY_CHANNEL_ID
+  first, second = Mock(spec=Member), Mock(spec=Member)
+  first.id, first.name = 1, "First"
+  second.id, second.name = 2, "Second"
+  streaks_data = {"1": make_user("First", 0, 0), "2": make_user("Second", 0, 0)}
+
+  async def slow_send(message):
+    await asyncio.sleep(0.01)
+
+  streaks_data["1"].join_time = streaks.PST.localize(datetime(2024, 3, 1, 8))
+  leave = Mock(channel=None)
+  leave_before = Mock(channel=study)
+  leave_before.channel.send = slow_send
+  joined = Mock(channel=study)
+
+  # Act
+  with patch.object(cog, 'load_streaks', return_value=streaks_data), \
+      patch.object(cog, 'save_streaks', return_value=True) as mock_save, \
+      patch('cogs.streaks.datetime') as mock_datetime:
+    mock_datetime.now.return_value = streaks.PST.localize(datetime(2024, 3, 1, 9))
+    await asyncio.gather(
+      cog.process_streak(first, leave_before, leave, core.STUDY_CHANNEL_ID, core.MINIMUM_MINUTES),
+      cog.process_streak(second, Mock(channel=None), joined, core.STUDY_CHANNEL_ID, core.MINIMUM_MINUTES))
+
+  # Assert
+  saved = mock_save.call_args[0][0]
+  assert saved["1"].current_streak == 1
+  assert saved["1"].join_time is None
+  assert saved["2"].join_time is not None
+  assert len(cog.user_locks) == 0
+
+
+@pytest.mark.asyncio
+async def test_streak_slash_defers_and_replies_ephemerally(cog):
+  # Arrange
+  interaction = AsyncMock()
+  interaction.user.id = 42
+  cog.load_streaks = MagicMock(return_value={"42": make_user("Alice", 3, 5)})
+
+  # Act
+  await cog.streak_slash.callback(cog, interaction, private=True)
+
+  # Assert
+  interaction.response.defer.assert_awaited_once_with(ephemeral=True, thinking=True)
+  interaction.followup.send.assert_awaited_once_with(
+    "Alice's streaks:\nCurrent streak: 3 days\nLongest streak: 5 days", ephemeral=True)
+
+
+def test_failed_save_is_retried_by_flush(cog):
+  # Arrange
+  cog._streaks = {"42": make_user("Alice", 1, 1)}
+  cog.save_streaks = MagicMock(side_effect=[False, True])
+
+  # Act
+  cog.commit(cog._streaks)
+  failed = cog.dirty
+  cog.flush()
+  cog.flush()
+
+  # Assert
+  assert failed
+  assert not cog.dirty
+  assert cog.save_streaks.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_studying_lists_study_room_from_presence(cog):
+  # Arrange
+  ctx = AsyncMock()
+  member = Mock(spec=Member)
+  member.id, member.bot, member.display_name = 1, False, "Ada"
+  before, after = Mock(channel=None), Mock()
+  after.channel.id = core.STUDY_CHANNEL_ID
+  cog.handle_study_channel_activity = AsyncMock()
+  cog.load_streaks = MagicMock()
+
+  # Act
+  await cog.on_voice_state_update(member, before, after)
+  await cog.studying.callback(cog, ctx)
+
+  # Assert
+  message = ctx.send.call_args[0][0]
+  assert message.startswith("**Studying now (1):**\nAda: 0 min")
+  cog.load_streaks.assert_not_called()
+
+
+def test_seed_presence_uses_recorded_join_time(cog):
+  # Arrange
+  joined = datetime(2024, 3, 1, 12, tzinfo=streaks.pytz.utc)
+  user = make_user("Ada", 1, 1)
+  user.join_time = joined
+  member, bot_member = Mock(id=1, bot=False, display_name="Ada"), Mock(id=2, bot=True)
+  guild = Mock(voice_channels=[Mock(id=core.STUDY_CHANNEL_ID, members=[member, bot_member])])
+
+  # Act
+  cog.seed_presence(guild, {"1": user})
+
+  # Assert
+  [presence] = cog.presence.occupants(core.STUDY_CHANNEL_ID)
+  assert presence.joined_at == joined
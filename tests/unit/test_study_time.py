@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta
+
+import pytz
+
+from domain import study_time
+from domain.streak_data import epoch_day
+from domain.study_time import StudyDay, seconds_to_threshold, split_by_day
+from services.study_ledger import StudyLedger
+
+
+PST = pytz.timezone('America/Los_Angeles')
+
+
+def test_overlapping_and_touching_intervals_count_once():
+  # Arrange
+  record = StudyDay(0)
+
+  # Act
+  record.add(100, 700)
+  record.add(400, 1000)
+  record.add(1000, 1300)
+  record.add(2000, 2600)
+
+  # Assert
+  assert record.intervals == [[100, 1300], [2000, 2600]]
+  assert record.total() == 1800
+
+
+def test_oldest_intervals_fold_into_settled_total(monkeypatch):
+  # Arrange
+  monkeypatch.setattr(study_time, "MAX_INTERVALS", 2)
+  record = StudyDay(0)
+
+  # Act
+  for start in (0, 100, 200, 300):
+    record.add(start, start + 10)
+
+  # Assert
+  assert record.intervals == [[200, 210], [300, 310]]
+  assert record.settled == 20
+  assert record.total() == 40
+  assert record.total_with(305, 330) == 60
+  assert record.total() == 40
+
+
+def test_rows_round_trip():
+  # Arrange
+  day = epoch_day(datetime(2024, 3, 1).date())
+  base = day * study_time.SECONDS_PER_DAY
+  record = StudyDay(day, 60, [[base + 3600, base + 4200], [base + 7200, base + 7500]])
+
+  # Act
+  row = record.as_row()
+
+  # Assert
+  assert row == [day, 60, 3600, 4200, 7200, 7500]
+  assert StudyDay.from_row(row) == record
+
+
+def test_split_by_day_cuts_at_local_midnight():
+  # Arrange
+  start = PST.localize(datetime(2024, 3, 1, 23, 30))
+  end = PST.localize(datetime(2024, 3, 2, 0, 20))
+
+  # Act
+  pieces = split_by_day(start, end, PST)
+
+  # Assert
+  assert [(day.isoformat(), (piece_end - piece_start).total_seconds()) for day, piece_start, piece_end in pieces] \
+    == [("2024-03-01", 1800), ("2024-03-02", 1200)]
+
+
+def test_seconds_to_threshold_counts_earlier_study():
+  # Arrange
+  now = PST.localize(datetime(2024, 3, 1, 9, 5))
+  ledger = StudyLedger("unused.json")
+  ledger.record("42", now - timedelta(minutes=65), now - timedelta(minutes=45), PST)
+
+  # Act
+  delay = seconds_to_threshold(ledger.get("42"), now - timedelta(minutes=5), now, PST, 30 * 60)
+
+  # Assert
+  assert delay == 5 * 60
+
+
+def test_seconds_to_threshold_moves_to_tomorrow_once_credited():
+  # Arrange
+  now = PST.localize(datetime(2024, 3, 1, 23, 50))
+  today = epoch_day(now.date())
+
+  # Act
+  delay = seconds_to_threshold(None, now - timedelta(minutes=40), now, PST, 30 * 60, credited_day=today)
+
+  # Assert
+  assert delay == 40 * 60
+
+
+def test_ledger_keeps_latest_day_and_persists(tmp_path):
+  # Arrange
+  ledger = StudyLedger(str(tmp_path / "study_time.json"))
+  start = PST.localize(datetime(2024, 3, 1, 23, 40))
+
+  # Act
+  touched = ledger.record("42", start, start + timedelta(minutes=40), PST)
+  ledger.save()
+  reloaded = StudyLedger(ledger.path)
+  reloaded.load()
+
+  # Assert
+  assert [record.total() for record, _ in touched] == [1200, 1200]
+  assert reloaded.get("42") == ledger.get("42")
+  assert reloaded.get("42").day == epoch_day(datetime(2024, 3, 2).date())
+  assert not ledger.dirty
@@ -0,0 +1,61 @@
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from cogs import tutor
+
+
+@pytest.fixture
+def cog():
+  return tutor.TutorCog(Mock())
+
+
+@pytest.mark.asyncio
+async def test_ask_defers_and_follows_up_with_reply(cog):
+  # Arrange
+  interaction = AsyncMock()
+  interaction.user.id = 42
+  interaction.channel_id = 7
+  generate_reply = AsyncMock(return_value="Hoo! " + "a" * 2500)
+
+  # Act
+  with patch.dict("sys.modules", {"bot.events": Mock(generate_reply=generate_reply)}):
+    await cog.ask.callback(cog, interaction, "What is a heap?")
+
+  # Assert
+  interaction.response.defer.assert_awaited_once_with(ephemeral=False, thinking=True)
+  generate_reply.assert_awaited_once_with("What is a heap?", "channel:7", 42, 7)
+  reply = interaction.followup.send.call_args[0][0]
+  assert len(reply) == tutor.MESSAGE_LIMIT
+  assert interaction.followup.send.call_args[1] == {"ephemeral": False}
+
+
+@pytest.mark.asyncio
+async def test_ask_private_uses_dm_history(cog):
+  # Arrange
+  interaction = AsyncMock()
+  interaction.user.id = 42
+  interaction.channel_id = 7
+  generate_reply = AsyncMock(return_value="Hoo!")
+
+  # Act
+  with patch.dict("sys.modules", {"bot.events": Mock(generate_reply=generate_reply)}):
+    await cog.ask.callback(cog, interaction, "Hi", private=True)
+
+  # Assert
+  generate_reply.assert_awaited_once_with("Hi", "dm:42", 42, 7)
+  interaction.followup.send.assert_awaited_once_with("Hoo!", ephemeral=True)
+
+
+@pytest.mark.asyncio
+async def test_ask_failure_sends_ephemeral_apology(cog):
+  # Arrange
+  interaction = AsyncMock()
+  generate_reply = AsyncMock(side_effect=RuntimeError("provider down"))
+
+  # Act
+  with patch.dict("sys.modules", {"bot.events": Mock(generate_reply=generate_reply)}):
+    await cog.ask.callback(cog, interaction, "Hi")
+
+  # Assert
+  assert interaction.followup.send.call_args[1] == {"ephemeral": True}
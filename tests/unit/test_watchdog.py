@@ -0,0 +1,68 @@
+import asyncio
+import time
+
+import pytest
+
+from utils import watchdog as watchdog_module
+from utils.watchdog import LoopWatchdog
+
+
+def block_the_loop(seconds):
+  time.sleep(seconds)
+
+
+@pytest.mark.asyncio
+async def test_stall_is_sampled_in_the_blocking_frame():
+  # Arrange
+  watchdog = LoopWatchdog(interval=0.02, threshold=0.1)
+  watchdog.start()
+  await asyncio.sleep(0.05)
+
+  # Act
+  block_the_loop(0.4)
+  await asyncio.sleep(0.05)
+  watchdog.stop()
+
+  # Assert
+  snapshot = watchdog.snapshot()
+  assert snapshot["stalls"] == 1
+  assert snapshot["max_lag"] >= 0.3
+  [(frame, count)] = snapshot["blocking_frames"].items()
+  assert frame.startswith("tests/unit/test_watchdog.py:")
+  assert frame.endswith("(block_the_loop)")
+  assert count == 1
+  assert snapshot["last_stall"]["frame"] == frame
+
+
+def test_record_fills_histogram_and_counts_stalls():
+  # Arrange
+  watchdog = LoopWatchdog(interval=0.25, threshold=0.5)
+
+  # Act
+  for lag in (0.001, 0.2, 0.7, 10):
+    watchdog.record(lag)
+
+  # Assert
+  snapshot = watchdog.snapshot()
+  assert snapshot["ticks"] == 4
+  assert snapshot["stalls"] == 2
+  assert snapshot["max_lag"] == 10
+  assert snapshot["lag_histogram"]["<=0.05s"] == 1
+  assert snapshot["lag_histogram"]["<=0.25s"] == 1
+  assert snapshot["lag_histogram"]["<=1.0s"] == 1
+  assert snapshot["lag_histogram"][">5.0s"] == 1
+  assert snapshot["blocking_frames"] == {"unsampled": 2}
+
+
+def test_offending_frame_prefers_project_code():
+  # Arrange
+  stack = [
+    watchdog_module.traceback.FrameSummary(f"{watchdog_module.PROJECT_ROOT}/cogs/leetcode.py", 164, "fetch"),
+    watchdog_module.traceback.FrameSummary("/usr/lib/python3/socket.py", 700, "recv_into"),
+  ]
+
+  # Act
+  frame = watchdog_module.offending_frame(stack)
+
+  # Assert
+  assert watchdog_module.describe_frame(frame) == "cogs/leetcode.py:164 (fetch)"
@@ -0,0 +1,63 @@
+import asyncio
+import os
+
+import pytest
+
+from services.workers import WorkerPool, WorkerPoolBusy
+
+
+def worker_pid(value):
+  return os.getpid(), value * 2
+
+
+def fail(message):
+  raise ValueError(message)
+
+
+@pytest.mark.asyncio
+async def test_disabled_pool_runs_inline():
+  # Arrange
+  pool = WorkerPool(processes=0)
+
+  # Act
+  pid, result = await pool.run(worker_pid, 21)
+
+  # Assert
+  assert pid == os.getpid()
+  assert result == 42
+  assert pool.snapshot()["completed"] == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_runs_work_in_other_processes():
+  # Arrange
+  pool = WorkerPool(processes=2, max_pending=4)
+
+  # Act
+  try:
+    results = await asyncio.gather(*(pool.run(worker_pid, value) for value in range(8)))
+    with pytest.raises(ValueError):
+      await pool.run(fail, "boom")
+  finally:
+    pool.shutdown()
+
+  # Assert
+  assert [result for _, result in results] == [value * 2 for value in range(8)]
+  assert os.getpid() not in {pid for pid, _ in results}
+  assert pool.snapshot()["completed"] == 8
+  assert pool.snapshot()["failed"] == 1
+  assert pool.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_rejects_work_when_full():
+  # Arrange
+  pool = WorkerPool(processes=1, max_pending=1, queue_timeout=0.01)
+  await pool._acquire()
+
+  # Act
+  with pytest.raises(WorkerPoolBusy):
+    await pool.run(worker_pid, 1)
+
+  # Assert
+  assert pool.snapshot()["rejected"] == 1
@@ -0,0 +1,51 @@
+"""
+Per-key asyncio locks.
+
+KeyedLocks hands out one lock per key (e.g. per user ID), so work for one
+key runs strictly in order while work for different keys interleaves
+freely. A key's lock is dropped as soon as nobody holds or waits for it, so
+the table only ever holds keys with work in flight.
+"""
+
+import asyncio
+
+from contextlib import asynccontextmanager
+from typing import Dict, Hashable, List
+
+
+class KeyedLocks:
+  """A table of asyncio locks created on demand for each key."""
+  def __init__(self):
+    self._locks: Dict[Hashable, asyncio.Lock] = {}
+    self._users: Dict[Hashable, int] = {}
+
+  @asynccontextmanager
+  async def hold(self, key: Hashable):
+    """
+    Hold the lock for a key for the duration of an async with block.
+
+    Args:
+      key (Hashable): The key to serialize on.
+    """
+    lock = self._locks.setdefault(key, asyncio.Lock())
+    self._users[key] = self._users.get(key, 0) + 1
+    try:
+      async with lock:
+        yield
+    finally:
+      self._users[key] -= 1
+      if not self._users[key]:
+        del self._users[key]
+        del self._locks[key]
+
+  def locked(self, key: Hashable) -> bool:
+    """Return whether the lock for a key is currently held."""
+    lock = self._locks.get(key)
+    return lock is not None and lock.locked()
+
+  def active(self) -> List[Hashable]:
+    """Return the keys with work held or waiting."""
+    return list(self._locks)
+
+  def __len__(self):
+    return len(self._locks)
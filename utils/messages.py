@@ -0,0 +1,39 @@
+"""
+Helpers for fitting text into Discord messages.
+"""
+
+from typing import List
+
+
+# Discord rejects messages longer than this
+MESSAGE_LIMIT = 2000
+
+
+def split_message(text: str, limit: int = MESSAGE_LIMIT) -> List[str]:
+  """
+  Split text into as few messages as fit, breaking only between lines.
+
+  A single line longer than the limit is shortened to fit.
+
+  Args:
+    text (str): The text to send.
+    limit (int): The longest message allowed.
+
+  Returns:
+    list: The messages, in order.
+  """
+  messages: List[str] = []
+  current = None
+  for line in text.split("\n"):
+    if len(line) > limit:
+      line = line[:limit - 1] + "…"
+    if current is None:
+      current = line
+    elif len(current) + 1 + len(line) <= limit:
+      current = f"{current}\n{line}"
+    else:
+      messages.append(current)
+      current = line
+  if current:
+    messages.append(current)
+  return messages
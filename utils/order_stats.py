@@ -0,0 +1,160 @@
+"""
+Order statistics over streak lengths for leaderboard queries.
+
+StreakRanking keeps a Fenwick (binary indexed) tree of how many users hold
+each streak length, alongside the users at each length. Changing one user's
+streak, and asking for a user's rank, percentile or leaderboard neighbours,
+all take O(log n) in the longest streak instead of sorting every user.
+
+Ranks are competition ranks: users with equal streaks share a rank, and the
+next rank skips past them (1, 2, 2, 4).
+"""
+
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+
+class FenwickTree:
+  """
+  Prefix sums over a growable array of counts.
+
+  Attributes:
+    size (int): The number of indexable positions (0 to size - 1).
+  """
+  def __init__(self, size: int = 64):
+    self.size = size
+    self._tree = [0] * (size + 1)
+
+  def _grow(self, index: int) -> None:
+    size = self.size
+    while size <= index:
+      size *= 2
+    counts = [self.range_count(position) for position in range(self.size)]
+    self.size = size
+    self._tree = [0] * (size + 1)
+    for position, count in enumerate(counts):
+      if count:
+        self.add(position, count)
+
+  def add(self, index: int, delta: int) -> None:
+    """Add delta to the count at index."""
+    if index >= self.size:
+      self._grow(index)
+    index += 1
+    while index <= self.size:
+      self._tree[index] += delta
+      index += index & -index
+
+  def prefix(self, index: int) -> int:
+    """Return the total count at positions 0 to index inclusive."""
+    index = min(index, self.size - 1) + 1
+    total = 0
+    while index > 0:
+      total += self._tree[index]
+      index -= index & -index
+    return total
+
+  def range_count(self, index: int) -> int:
+    """Return the count at a single position."""
+    return self.prefix(index) - (self.prefix(index - 1) if index > 0 else 0)
+
+  def find(self, k: int) -> int:
+    """
+    Return the smallest position whose prefix total reaches k.
+
+    Args:
+      k (int): A 1-based order, at most the overall total.
+    """
+    position = 0
+    step = 1 << self.size.bit_length()
+    while step:
+      following = position + step
+      if following <= self.size and self._tree[following] < k:
+        position = following
+        k -= self._tree[following]
+      step >>= 1
+    return position
+
+
+class StreakRanking:
+  """
+  A leaderboard of users by current streak.
+
+  Attributes:
+    values (dict): User ID -> the streak the user is ranked by.
+  """
+  def __init__(self):
+    self.values: Dict[str, int] = {}
+    self._counts = FenwickTree()
+    self._holders: Dict[int, Set[str]] = {}
+
+  def rebuild(self, streaks: Iterable[Tuple[str, int]]) -> None:
+    """Replace the leaderboard with (user ID, streak) pairs."""
+    self.__init__()
+    for user_id, streak in streaks:
+      self.set(user_id, streak)
+
+  def set(self, user_id: str, streak: int) -> None:
+    """Record a user's streak, replacing any previous value."""
+    if self.values.get(user_id) == streak:
+      return
+    self.remove(user_id)
+    self.values[user_id] = streak
+    self._counts.add(streak, 1)
+    self._holders.setdefault(streak, set()).add(user_id)
+
+  def remove(self, user_id: str) -> None:
+    """Drop a user from the leaderboard."""
+    streak = self.values.pop(user_id, None)
+    if streak is None:
+      return
+    self._counts.add(streak, -1)
+    holders = self._holders[streak]
+    holders.discard(user_id)
+    if not holders:
+      del self._holders[streak]
+
+  def __len__(self):
+    return len(self.values)
+
+  def __contains__(self, user_id):
+    return user_id in self.values
+
+  def rank(self, user_id: str) -> Optional[int]:
+    """Return the user's 1-based rank, or None if they aren't ranked."""
+    streak = self.values.get(user_id)
+    if streak is None:
+      return None
+    return len(self.values) - self._counts.prefix(streak) + 1
+
+  def percentile(self, user_id: str) -> Optional[float]:
+    """Return the percentage of other users with a shorter streak."""
+    streak = self.values.get(user_id)
+    if streak is None:
+      return None
+    if len(self.values) == 1:
+      return 100.0
+    shorter = self._counts.prefix(streak - 1) if streak > 0 else 0
+    return 100.0 * shorter / (len(self.values) - 1)
+
+  def neighbors(self, user_id: str) -> Tuple[Optional[Tuple[str, int]], Optional[Tuple[str, int]]]:
+    """
+    Return the closest users with a longer and with a shorter streak.
+
+    Returns:
+      tuple: ((user ID, streak) just above, (user ID, streak) just below);
+        either is None at the top or bottom of the leaderboard.
+    """
+    streak = self.values.get(user_id)
+    if streak is None:
+      return None, None
+
+    above = below = None
+    at_or_below = self._counts.prefix(streak)
+    if at_or_below < len(self.values):
+      value = self._counts.find(at_or_below + 1)
+      above = (next(iter(self._holders[value])), value)
+    below_count = self._counts.prefix(streak - 1) if streak > 0 else 0
+    if below_count:
+      value = self._counts.find(below_count)
+      below = (next(iter(self._holders[value])), value)
+    return above, below
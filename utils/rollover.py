@@ -0,0 +1,147 @@
+"""
+Day-rollover helpers for per-user timezones.
+
+Streak day boundaries are decided in each user's local timezone. A streak
+is broken once a full local day passes without a qualifying session, so a
+user who last studied on day D keeps their streak until local midnight at
+the start of day D + 2. The RolloverScheduler keeps those deadlines in a
+min-heap so the bot can expire broken streaks in bulk as each deadline
+passes instead of scanning every user on every read.
+"""
+
+import heapq
+import itertools
+
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional
+
+import pytz
+
+
+DEFAULT_TIMEZONE = "US/Pacific"
+
+
+def get_timezone(name: Optional[str]):
+  """
+  Resolve a timezone name, falling back to the default timezone.
+
+  Args:
+    name (str, optional): An IANA timezone name such as "Europe/Berlin".
+
+  Returns:
+    tzinfo: The resolved pytz timezone.
+  """
+  if name:
+    try:
+      return pytz.timezone(name)
+    except pytz.UnknownTimeZoneError:
+      pass
+  return pytz.timezone(DEFAULT_TIMEZONE)
+
+
+def is_valid_timezone(name: str) -> bool:
+  """Check whether a name is a known IANA timezone."""
+  return name in pytz.all_timezones_set
+
+
+def local_date(moment: datetime, tz) -> date:
+  """
+  Return the calendar date of a moment in the given timezone.
+
+  Naive datetimes are assumed to already be in local time.
+
+  Args:
+    moment (datetime): The moment to convert.
+    tz (tzinfo): The user's timezone.
+
+  Returns:
+    date: The local calendar date.
+  """
+  if moment.tzinfo is None:
+    return moment.date()
+  return moment.astimezone(tz).date()
+
+
+def local_midnight(day: date, tz) -> datetime:
+  """Return the aware datetime of midnight at the start of a local day."""
+  return tz.localize(datetime.combine(day, time.min))
+
+
+def streak_expiry(last_join_date: date, tz) -> datetime:
+  """
+  Return the moment a streak breaks if the user does not study again.
+
+  Args:
+    last_join_date (date): The last local day the user completed a session.
+    tz (tzinfo): The user's timezone.
+
+  Returns:
+    datetime: Local midnight at the start of last_join_date + 2 days.
+  """
+  return local_midnight(last_join_date + timedelta(days=2), tz)
+
+
+class RolloverScheduler:
+  """
+  A min-heap of per-user streak expiry deadlines.
+
+  Each user has at most one live deadline. Rescheduling a user pushes a new
+  heap entry and the superseded entry is dropped lazily when it surfaces.
+  """
+  def __init__(self):
+    self._heap = []
+    self._deadlines: Dict[str, float] = {}
+    self._counter = itertools.count()
+
+  def __len__(self):
+    return len(self._deadlines)
+
+  def __contains__(self, user_id):
+    return user_id in self._deadlines
+
+  def schedule(self, user_id: str, deadline: datetime) -> None:
+    """
+    Schedule (or reschedule) a user's streak expiry.
+
+    Args:
+      user_id (str): The user's ID.
+      deadline (datetime): An aware datetime at which the streak breaks.
+    """
+    timestamp = deadline.timestamp()
+    self._deadlines[user_id] = timestamp
+    heapq.heappush(self._heap, (timestamp, next(self._counter), user_id))
+
+  def cancel(self, user_id: str) -> None:
+    """Remove a user's pending deadline, if any."""
+    self._deadlines.pop(user_id, None)
+
+  def next_deadline(self) -> Optional[float]:
+    """Return the earliest live deadline as a POSIX timestamp, if any."""
+    self._discard_stale()
+    return self._heap[0][0] if self._heap else None
+
+  def pop_due(self, now: datetime) -> List[str]:
+    """
+    Pop every user whose deadline has passed.
+
+    Args:
+      now (datetime): An aware datetime for the current moment.
+
+    Returns:
+      list: The IDs of users whose streaks are due to expire.
+    """
+    cutoff = now.timestamp()
+    due = []
+    while self._heap and self._heap[0][0] <= cutoff:
+      timestamp, _, user_id = heapq.heappop(self._heap)
+      if self._deadlines.get(user_id) == timestamp:
+        del self._deadlines[user_id]
+        due.append(user_id)
+    return due
+
+  def _discard_stale(self) -> None:
+    while self._heap:
+      timestamp, _, user_id = self._heap[0]
+      if self._deadlines.get(user_id) == timestamp:
+        return
+      heapq.heappop(self._heap)
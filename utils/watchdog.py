@@ -0,0 +1,204 @@
+"""
+Event-loop lag watchdog.
+
+A blocking call inside a coroutine (a synchronous HTTP request, a model SDK
+call, an fsync) stalls every other event the bot handles, including gateway
+heartbeats. LoopWatchdog measures how late a short periodic sleep wakes up,
+which is the loop's scheduling lag, and a side thread watches the same
+heartbeat: once the loop has been stuck for longer than the threshold, the
+thread samples the loop thread's stack while it is still blocked, so the
+report names the call that is holding the loop rather than whatever runs
+after it. Stall counts per offending frame are kept for /status.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Upper bounds in seconds of the lag histogram buckets
+LAG_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+STACK_DEPTH = 8
+
+
+def offending_frame(stack: List[traceback.FrameSummary]) -> traceback.FrameSummary:
+  """
+  Pick the frame to blame for a stall.
+
+  The innermost frame is usually deep in a library (a socket read, an SSL
+  handshake), so the innermost frame in the bot's own code is preferred.
+
+  Args:
+    stack (list): The sampled stack, outermost frame first.
+
+  Returns:
+    traceback.FrameSummary: The frame to report.
+  """
+  for frame in reversed(stack):
+    filename = os.path.abspath(frame.filename)
+    if filename.startswith(PROJECT_ROOT) and "site-packages" not in filename:
+      return frame
+  return stack[-1]
+
+
+def describe_frame(frame: traceback.FrameSummary) -> str:
+  """Return "path:line (function)" for a frame, relative to the project."""
+  filename = os.path.abspath(frame.filename)
+  if filename.startswith(PROJECT_ROOT):
+    filename = os.path.relpath(filename, PROJECT_ROOT)
+  return f"{filename}:{frame.lineno} ({frame.name})"
+
+
+class LoopWatchdog:
+  """
+  Measures event-loop lag and samples the stack of long stalls.
+
+  Attributes:
+    interval (float): Seconds between heartbeats.
+    threshold (float): Lag in seconds that counts as a stall.
+    ticks (int): Heartbeats measured.
+    stalls (int): Heartbeats that were late by at least the threshold.
+    max_lag (float): The largest lag seen, in seconds.
+    frames (Counter): Offending frame -> stalls sampled in it.
+  """
+  def __init__(self, interval: float = 0.25, threshold: float = 0.5,
+               clock: Callable[[], float] = time.monotonic):
+    self.interval = interval
+    self.threshold = threshold
+    self._clock = clock
+    self.ticks = 0
+    self.stalls = 0
+    self.max_lag = 0.0
+    self.last_lag = 0.0
+    self.buckets = [0] * (len(LAG_BUCKETS) + 1)
+    self.frames: Counter = Counter()
+    self.last_stall: Optional[Dict] = None
+    self._beat = clock()
+    self._sampled = False
+    self._lock = threading.Lock()
+    self._stopped = threading.Event()
+    self._thread: Optional[threading.Thread] = None
+    self._task: Optional[asyncio.Task] = None
+    self._loop_thread_id: Optional[int] = None
+
+  @property
+  def running(self) -> bool:
+    return self._task is not None and not self._task.done()
+
+  def start(self) -> None:
+    """Start watching the running event loop; call from a coroutine on it."""
+    if self.running:
+      return
+    self._loop_thread_id = threading.get_ident()
+    self._beat = self._clock()
+    self._stopped.clear()
+    self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+    self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+    self._thread.start()
+    logger.info(f"Loop watchdog started (interval {self.interval}s, threshold {self.threshold}s).")
+
+  def stop(self) -> None:
+    """Stop the heartbeat and the sampling thread."""
+    self._stopped.set()
+    if self._task is not None:
+      self._task.cancel()
+      self._task = None
+    if self._thread is not None:
+      self._thread.join(timeout=self.interval * 4)
+      self._thread = None
+
+  async def _heartbeat(self) -> None:
+    while True:
+      started = self._clock()
+      await asyncio.sleep(self.interval)
+      self.record(max(0.0, self._clock() - started - self.interval))
+
+  def record(self, lag: float) -> None:
+    """
+    Record one heartbeat's lag.
+
+    Args:
+      lag (float): How late the heartbeat woke up, in seconds.
+    """
+    with self._lock:
+      self.ticks += 1
+      self.last_lag = lag
+      self.max_lag = max(self.max_lag, lag)
+      self.buckets[next((i for i, bound in enumerate(LAG_BUCKETS) if lag <= bound), len(LAG_BUCKETS))] += 1
+      if lag >= self.threshold:
+        self.stalls += 1
+        if not self._sampled:
+          # Finished before the side thread looked, e.g. just over the threshold
+          self.frames["unsampled"] += 1
+        logger.warning(f"Event loop lagged {lag:.2f}s.")
+      self._beat = self._clock()
+      self._sampled = False
+
+  def _watch(self) -> None:
+    poll = min(self.interval, self.threshold) / 2
+    while not self._stopped.wait(poll):
+      with self._lock:
+        stalled = self._clock() - self._beat - self.interval
+        due = stalled >= self.threshold and not self._sampled
+        if due:
+          self._sampled = True
+      if due:
+        self.sample(stalled)
+
+  def sample(self, stalled: float) -> Optional[str]:
+    """
+    Capture the loop thread's stack and count the frame blocking it.
+
+    Args:
+      stalled (float): How long the loop has been stuck so far, in seconds.
+
+    Returns:
+      str: The offending frame, or None if the loop thread is gone.
+    """
+    frame = sys._current_frames().get(self._loop_thread_id)
+    if frame is None:
+      return None
+    stack = traceback.extract_stack(frame)
+    del frame
+    culprit = describe_frame(offending_frame(stack))
+    trace = traceback.format_list(stack[-STACK_DEPTH:])
+    with self._lock:
+      self.frames[culprit] += 1
+      self.last_stall = {"frame": culprit, "stalled": round(stalled, 3), "at": time.time(),
+                         "stack": [line.rstrip() for line in trace]}
+    logger.warning(f"Event loop blocked for {stalled:.2f}s in {culprit}:\n{''.join(trace)}")
+    return culprit
+
+  def snapshot(self, top: int = 5) -> Dict:
+    """
+    Return lag metrics for monitoring.
+
+    Args:
+      top (int): How many of the most frequent offending frames to list.
+
+    Returns:
+      dict: Heartbeat counts, lag histogram and the worst offending frames.
+    """
+    with self._lock:
+      labels = [f"<={bound}s" for bound in LAG_BUCKETS] + [f">{LAG_BUCKETS[-1]}s"]
+      return {
+        "running": self.running,
+        "threshold": self.threshold,
+        "ticks": self.ticks,
+        "stalls": self.stalls,
+        "last_lag": round(self.last_lag, 4),
+        "max_lag": round(self.max_lag, 4),
+        "lag_histogram": dict(zip(labels, self.buckets)),
+        "blocking_frames": dict(self.frames.most_common(top)),
+        "last_stall": self.last_stall,
+      }